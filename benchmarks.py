@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Benchmarks
+
+Micro-benchmarks for the data collection and analysis hot paths.
+Network benchmarks run against a local stand-in for the cal.lk
+getUTFundRates endpoint, so no requests are sent to the real API.
+
+Usage:
+    python benchmarks.py http                    # Bare requests.get vs pooled session
+    python benchmarks.py http --requests 500     # More requests per run
+    python benchmarks.py backfill                # Serial sleep loop vs rate-limited concurrent fetch
+    python benchmarks.py analytics               # Per-call DataFrame analysis vs prefix-sum index
+    python benchmarks.py --help                  # Show help
+"""
+
+import argparse
+import json
+import statistics
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+import requests
+
+from cal_fund_extractor import CALFundExtractor, create_http_session, DEFAULT_MAX_IN_FLIGHT
+from fund_analytics import FundAnalyticsIndex
+
+
+def build_sample_payload(fund_count: int = 30) -> Dict:
+    """Build a getUTFundRates-shaped payload with the given number of funds"""
+    return {
+        'UTMS_FUND': [
+            {'FUND_NAME': f'Benchmark Fund {i:02d}', 'OLD_PRICE': f'{10 + i * 0.5:.4f}'}
+            for i in range(fund_count)
+        ]
+    }
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Keep-alive capable handler that mimics the CAL fund rates endpoint"""
+
+    protocol_version = "HTTP/1.1"
+    disable_nagle_algorithm = True
+    payload = b"{}"
+    latency = 0.0
+
+    def do_GET(self):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(self.payload)))
+        self.end_headers()
+        self.wfile.write(self.payload)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer:
+    """Local HTTP server running in a background thread"""
+
+    def __init__(self, latency: float = 0.0, fund_count: int = 30):
+        handler = type('BenchmarkHandler', (StandInHandler,), {
+            'payload': json.dumps(build_sample_payload(fund_count)).encode('utf-8'),
+            'latency': latency
+        })
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}/wp-admin/admin-ajax.php"
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def time_calls(call: Callable[[int], None], count: int) -> List[float]:
+    """Time each call individually and return latencies in milliseconds"""
+    latencies = []
+    for i in range(count):
+        started = time.perf_counter()
+        call(i)
+        latencies.append((time.perf_counter() - started) * 1000)
+    return latencies
+
+
+def print_latency_row(label: str, latencies: List[float]):
+    """Print a single benchmark summary row"""
+    ordered = sorted(latencies)
+    p95 = ordered[int(len(ordered) * 0.95) - 1] if len(ordered) > 1 else ordered[0]
+    print(f"  {label:<28} mean {statistics.mean(latencies):8.3f} ms   "
+          f"median {statistics.median(latencies):8.3f} ms   p95 {p95:8.3f} ms")
+
+
+def benchmark_http(request_count: int, latency: float, fund_count: int):
+    """Compare a bare requests.get per call against the extractor's pooled session"""
+    print(f"🔄 HTTP benchmark: {request_count} requests per mode, "
+          f"{latency * 1000:.1f} ms simulated server latency, {fund_count} funds per payload")
+
+    with StandInServer(latency=latency, fund_count=fund_count) as server:
+        params = lambda i: {'action': 'getUTFundRates', 'valuedate': f'2024-01-{i % 28 + 1:02d}'}
+
+        bare = time_calls(lambda i: requests.get(server.url, params=params(i), timeout=10).json(),
+                          request_count)
+
+        extractor = CALFundExtractor(session=create_http_session(), use_cache=False)
+        extractor.base_url = server.url
+        pooled = time_calls(lambda i: extractor.fetch_fund_data(params(i)['valuedate']), request_count)
+        extractor.close()
+
+    print("="*60)
+    print_latency_row("requests.get (new connection)", bare)
+    print_latency_row("pooled keep-alive session", pooled)
+    saved = statistics.mean(bare) - statistics.mean(pooled)
+    print(f"\n  ✅ Saved {saved:.3f} ms per request "
+          f"({saved / statistics.mean(bare) * 100:.1f}% of the bare request latency)")
+    print("  💡 Against cal.lk each new connection also pays a TLS handshake, so real savings are larger")
+
+
+def benchmark_backfill(date_count: int, latency: float, api_delay: float, max_in_flight: int):
+    """Compare the legacy fetch-then-sleep loop against the token-bucket concurrent fetch"""
+    print(f"🔄 Backfill benchmark: {date_count} dates, {latency * 1000:.0f} ms server latency, "
+          f"{1 / api_delay:.1f} requests/second, {max_in_flight} in flight")
+
+    dates = [f"{2013 + i // 24}-{i // 2 % 12 + 1:02d}-{1 if i % 2 == 0 else 15:02d}" for i in range(date_count)]
+
+    with StandInServer(latency=latency) as server:
+        extractor = CALFundExtractor(api_delay=api_delay, max_in_flight=max_in_flight, use_cache=False)
+        extractor.base_url = server.url
+
+        started = time.perf_counter()
+        for date in dates:
+            extractor.fetch_fund_data(date)
+            time.sleep(api_delay)
+        serial = time.perf_counter() - started
+
+        started = time.perf_counter()
+        results = extractor.fetch_dates(dates)
+        concurrent = time.perf_counter() - started
+        extractor.close()
+
+    print("="*60)
+    print(f"  fetch + time.sleep(api_delay)   {serial:8.2f} s   ({date_count / serial:.2f} requests/second)")
+    print(f"  token bucket, concurrent        {concurrent:8.2f} s   ({date_count / concurrent:.2f} requests/second)")
+    print(f"\n  ✅ {serial / concurrent:.1f}x faster at the same request rate cap "
+          f"({sum(1 for r in results.values() if r)}/{date_count} dates fetched)")
+
+
+def build_sample_series(point_count: int, seed: int = 7) -> Dict[str, float]:
+    """Daily random-walk price series as {YYYY-MM-DD: price}"""
+    rng = np.random.default_rng(seed)
+    dates = pd.date_range('1990-01-01', periods=point_count, freq='D').strftime('%Y-%m-%d')
+    prices = 10 * np.exp(np.cumsum(rng.normal(0.0003, 0.01, point_count)))
+    return dict(zip(dates, prices.tolist()))
+
+
+def legacy_window_stats(start_date: str, end_date: str, price_data: Dict[str, float]) -> Dict[str, float]:
+    """The per-call computation analyze_financial_context did before the analytics index
+    
+    Volatility here is the old sqrt(252) daily annualization; the index uses actual time deltas.
+    """
+    start_dt = datetime.strptime(start_date, "%Y-%m-%d")
+    end_dt = datetime.strptime(end_date, "%Y-%m-%d")
+    filtered_data = {}
+    for date_str, price in price_data.items():
+        date_dt = datetime.strptime(date_str, "%Y-%m-%d")
+        if start_dt <= date_dt <= end_dt:
+            filtered_data[date_str] = price
+
+    df = pd.DataFrame(list(filtered_data.items()), columns=['Date', 'Price'])
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values('Date')
+    start_price = df['Price'].iloc[0]
+    end_price = df['Price'].iloc[-1]
+    returns = df['Price'].pct_change().dropna()
+    price_changes = df['Price'].diff()
+    return {
+        'total_return': (end_price - start_price) / start_price * 100,
+        'volatility': returns.std() * np.sqrt(252) * 100,
+        'trend_slope': np.polyfit(np.arange(len(df)), df['Price'].values, 1)[0],
+        'significant_moves': len(price_changes[abs(price_changes) > price_changes.std() * 2]),
+        'min_price': df['Price'].min(),
+        'max_price': df['Price'].max()
+    }
+
+
+def benchmark_analytics(point_count: int, query_count: int):
+    """Compare the legacy per-call window analysis against FundAnalyticsIndex range queries"""
+    print(f"🔄 Analytics benchmark: {point_count} daily points, {query_count} random windows")
+
+    price_data = build_sample_series(point_count)
+    dates = list(price_data)
+    rng = np.random.default_rng(11)
+    windows = []
+    for _ in range(query_count):
+        lo, hi = sorted(rng.choice(len(dates), size=2, replace=False))
+        windows.append((dates[lo], dates[hi]))
+
+    legacy_count = min(query_count, 20)
+    legacy = time_calls(lambda i: legacy_window_stats(*windows[i], price_data), legacy_count)
+
+    started = time.perf_counter()
+    index = FundAnalyticsIndex.from_price_data(price_data)
+    build_ms = (time.perf_counter() - started) * 1000
+    indexed = time_calls(lambda i: index.window_stats(*windows[i]), query_count)
+
+    # Both paths must agree before their timings mean anything (volatility is annualized differently)
+    for start_date, end_date in windows[:legacy_count]:
+        expected = legacy_window_stats(start_date, end_date, price_data)
+        actual = index.window_stats(start_date, end_date)
+        for key, value in expected.items():
+            if key == 'volatility':
+                continue
+            if not np.isclose(actual[key], value, rtol=1e-6, atol=1e-9):
+                raise AssertionError(f"{key} mismatch for {start_date}..{end_date}: {actual[key]} != {value}")
+
+    print("="*60)
+    print_latency_row(f"legacy ({legacy_count} calls)", legacy)
+    print_latency_row(f"index ({query_count} calls)", indexed)
+    print(f"  index build (once per series) {build_ms:8.3f} ms")
+    print(f"\n  ✅ {statistics.mean(legacy) / statistics.mean(indexed):.0f}x faster per query, results match the legacy path")
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Benchmarks - measure data collection and analysis hot paths",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    subparsers = parser.add_subparsers(dest='benchmark')
+
+    http_parser = subparsers.add_parser('http', help='Bare requests.get vs pooled keep-alive session')
+    http_parser.add_argument('--requests', '-n', type=int, default=200,
+                             help='Number of requests per mode (default: 200)')
+    http_parser.add_argument('--latency', type=float, default=0.0,
+                             help='Simulated server latency in seconds (default: 0)')
+    http_parser.add_argument('--funds', type=int, default=30,
+                             help='Funds per payload (default: 30)')
+
+    backfill_parser = subparsers.add_parser('backfill', help='Serial sleep loop vs rate-limited concurrent fetch')
+    backfill_parser.add_argument('--dates', '-n', type=int, default=40,
+                                 help='Number of dates to fetch (default: 40)')
+    backfill_parser.add_argument('--latency', type=float, default=0.3,
+                                 help='Simulated server latency in seconds (default: 0.3)')
+    backfill_parser.add_argument('--api-delay', type=float, default=0.1,
+                                 help='API delay in seconds, i.e. 1 / requests per second (default: 0.1)')
+    backfill_parser.add_argument('--max-in-flight', type=int, default=DEFAULT_MAX_IN_FLIGHT,
+                                 help=f'Max concurrent requests (default: {DEFAULT_MAX_IN_FLIGHT})')
+
+    analytics_parser = subparsers.add_parser('analytics', help='Per-call DataFrame analysis vs prefix-sum index')
+    analytics_parser.add_argument('--points', '-n', type=int, default=20000,
+                                  help='Points in the synthetic series (default: 20000)')
+    analytics_parser.add_argument('--queries', type=int, default=1000,
+                                  help='Random windows to query (default: 1000)')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Benchmarks")
+    print("="*50)
+
+    if args.benchmark == 'http':
+        benchmark_http(args.requests, args.latency, args.funds)
+    elif args.benchmark == 'backfill':
+        benchmark_backfill(args.dates, args.latency, args.api_delay, args.max_in_flight)
+    elif args.benchmark == 'analytics':
+        benchmark_analytics(args.points, args.queries)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,19 +1,121 @@
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 import json
 import pandas as pd
 import matplotlib.pyplot as plt
+import matplotlib.dates as mdates
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 from datetime import datetime, timedelta
 import time
 import os
 import sys
-from typing import List, Dict, Optional
+import threading
+import argparse
+import glob
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Callable, List, Dict, Optional, Tuple
 import numpy as np
 import tkinter as tk
 from tkinter import messagebox, simpledialog, ttk, scrolledtext
+from fund_cache import (RawResponseArchive, NegativeCache, FetchJournal, InceptionDateStore, FundCatalog,
+                        DEFAULT_CACHE_DIR, DEFAULT_CATALOG_TTL_HOURS, NEGATIVE_REASON_TTL_DAYS)
+from fund_storage import (PriceManifest, PricePanelStore, CSV_PATTERN, from_epoch_days, fund_name_for_csv,
+                          get_csv_filename, merge_orphaned_funds, write_csv_atomic)
+from fund_analytics import FundAnalyticsIndex, AnalysisCache, financial_context
+from fund_events import DEFAULT_EVENTS_FILE, get_event_calendar
+from fund_render import RenderManifest, lttb_indices, render_pngs
+
+# HTTP transport defaults shared by every extractor
+DEFAULT_POOL_SIZE = 10
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 10.0
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+DEFAULT_MAX_IN_FLIGHT = 4
+
+# Earliest valuedate considered for any fund (also the floor of the inception date search)
+DEFAULT_START_DATE = "2013-01-01"
+INCEPTION_ANCHOR_ATTEMPTS = 4
+# Sample dates checked just before a bisected inception date, so one missing listing cannot move it later
+INCEPTION_VERIFY_PROBES = 2
+
+
+def create_http_session(pool_size: int = DEFAULT_POOL_SIZE, max_retries: int = DEFAULT_MAX_RETRIES,
+                        backoff_factor: float = DEFAULT_BACKOFF_FACTOR) -> requests.Session:
+    """Create a pooled keep-alive HTTP session with retry/backoff for the CAL API"""
+    retry = Retry(
+        total=max_retries,
+        connect=max_retries,
+        read=max_retries,
+        status=max_retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=RETRY_STATUS_CODES,
+        allowed_methods=frozenset(['GET']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=retry)
+    
+    session = requests.Session()
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    session.headers.update({'Connection': 'keep-alive'})
+    return session
+
+
+class TokenBucketRateLimiter:
+    """Thread-safe token bucket that caps request rate and the number of requests in flight"""
+    
+    def __init__(self, requests_per_second: Optional[float], max_in_flight: int = 1, burst: int = 1):
+        self.requests_per_second = requests_per_second
+        self.max_in_flight = max(1, max_in_flight)
+        self.capacity = max(1, burst)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+    
+    def acquire(self):
+        """Block until both an in-flight slot and a rate token are available"""
+        self._in_flight.acquire()
+        if not self.requests_per_second:
+            return
+        
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.requests_per_second)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.requests_per_second
+            time.sleep(wait)
+    
+    def release(self):
+        """Free the in-flight slot taken by acquire()"""
+        self._in_flight.release()
+    
+    def __enter__(self):
+        self.acquire()
+        return self
+    
+    def __exit__(self, *exc):
+        self.release()
+
 
 class CALFundExtractor:
-    def __init__(self, fund_name: str = None, start_date: str = None, end_date: str = None, api_delay: float = None):
+    def __init__(self, fund_name: str = None, start_date: str = None, end_date: str = None, api_delay: float = None,
+                 session: requests.Session = None, timeout: tuple = None, max_retries: int = DEFAULT_MAX_RETRIES,
+                 backoff_factor: float = DEFAULT_BACKOFF_FACTOR, pool_size: int = DEFAULT_POOL_SIZE,
+                 requests_per_second: float = None, max_in_flight: int = None,
+                 archive: RawResponseArchive = None, use_cache: bool = True, cache_dir: str = DEFAULT_CACHE_DIR,
+                 negative_cache: NegativeCache = None, negative_ttl_days: Dict[str, float] = None,
+                 inception_store: InceptionDateStore = None, fund_catalog: FundCatalog = None,
+                 catalog_ttl_hours: float = DEFAULT_CATALOG_TTL_HOURS, price_manifest: PriceManifest = None,
+                 price_store: PricePanelStore = None, analysis_cache: AnalysisCache = None,
+                 events_file: str = DEFAULT_EVENTS_FILE, render_manifest: RenderManifest = None):
         self.base_url = "https://cal.lk/wp-admin/admin-ajax.php"
         self.target_fund_name = fund_name or "Capital Alliance Quantitative Equity Fund"
         
@@ -25,14 +127,76 @@ class CALFundExtractor:
         # Set default API delay: 0.5 seconds
         self.api_delay = api_delay or 0.5
         
-        self.csv_filename = f'cal_fund_data_{self.target_fund_name.replace(" ", "_").replace("/", "_")}.csv'
+        # Politeness is expressed as a request rate plus a cap on concurrent requests;
+        # the rate defaults to one request per api_delay seconds
+        self.requests_per_second = requests_per_second or (1.0 / self.api_delay)
+        self.max_in_flight = max_in_flight or DEFAULT_MAX_IN_FLIGHT
+        self.rate_limiter = TokenBucketRateLimiter(self.requests_per_second, self.max_in_flight)
+        
+        # Pooled HTTP transport (pass an existing session to share connections between extractors)
+        self.timeout = timeout or (DEFAULT_CONNECT_TIMEOUT, DEFAULT_READ_TIMEOUT)
+        self.session = session or create_http_session(max(pool_size, self.max_in_flight), max_retries, backoff_factor)
+        
+        # Raw payload archive shared by every fund: a valuedate is fetched from the network at most once
+        self.cache_dir = cache_dir
+        if use_cache:
+            self.archive = archive or RawResponseArchive(cache_dir)
+        else:
+            self.archive = None
+        
+        # (fund, date) pairs known to have no price are excluded from fetch planning until their TTL expires
+        if use_cache:
+            self.negative_cache = negative_cache or NegativeCache(cache_dir, ttl_days=negative_ttl_days)
+        else:
+            self.negative_cache = None
+        
+        # Detected first valued date per fund, used to skip pre-inception dates
+        if use_cache:
+            self.inception_store = inception_store or InceptionDateStore(cache_dir)
+        else:
+            self.inception_store = None
+        
+        # Fund list shared by discovery, the config window and the Change Fund dialog
+        if use_cache:
+            self.fund_catalog = fund_catalog or FundCatalog(cache_dir, ttl_hours=catalog_ttl_hours)
+        else:
+            self.fund_catalog = None
+        
+        # Per-fund CSV summaries so earliest-date lookups don't parse every price file
+        if use_cache:
+            self.price_manifest = price_manifest or PriceManifest(cache_dir)
+        else:
+            self.price_manifest = None
+        
+        # Fingerprint of each rendered PNG, so charts are only redrawn when their data changed
+        if use_cache:
+            self.render_manifest = render_manifest or RenderManifest(cache_dir)
+        else:
+            self.render_manifest = None
+        
+        # Date x fund price panel; the per-fund CSVs are exported from it on every save
+        if use_cache:
+            self.price_store = price_store or PricePanelStore(cache_dir)
+        else:
+            self.price_store = None
+        
+        # Memoized analyze_financial_context results, shared with sibling extractors
+        self.analysis_cache = analysis_cache or AnalysisCache()
+        
+        # User-editable contextual events calendar (JSON or CSV), reloaded when the file changes
+        self.events_file = events_file
+        
+        self.csv_filename = get_csv_filename(self.target_fund_name)
         
-    def generate_date_range(self) -> List[str]:
-        """Generate list of dates for 1st and 15th of each month within the specified date range, plus current date if not already included"""
+    def generate_date_range(self, fund_name: str = None, start_date: str = None, end_date: str = None) -> List[str]:
+        """Generate list of dates for 1st and 15th of each month within the specified date range, plus current date if not already included
+        
+        When fund_name has a detected inception date, dates before it are dropped.
+        """
         dates = []
         try:
-            start_date = datetime.strptime(self.start_date, "%Y-%m-%d")
-            end_date = datetime.strptime(self.end_date, "%Y-%m-%d")
+            start_date = datetime.strptime(start_date or self.start_date, "%Y-%m-%d")
+            end_date = datetime.strptime(end_date or self.end_date, "%Y-%m-%d")
         except ValueError as e:
             print(f"Invalid date format. Please use YYYY-MM-DD format. Error: {e}")
             return []
@@ -59,10 +223,144 @@ class CALFundExtractor:
             dates.append(end_date_str)
             print(f"Added current date {end_date_str} to fetch list")
         
+        inception_date = self.get_inception_date(fund_name) if fund_name else None
+        if inception_date:
+            dates = [date for date in dates if date >= inception_date]
+        
         return dates
     
-    def discover_available_funds(self, sample_date: str = None) -> List[str]:
-        """Discover all available funds from the API"""
+    def get_inception_date(self, fund_name: str) -> Optional[str]:
+        """Return the detected inception date for a fund, if known"""
+        if self.inception_store is None:
+            return None
+        return self.inception_store.get(fund_name)
+    
+    def detect_inception_dates(self, fund_names: List[str] = None, force: bool = False) -> Dict[str, str]:
+        """Find each fund's first valued date by bisecting over the 1st/15th valuedate grid, returning new detections
+        
+        Every probe payload lists all funds, so all funds are resolved together: a probe splits
+        the funds still being searched into those already valued on that date and those not yet.
+        Dates that return nothing (holidays, failures) are dropped from the grid and another
+        date is probed instead. Before a date is accepted, the sample dates just before it are
+        checked; a fund listed on one of them was only missing from a probe, and is searched
+        again below it. Funds not valued on the latest date are left undetected, and skipped
+        until the store's not-found TTL passes.
+        """
+        if self.inception_store is None:
+            return {}
+        
+        if fund_names is not None and not force:
+            fund_names = [fund for fund in fund_names
+                          if not self.inception_store.get(fund) and not self.inception_store.is_not_found(fund)]
+            if not fund_names:
+                return {}
+        
+        grid = self.generate_date_range(start_date=DEFAULT_START_DATE)
+        probes = {}
+        
+        def probe(index: int) -> Optional[Dict[str, float]]:
+            if index not in probes:
+                fund_data = self._fetch_with_limit(grid[index])
+                if fund_data and fund_data.get('UTMS_FUND'):
+                    listed = [fund.get('FUND_NAME') for fund in fund_data['UTMS_FUND']]
+                    probes[index], _ = self.extract_all_fund_prices(fund_data, listed)
+                else:
+                    probes[index] = None
+            return probes[index]
+        
+        # Anchor on the latest date that returned data (give up quickly if the API is unreachable)
+        top = len(grid) - 1
+        while top >= max(0, len(grid) - INCEPTION_ANCHOR_ATTEMPTS) and probe(top) is None:
+            top -= 1
+        if top < 0 or probes.get(top) is None:
+            print("Failed to fetch fund data for inception date detection")
+            return {}
+        
+        candidates = list(probes[top]) if fund_names is None else fund_names
+        searching = [fund for fund in candidates if fund in probes[top]]
+        not_found = [fund for fund in candidates if fund not in probes[top]]
+        for fund in not_found:
+            print(f"  ⚠ {fund} has no price on {grid[top]} - skipping inception detection")
+        self.inception_store.record_not_found(not_found, grid[top])
+        
+        print(f"\nDetecting inception dates for {len(searching)} funds by bisection...")
+        
+        # Each task holds grid indices where the funds' first valued date must lie;
+        # the funds are known to be valued on the last index of the task
+        inception_dates = {}
+        tasks = [(list(range(top + 1)), searching)]
+        while tasks:
+            indices, funds = tasks.pop()
+            if not funds:
+                continue
+            if len(indices) == 1:
+                # A fund missing from a single payload sends the bisection past its real
+                # inception; look at the sample dates just before and search again below
+                # the earliest one still listing it
+                index, checked, listed_before = indices[0], 0, {}
+                earlier = index - 1
+                while earlier >= max(0, index - 2 * INCEPTION_VERIFY_PROBES) and checked < INCEPTION_VERIFY_PROBES:
+                    prices = probe(earlier)
+                    if prices is not None:
+                        checked += 1
+                        listed_before.update({fund: earlier for fund in funds if fund in prices})
+                    earlier -= 1
+                
+                for fund in funds:
+                    if fund not in listed_before:
+                        inception_dates[fund] = grid[index]
+                for earliest in set(listed_before.values()):
+                    tasks.append((list(range(earliest + 1)),
+                                  [fund for fund, listed in listed_before.items() if listed == earliest]))
+                continue
+            
+            middle = (len(indices) - 1) // 2
+            prices = probe(indices[middle])
+            if prices is None:
+                tasks.append((indices[:middle] + indices[middle + 1:], funds))
+                continue
+            
+            tasks.append((indices[:middle + 1], [fund for fund in funds if fund in prices]))
+            tasks.append((indices[middle + 1:], [fund for fund in funds if fund not in prices]))
+        
+        print(f"  ✓ Resolved {len(inception_dates)} inception dates with {len(probes)} API calls")
+        self.inception_store.update(inception_dates, DEFAULT_START_DATE)
+        return inception_dates
+    
+    def discover_available_funds(self, sample_date: str = None, force_refresh: bool = False) -> List[str]:
+        """Discover all available funds, answering from the fund catalog unless a sample date is given
+        
+        A stale catalog is still returned immediately while a background thread refreshes it.
+        """
+        catalog = self.fund_catalog
+        if sample_date is None and not force_refresh and catalog is not None and catalog.has_funds():
+            available_funds = catalog.fund_names()
+            refreshed_at = catalog.refreshed_at.strftime('%Y-%m-%d %H:%M') if catalog.refreshed_at else 'unknown'
+            print(f"Found {len(available_funds)} available funds in fund catalog (refreshed {refreshed_at})")
+            if catalog.is_stale():
+                self.refresh_fund_catalog_in_background()
+            return available_funds
+        
+        return self._discover_funds_from_api(sample_date)
+    
+    def refresh_fund_catalog_in_background(self) -> Optional[threading.Thread]:
+        """Refresh the fund catalog from the API on a daemon thread (no-op if one is running)"""
+        if self.fund_catalog is None or not self.fund_catalog.begin_refresh():
+            return None
+        
+        def refresh():
+            try:
+                self._discover_funds_from_api()
+            finally:
+                self.fund_catalog.end_refresh()
+        
+        print("Fund catalog is stale - refreshing in the background")
+        thread = threading.Thread(target=refresh, name='fund-catalog-refresh', daemon=True)
+        thread.start()
+        return thread
+    
+    def _discover_funds_from_api(self, sample_date: str = None) -> List[str]:
+        """Discover all available funds from the API and record them in the fund catalog"""
         # Use current date - 10 if no sample date provided
         if sample_date is None:
             sample_date = (datetime.now() - timedelta(days=10)).strftime("%Y-%m-%d")
@@ -80,21 +378,34 @@ class CALFundExtractor:
             if fund_name:
                 available_funds.append(fund_name)
         
+        if self.fund_catalog is not None and available_funds:
+            self.fund_catalog.record_refresh(sample_date, available_funds)
+        
         print(f"Found {len(available_funds)} available funds")
         return available_funds
     
     def get_fund_earliest_date(self, fund_name: str) -> str:
         """Get the earliest date available for a specific fund from its CSV file"""
-        csv_filename = f'cal_fund_data_{fund_name.replace(" ", "_").replace("/", "_")}.csv'
+        csv_filename = get_csv_filename(fund_name)
         
         if not os.path.exists(csv_filename):
+            inception_date = self.get_inception_date(fund_name)
+            if inception_date:
+                print(f"No CSV file found for {fund_name}, using detected inception date {inception_date}")
+                return inception_date
             print(f"No CSV file found for {fund_name}, using default start date")
-            return "2013-01-01"
+            return DEFAULT_START_DATE
+        
+        summary = self.price_manifest.get(fund_name, csv_filename) if self.price_manifest is not None else None
+        if summary is not None:
+            print(f"Found earliest date for {fund_name}: {summary['min_date']}")
+            return summary['min_date']
         
         try:
             df = pd.read_csv(csv_filename)
             if 'Date' in df.columns and len(df) > 0:
                 df['Date'] = pd.to_datetime(df['Date'])
+                self._record_csv_summary(fund_name, csv_filename, df)
                 earliest_date = df['Date'].min().strftime("%Y-%m-%d")
                 print(f"Found earliest date for {fund_name}: {earliest_date}")
                 return earliest_date
@@ -110,6 +421,11 @@ class CALFundExtractor:
         available_funds = self.discover_available_funds()
         earliest_dates = {}
         
+        # Funds without a CSV fall back to their inception date, detected for all of them at once
+        funds_without_csv = [fund for fund in available_funds if not os.path.exists(get_csv_filename(fund))]
+        if funds_without_csv:
+            self.detect_inception_dates(funds_without_csv)
+        
         print(f"\nDetecting earliest dates for {len(available_funds)} funds:")
         print("-" * 50)
         
@@ -117,10 +433,20 @@ class CALFundExtractor:
             earliest_date = self.get_fund_earliest_date(fund_name)
             earliest_dates[fund_name] = earliest_date
         
+        self._save_caches()
         return earliest_dates
     
     def load_existing_data(self) -> Dict[str, float]:
-        """Load existing data from CSV file if it exists, filtered by current date range"""
+        """Load existing data for the current date range from the price store, or the CSV file if it exists"""
+        if self.price_store is not None and self.price_store.has_fund(self.target_fund_name):
+            # A CSV edited outside the tool no longer matches its manifest entry and is re-imported below
+            csv_in_sync = (not os.path.exists(self.csv_filename) or
+                           self.price_manifest.get(self.target_fund_name, self.csv_filename) is not None)
+            if csv_in_sync:
+                existing_data = self.price_store.fund_prices(self.target_fund_name, self.start_date, self.end_date)
+                print(f"Loaded {len(existing_data)} existing data points for {self.target_fund_name} from the price store")
+                return existing_data
+        
         if not os.path.exists(self.csv_filename):
             print(f"No existing data file found: {self.csv_filename}")
             return {}
@@ -141,6 +467,13 @@ class CALFundExtractor:
                 # Convert to dictionary with date as key and price as value
                 existing_data = dict(zip(filtered_df['Date'].dt.strftime('%Y-%m-%d'), filtered_df['OLD_PRICE']))
                 
+                # Bring the CSV into the price store so later loads skip parsing it
+                if self.price_store is not None:
+                    self.price_store.import_csv(self.csv_filename, self.target_fund_name, replace=True)
+                    self.price_store.save()
+                    self._record_csv_summary(self.target_fund_name, self.csv_filename, df)
+                    self._save_caches()
+                
                 total_points = len(df)
                 filtered_points = len(existing_data)
                 
@@ -158,20 +491,108 @@ class CALFundExtractor:
             return {}
     
     def fetch_fund_data(self, date: str) -> Optional[Dict]:
-        """Fetch fund data for a specific date"""
+        """Fetch fund data for a specific date, reading through the raw response archive"""
+        if self.archive is not None:
+            archived = self.archive.get(date)
+            if archived is not None:
+                return archived
+        
         params = {
             'action': 'getUTFundRates',
             'valuedate': date
         }
         
         try:
-            response = requests.get(self.base_url, params=params, timeout=10)
+            response = self.session.get(self.base_url, params=params, timeout=self.timeout)
             response.raise_for_status()
-            return response.json()
+            fund_data = response.json()
+            if self.archive is not None:
+                self.archive.put(date, fund_data)
+            if self.fund_catalog is not None and isinstance(fund_data, dict):
+                self.fund_catalog.observe(date, [fund.get('FUND_NAME') for fund in fund_data.get('UTMS_FUND') or []
+                                                 if fund.get('FUND_NAME')])
+            return fund_data
         except requests.exceptions.RequestException as e:
             print(f"Error fetching data for date {date}: {e}")
             return None
     
+    def create_sibling_extractor(self, fund_name: str = None) -> 'CALFundExtractor':
+        """Create an extractor for another fund that shares this extractor's transport and caches"""
+        return CALFundExtractor(fund_name, self.start_date, self.end_date, self.api_delay,
+                                session=self.session, requests_per_second=self.requests_per_second,
+                                max_in_flight=self.max_in_flight, archive=self.archive,
+                                use_cache=self.archive is not None, cache_dir=self.cache_dir,
+                                negative_cache=self.negative_cache, inception_store=self.inception_store,
+                                fund_catalog=self.fund_catalog, price_manifest=self.price_manifest,
+                                price_store=self.price_store, analysis_cache=self.analysis_cache,
+                                events_file=self.events_file, render_manifest=self.render_manifest)
+    
+    def _fetch_with_limit(self, date: str) -> Optional[Dict]:
+        """Fetch fund data for a date while holding a rate limiter slot"""
+        with self.rate_limiter:
+            return self.fetch_fund_data(date)
+    
+    def fetch_dates(self, dates: List[str],
+                    on_result: Callable[[str, Optional[Dict]], None] = None) -> Dict[str, Optional[Dict]]:
+        """Fetch fund data for many dates concurrently under the rate limiter, keyed by date
+        
+        on_result, if given, is called on the calling thread as each date's result arrives.
+        """
+        results = {}
+        network_dates = []
+        
+        # Archived dates are served locally and never consume a rate limiter token
+        for date in dates:
+            archived = self.archive.get(date) if self.archive is not None else None
+            if archived is not None:
+                results[date] = archived
+                if on_result:
+                    on_result(date, archived)
+            else:
+                network_dates.append(date)
+        
+        if len(results) > 0:
+            print(f"  📦 Served {len(results)} dates from the raw response archive")
+        if not network_dates:
+            return results
+        
+        executor = ThreadPoolExecutor(max_workers=self.max_in_flight)
+        try:
+            futures = {executor.submit(self._fetch_with_limit, date): date for date in network_dates}
+            for i, future in enumerate(as_completed(futures), 1):
+                date = futures[future]
+                try:
+                    results[date] = future.result()
+                except Exception as e:
+                    print(f"Error fetching data for date {date}: {e}")
+                    results[date] = None
+                if on_result:
+                    on_result(date, results[date])
+                print(f"  Fetched date {i}/{len(network_dates)}: {date}")
+        except BaseException:
+            # Ctrl+C: drop the queued dates instead of fetching the rest of the backfill first
+            executor.shutdown(wait=False, cancel_futures=True)
+            raise
+        executor.shutdown()
+        
+        return results
+    
+    def _save_caches(self):
+        """Persist caches that batch their writes"""
+        if self.negative_cache is not None:
+            self.negative_cache.save()
+        if self.fund_catalog is not None:
+            self.fund_catalog.save()
+        if self.price_manifest is not None:
+            try:
+                self.price_manifest.save()
+            except OSError as e:
+                print(f"Warning: Could not save price manifest: {e}")
+    
+    def close(self):
+        """Close the pooled HTTP session and release its connections"""
+        self.session.close()
+    
     def extract_target_fund_price(self, fund_data: Dict, date: str) -> Optional[float]:
         """Extract OLD_PRICE for the target fund from fund data"""
         if not fund_data or 'UTMS_FUND' not in fund_data:
@@ -188,20 +609,82 @@ class CALFundExtractor:
         print(f"Fund '{self.target_fund_name}' not found for date {date}")
         return None
     
+    @staticmethod
+    def extract_all_fund_prices(fund_data: Optional[Dict], fund_names: List[str]) -> Tuple[Dict[str, float], Dict[str, str]]:
+        """Split fund data into valid prices and negative cache reason codes for the given funds"""
+        prices = {}
+        misses = {}
+        funds = fund_data.get('UTMS_FUND') if isinstance(fund_data, dict) else None
+        funds_by_name = {fund.get('FUND_NAME'): fund for fund in funds or []}
+        
+        for fund_name in fund_names:
+            if not fund_data:
+                misses[fund_name] = 'no_response'
+                continue
+            if not funds:
+                misses[fund_name] = 'empty_payload'
+                continue
+            
+            fund = funds_by_name.get(fund_name)
+            if fund is None:
+                misses[fund_name] = 'fund_not_listed'
+                continue
+            
+            try:
+                price = float(fund.get('OLD_PRICE', 0))
+            except (ValueError, TypeError):
+                misses[fund_name] = 'invalid_price'
+                continue
+            
+            if price > 0:
+                prices[fund_name] = price
+            else:
+                misses[fund_name] = 'non_positive_price'
+        
+        return prices, misses
+    
+    @staticmethod
+    def classify_missing_price(fund_data: Optional[Dict], fund_name: str) -> Optional[str]:
+        """Return the negative cache reason code if fund_data has no usable price for the fund"""
+        _, misses = CALFundExtractor.extract_all_fund_prices(fund_data, [fund_name])
+        return misses.get(fund_name)
+    
+    def _record_negative_result(self, fund_name: str, date: str, fund_data: Optional[Dict]):
+        """Record or clear the negative cache entry for a fetched (fund, date) pair"""
+        if self.negative_cache is None:
+            return
+        
+        reason = self.classify_missing_price(fund_data, fund_name)
+        if reason:
+            self.negative_cache.record(fund_name, date, reason)
+        else:
+            self.negative_cache.discard(fund_name, date)
+    
     def collect_price_data(self) -> Dict[str, float]:
         """Collect price data for all dates in the range, using cached data when available"""
         # Load existing data first
         price_data = self.load_existing_data()
         
-        dates = self.generate_date_range()
+        # Skip dates before the fund existed
+        self.detect_inception_dates([self.target_fund_name])
+        dates = self.generate_date_range(self.target_fund_name)
         missing_dates = [date for date in dates if date not in price_data]
         existing_dates = [date for date in dates if date in price_data]
         
+        # Skip dates already known to have no price for this fund
+        known_empty_count = 0
+        if self.negative_cache is not None:
+            fetchable_dates = self.negative_cache.exclude(self.target_fund_name, missing_dates)
+            known_empty_count = len(missing_dates) - len(fetchable_dates)
+            missing_dates = fetchable_dates
+        
         # Show data coverage summary
         print(f"\nData Coverage Summary:")
         print(f"  Total dates in range: {len(dates)}")
         print(f"  Existing data points: {len(existing_dates)}")
         print(f"  Missing data points: {len(missing_dates)}")
+        if known_empty_count:
+            print(f"  Known no-data dates skipped: {known_empty_count}")
         
         if existing_dates:
             print(f"  Existing data range: {min(existing_dates)} to {max(existing_dates)}")
@@ -214,10 +697,13 @@ class CALFundExtractor:
             successful_fetches = 0
             skipped_dates = 0
             
+            fetched = self.fetch_dates(missing_dates)
+            
+            # Merge in date order so output is deterministic regardless of completion order
             for i, date in enumerate(missing_dates, 1):
                 print(f"  Processing missing date {i}/{len(missing_dates)}: {date}")
                 
-                fund_data = self.fetch_fund_data(date)
+                fund_data = fetched.get(date)
                 if fund_data:
                     price = self.extract_target_fund_price(fund_data, date)
                     if price is not None and price > 0:  # Only store valid prices
@@ -231,8 +717,9 @@ class CALFundExtractor:
                     skipped_dates += 1
                     print(f"    ⚠ Failed to fetch data - skipping date")
                 
-                # Add configurable delay to be respectful to the API
-                time.sleep(self.api_delay)
+                self._record_negative_result(self.target_fund_name, date, fund_data)
+            
+            self._save_caches()
             
             print(f"\nFetch Summary:")
             print(f"  ✓ Successfully fetched: {successful_fetches} dates")
@@ -326,16 +813,10 @@ class CALFundExtractor:
                              font=('Arial', 10), wraplength=280)
         fund_info.pack(pady=(0, 10))
         
-        # Add data summary
-        summary_text = f"""Data Summary:
-• Total Points: {len(df)}
-• Date Range: {df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}
-• Price Range: {df['Price'].min():.4f} to {df['Price'].max():.4f}
-• Average Price: {df['Price'].mean():.4f}"""
-        
-        summary_label = ttk.Label(left_panel, text=summary_text, 
-                                  font=('Arial', 9), justify=tk.LEFT)
-        summary_label.pack(pady=(0, 20))
+        # Add data summary (kept in sync with the visible window as the graph is zoomed)
+        self.summary_label = ttk.Label(left_panel, text=self._format_data_summary(), 
+                                       font=('Arial', 9), justify=tk.LEFT)
+        self.summary_label.pack(pady=(0, 20))
         
         # Add analysis buttons
         self._create_analysis_buttons(left_panel)
@@ -423,14 +904,15 @@ class CALFundExtractor:
             self.end_date = yesterday
             
             # Create new extractor with updated end date
-            extractor = CALFundExtractor(self.target_fund_name, self.start_date, self.end_date, self.api_delay)
+            extractor = self.create_sibling_extractor(self.target_fund_name)
             
             # Collect fresh data
             new_price_data = extractor.collect_price_data()
             
             if new_price_data:
-                # Update the current data
+                # Update the current data; analyses of the old prices are no longer valid
                 self.price_data = new_price_data
+                self.analysis_cache.invalidate(self.target_fund_name)
                 
                 # Convert to DataFrame and update graph
                 df = pd.DataFrame(list(new_price_data.items()), columns=['Date', 'Price'])
@@ -439,25 +921,10 @@ class CALFundExtractor:
                 self.df = df
                 
                 # Update the graph
-                self.line.set_data(self.df['Date'], self.df['Price'])
-                self.ax.relim()
-                self.ax.autoscale_view()
-                self.canvas.draw()
+                self._show_series(self.df)
                 
                 # Update summary
-                summary_text = f"""Data Summary:
-• Total Points: {len(df)}
-• Date Range: {df['Date'].min().strftime('%Y-%m-%d')} to {df['Date'].max().strftime('%Y-%m-%d')}
-• Price Range: {df['Price'].min():.4f} to {df['Price'].max():.4f}
-• Average Price: {df['Price'].mean():.4f}"""
-                
-                # Update summary label (find and update it)
-                for widget in self.root.winfo_children():
-                    if isinstance(widget, ttk.Frame):
-                        for child in widget.winfo_children():
-                            if isinstance(child, ttk.Label) and "Data Summary:" in str(child.cget("text")):
-                                child.config(text=summary_text)
-                                break
+                self.summary_label.config(text=self._format_data_summary())
                 
                 self.status_label.config(text=f"✅ Updated with {len(new_price_data)} data points")
                 messagebox.showinfo("Success", f"Data refreshed successfully!\nNew data points: {len(new_price_data)}")
@@ -495,7 +962,7 @@ class CALFundExtractor:
             ttk.Label(main_frame, text="Available Funds:").pack(anchor=tk.W)
             
             # Get available funds
-            temp_extractor = CALFundExtractor()
+            temp_extractor = self.create_sibling_extractor()
             available_funds = temp_extractor.discover_available_funds()
             
             fund_var = tk.StringVar(value=self.target_fund_name)
@@ -513,7 +980,7 @@ class CALFundExtractor:
                 
                 # Update the current analysis with new fund
                 self.target_fund_name = selected_fund
-                self.csv_filename = f'cal_fund_data_{self.target_fund_name.replace(" ", "_").replace("/", "_")}.csv'
+                self.csv_filename = get_csv_filename(self.target_fund_name)
                 
                 # Refresh data for new fund
                 self._refresh_data()
@@ -710,6 +1177,12 @@ Tips:
         # Plot the data
         self.line, = self.ax.plot(self.df['Date'], self.df['Price'], 
                                  marker='o', linewidth=2, markersize=4, alpha=0.7)
+        self._plot_x = mdates.date2num(self.df['Date'])
+        self._plot_y = self.df['Price'].to_numpy(dtype=np.float64)
+        self._downsample_view()
+        
+        # Zooming or panning re-downsamples the visible window and updates its summary
+        self.ax.callbacks.connect('xlim_changed', self._on_view_changed)
         
         # Set up the plot
         self.ax.set_title(f'{self.target_fund_name}\nPrice Trend Analysis', 
@@ -721,8 +1194,9 @@ Tips:
         # Format x-axis dates
         plt.setp(self.ax.xaxis.get_majorticklabels(), rotation=45, ha='right')
         
-        # Create canvas and embed in tkinter
+        # Create canvas and embed in tkinter; a resized window gets a matching point count
         self.canvas = FigureCanvasTkAgg(self.fig, parent)
+        self.canvas.mpl_connect('resize_event', lambda event: self._downsample_view())
         self.canvas.draw()
         self.canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
         
@@ -731,6 +1205,30 @@ Tips:
         toolbar = NavigationToolbar2Tk(self.canvas, parent)
         toolbar.update()
     
+    def _show_series(self, df: pd.DataFrame):
+        """Plot df's prices, rescale the axes to them and redraw"""
+        self._plot_x = mdates.date2num(df['Date'])
+        self._plot_y = df['Price'].to_numpy(dtype=np.float64)
+        
+        # Autoscale on the full series so the limits don't depend on which points are drawn
+        self.line.set_data(self._plot_x, self._plot_y)
+        self.ax.set_autoscale_on(True)  # A zoom or pan turns autoscaling off
+        self.ax.relim()
+        self.ax.autoscale_view()
+        self._downsample_view()
+        self.canvas.draw()
+    
+    def _downsample_view(self):
+        """Draw about one point per pixel column of the visible date window (LTTB)"""
+        x, y = self._plot_x, self._plot_y
+        start, end = self.ax.get_xlim()
+        
+        # Keep one point past each edge so the line runs off the visible area
+        first = max(int(np.searchsorted(x, start, side='left')) - 1, 0)
+        last = min(int(np.searchsorted(x, end, side='right')) + 1, len(x))
+        keep = first + lttb_indices(x[first:last], y[first:last], int(self.ax.get_window_extent().width))
+        self.line.set_data(x[keep], y[keep])
+    
     def _update_graph_range(self):
         """Update graph with new date range"""
         try:
@@ -745,16 +1243,41 @@ Tips:
                 return
             
             # Update the plot
-            self.line.set_data(filtered_df['Date'], filtered_df['Price'])
-            self.ax.relim()
-            self.ax.autoscale_view()
-            self.canvas.draw()
+            self._show_series(filtered_df)
             
             messagebox.showinfo("Success", f"Graph updated with {len(filtered_df)} data points")
             
         except Exception as e:
             messagebox.showerror("Error", f"Invalid date format: {e}")
     
+    def _format_data_summary(self, start_date: str = None, end_date: str = None) -> str:
+        """Summary panel text for the whole series, or for [start_date, end_date] when zoomed"""
+        index = self.get_analytics_index(self.price_data)
+        stats = index.window_stats(start_date or index.date_at(0), end_date or index.date_at(len(index) - 1))
+        if stats is None:
+            return "Data Summary (current view):\n• No data in view"
+        
+        title = "Data Summary (current view):" if start_date or end_date else "Data Summary:"
+        return f"""{title}
+• Total Points: {stats['data_points']}
+• Date Range: {stats['first_date']} to {stats['last_date']}
+• Price Range: {stats['min_price']:.4f} to {stats['max_price']:.4f}
+• Average Price: {stats['mean_price']:.4f}
+• Max Drawdown: {stats['max_drawdown']:.2f}% ({stats['drawdown_peak_date']} to {stats['drawdown_trough_date']})"""
+    
+    def _on_view_changed(self, ax):
+        """Refresh the plotted points and summary panel for the visible date window"""
+        self._downsample_view()
+        
+        summary_label = getattr(self, 'summary_label', None)
+        if summary_label is None or not self.price_data:
+            return
+        
+        xlim = ax.get_xlim()
+        start_date = pd.to_datetime(xlim[0], unit='D').strftime('%Y-%m-%d')
+        end_date = pd.to_datetime(xlim[1], unit='D').strftime('%Y-%m-%d')
+        summary_label.config(text=self._format_data_summary(start_date, end_date))
+    
     def _analyze_current_view(self):
         """Analyze the currently visible area of the graph"""
         try:
@@ -763,16 +1286,12 @@ Tips:
             start_date = pd.to_datetime(xlim[0], unit='D').strftime('%Y-%m-%d')
             end_date = pd.to_datetime(xlim[1], unit='D').strftime('%Y-%m-%d')
             
-            # Filter data for current view
-            filtered_data = {date: price for date, price in self.price_data.items() 
-                           if start_date <= date <= end_date}
-            
-            if not filtered_data:
+            # The analytics index windows the full series, so no per-zoom filtered copy is built
+            context = self.analyze_financial_context(start_date, end_date, self.price_data)
+            if "error" in context:
                 messagebox.showwarning("Warning", "No data in current view")
                 return
             
-            # Analyze
-            context = self.analyze_financial_context(start_date, end_date, filtered_data)
             self._display_context_gui(context, f"Current View Analysis ({start_date} to {end_date})")
             
         except Exception as e:
@@ -1043,8 +1562,10 @@ Tips:
 
 📅 Period: {context['date_range']}
 📈 Total Return: {context['total_return']}%
-📊 Volatility: {context['volatility']}%
+📈 CAGR: {context['cagr']}%
+📊 Volatility (annualized): {context['volatility']}%
 💰 Price Range: {context['price_range']}
+📉 Max Drawdown: {context['max_drawdown']}% ({context['drawdown_period']})
 📋 Data Points: {context['data_points']}
 
 📈 TREND ANALYSIS:
@@ -1191,16 +1712,67 @@ historical context and market events.
             print("No data to save")
             return
         
-        df = pd.DataFrame(list(price_data.items()), columns=['Date', 'OLD_PRICE'])
-        df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
-        
-        df.to_csv(self.csv_filename, index=False)
+        self.save_fund_prices({self.target_fund_name: price_data})
         print(f"Data saved to '{self.csv_filename}'")
         
         # Automatically generate PNG when CSV is updated
         self.generate_png_from_csv()
     
+    def save_fund_prices(self, fund_prices: Dict[str, Dict[str, float]]):
+        """Write {fund: {date: price}} to the price store and export each fund's CSV from it
+        
+        The exported CSV holds every stored date for the fund, not just the dates passed in.
+        When only dates after the CSV's last row changed, just those rows are appended to a
+        copy of the file; otherwise it is rewritten in full. Either way the new file replaces
+        the old one by rename.
+        """
+        if self.price_store is None:
+            for fund_name, price_data in fund_prices.items():
+                df = pd.DataFrame(list(price_data.items()), columns=['Date', 'OLD_PRICE'])
+                df['Date'] = pd.to_datetime(df['Date'])
+                df = df.sort_values('Date')
+                write_csv_atomic(df, get_csv_filename(fund_name))
+            return
+        
+        changed = self.price_store.upsert(fund_prices)
+        self.price_store.save()
+        
+        for fund_name in fund_prices:
+            csv_filename = get_csv_filename(fund_name)
+            changed_dates = from_epoch_days(changed[fund_name])
+            summary = self.price_manifest.get(fund_name, csv_filename)
+            
+            if summary is not None and not changed_dates:
+                continue  # CSV already matches the store
+            
+            if summary is not None and changed_dates[0] > summary['max_date']:
+                appended = self.price_store.export_csv(fund_name, csv_filename, after_date=summary['max_date'])
+                try:
+                    self.price_manifest.record(fund_name, csv_filename, summary['min_date'],
+                                               appended['Date'].max().strftime("%Y-%m-%d"),
+                                               summary['row_count'] + len(appended),
+                                               last_fetch=datetime.now().isoformat(timespec='seconds'))
+                except OSError as e:
+                    print(f"Warning: Could not update price manifest for {fund_name}: {e}")
+            else:
+                df = self.price_store.export_csv(fund_name, csv_filename)
+                self._record_csv_summary(fund_name, csv_filename, df, fetched=True)
+        
+        # One manifest write for the whole batch of CSVs
+        self._save_caches()
+    
+    def _record_csv_summary(self, fund_name: str, csv_filename: str, df: pd.DataFrame, fetched: bool = False):
+        """Update the price manifest for a CSV file that was just written (or read)"""
+        if self.price_manifest is None or df.empty:
+            return
+        
+        try:
+            self.price_manifest.record(fund_name, csv_filename,
+                                       df['Date'].min().strftime("%Y-%m-%d"), df['Date'].max().strftime("%Y-%m-%d"),
+                                       len(df), last_fetch=datetime.now().isoformat(timespec='seconds') if fetched else None)
+        except OSError as e:
+            print(f"Warning: Could not update price manifest for {fund_name}: {e}")
+    
     def generate_png_from_csv(self, csv_filename: str = None):
         """Generate PNG visualization from CSV file"""
         if csv_filename is None:
@@ -1210,69 +1782,34 @@ historical context and market events.
             print(f"CSV file not found: {csv_filename}")
             return
         
-        try:
-            # Read CSV data
-            df = pd.read_csv(csv_filename)
-            if 'Date' not in df.columns or 'OLD_PRICE' not in df.columns:
-                print(f"Invalid CSV format in {csv_filename}")
-                return
-            
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values('Date')
-            
-            if len(df) == 0:
-                print(f"No data to visualize in {csv_filename}")
-                return
-            
-            # Create the plot
-            plt.figure(figsize=(12, 8))
-            plt.plot(df['Date'], df['OLD_PRICE'], marker='o', linewidth=2, markersize=4, alpha=0.7)
-            
-            # Set up the plot
-            fund_name = self.target_fund_name
-            plt.title(f'{fund_name}\nPrice Trend Analysis', fontsize=14, fontweight='bold')
-            plt.xlabel('Date', fontsize=12)
-            plt.ylabel('Price (LKR)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            
-            # Format x-axis dates
-            plt.xticks(rotation=45)
-            
-            # Generate PNG filename
-            png_filename = csv_filename.replace('.csv', '.png').replace('cal_fund_data_', 'cal_fund_price_trend_')
-            
-            # Save as high-resolution PNG
-            plt.tight_layout()
-            plt.savefig(png_filename, dpi=300, bbox_inches='tight')
-            plt.close()  # Close the figure to free memory
-            
-            print(f"PNG visualization saved to '{png_filename}'")
-            
-        except Exception as e:
-            print(f"Error generating PNG from {csv_filename}: {e}")
-            plt.close()  # Ensure figure is closed even on error
+        render = render_pngs([(csv_filename, self.target_fund_name)], 1, manifest=self.render_manifest)[0]
+        if render['error'] is not None:
+            print(f"Error generating PNG from {csv_filename}: {render['error']}")
+        elif render['skipped']:
+            print(f"PNG '{render['png']}' is up to date (data unchanged)")
+        else:
+            print(f"PNG visualization saved to '{render['png']}'")
 
-    def init_all_funds_data(self, sample_date: str = None) -> Dict[str, Dict[str, float]]:
-        """Initialize data collection for all available funds using smart caching and single API call per date"""
+    def init_all_funds_data(self, sample_date: str = None, resume: bool = True,
+                            render_workers: int = None) -> Dict[str, Dict[str, float]]:
+        """Initialize data collection for all available funds using smart caching and single API call per date
+        
+        With resume enabled, each fetched date is appended to a write-ahead journal as it arrives;
+        a rerun after a crash or Ctrl+C replays the journal and only fetches unfinished dates.
+        PNGs are rendered on render_workers processes (default: CPU count, 1 = serial).
+        """
         # Use current date - 10 if no sample date provided
         if sample_date is None:
             sample_date = (datetime.now() - timedelta(days=10)).strftime("%Y-%m-%d")
         
         print(f"Initializing data collection for all funds using sample date: {sample_date}")
         
-        # First, discover all available funds
-        fund_data = self.fetch_fund_data(sample_date)
-        if not fund_data or 'UTMS_FUND' not in fund_data:
+        # First, discover all available funds (always from the API so the fund catalog is refreshed)
+        available_funds = self.discover_available_funds(sample_date)
+        if not available_funds:
             print("Failed to fetch fund data for initialization")
             return {}
         
-        # Get all fund names
-        available_funds = []
-        for fund in fund_data['UTMS_FUND']:
-            fund_name = fund.get('FUND_NAME')
-            if fund_name:
-                available_funds.append(fund_name)
-        
         print(f"Found {len(available_funds)} available funds:")
         for i, fund in enumerate(available_funds, 1):
             print(f"  {i:2d}. {fund}")
@@ -1283,20 +1820,48 @@ historical context and market events.
         
         for fund_name in available_funds:
             # Create a temporary extractor for this fund to load existing data
-            temp_extractor = CALFundExtractor(fund_name, self.start_date, self.end_date, self.api_delay)
+            temp_extractor = self.create_sibling_extractor(fund_name)
             existing_data = temp_extractor.load_existing_data()
             all_funds_data[fund_name] = existing_data.copy()
             existing_data_summary[fund_name] = len(existing_data)
         
-        # Generate date range
+        # Generate date range and find when each fund started so pre-inception dates are never fetched
         dates = self.generate_date_range()
+        self.detect_inception_dates(available_funds)
+        
+        # Replay results journaled by an interrupted run
+        journal = FetchJournal(self.cache_dir) if resume else None
+        journaled = {}
+        if journal is not None:
+            date_set = set(dates)
+            # Failed fetches are not finished: older journals may hold them, so skip those on replay
+            journaled = {date: entry for date, entry in journal.replay().items()
+                         if date in date_set and (entry['prices'] or 'no_response' not in entry['misses'].values())}
+        
+        if journaled:
+            print(f"\n↩ Resuming from fetch journal: {len(journaled)} dates already fetched")
+            for date, entry in journaled.items():
+                for fund_name, price in entry['prices'].items():
+                    if fund_name in all_funds_data:
+                        all_funds_data[fund_name][date] = price
+                if self.negative_cache is not None:
+                    for fund_name, reason in entry['misses'].items():
+                        self.negative_cache.record(fund_name, date, reason)
         
         # Calculate missing dates for each fund
         missing_dates_by_fund = {}
         total_missing_dates = set()
+        known_empty_count = 0
         
         for fund_name in available_funds:
-            missing_dates = [date for date in dates if date not in all_funds_data[fund_name]]
+            missing_dates = [date for date in dates if date not in all_funds_data[fund_name] and date not in journaled]
+            inception_date = self.get_inception_date(fund_name)
+            if inception_date:
+                missing_dates = [date for date in missing_dates if date >= inception_date]
+            if self.negative_cache is not None:
+                fetchable_dates = self.negative_cache.exclude(fund_name, missing_dates)
+                known_empty_count += len(missing_dates) - len(fetchable_dates)
+                missing_dates = fetchable_dates
             missing_dates_by_fund[fund_name] = missing_dates
             total_missing_dates.update(missing_dates)
         
@@ -1308,6 +1873,8 @@ historical context and market events.
         total_existing = sum(existing_data_summary.values())
         total_possible = len(dates) * len(available_funds)
         print(f"  Existing data points: {total_existing}/{total_possible}")
+        if known_empty_count:
+            print(f"  Known no-data (fund, date) pairs skipped: {known_empty_count}")
         
         if total_missing_dates:
             print(f"  Missing data range: {min(total_missing_dates)} to {max(total_missing_dates)}")
@@ -1316,23 +1883,33 @@ historical context and market events.
             successful_fetches = 0
             failed_fetches = 0
             
+            funds_missing_by_date = {}
+            for fund_name, missing_dates in missing_dates_by_fund.items():
+                for date in missing_dates:
+                    funds_missing_by_date.setdefault(date, []).append(fund_name)
+            
+            def journal_result(date: str, fund_data: Optional[Dict]):
+                # Only an arrived payload finishes a date; failed dates are retried on resume
+                if not fund_data or 'UTMS_FUND' not in fund_data:
+                    return
+                prices, _ = self.extract_all_fund_prices(fund_data, available_funds)
+                _, misses = self.extract_all_fund_prices(fund_data, funds_missing_by_date.get(date, []))
+                journal.append(date, prices, misses)
+            
+            fetched = self.fetch_dates(sorted(total_missing_dates),
+                                       on_result=journal_result if journal is not None else None)
+            
+            # Merge in date order so output is deterministic regardless of completion order
             for i, date in enumerate(sorted(total_missing_dates), 1):
                 print(f"  Processing missing date {i}/{len(total_missing_dates)}: {date}")
                 
-                fund_data = self.fetch_fund_data(date)
+                fund_data = fetched.get(date)
                 if fund_data and 'UTMS_FUND' in fund_data:
-                    # Extract data for all funds from this date
-                    date_success_count = 0
-                    for fund in fund_data['UTMS_FUND']:
-                        fund_name = fund.get('FUND_NAME')
-                        if fund_name in all_funds_data:
-                            try:
-                                price = float(fund.get('OLD_PRICE', 0))
-                                if price > 0:  # Only store valid prices
-                                    all_funds_data[fund_name][date] = price
-                                    date_success_count += 1
-                            except (ValueError, TypeError):
-                                continue
+                    # Extract data for all funds from this date (only valid prices are returned)
+                    prices, _ = self.extract_all_fund_prices(fund_data, available_funds)
+                    for fund_name, price in prices.items():
+                        all_funds_data[fund_name][date] = price
+                    date_success_count = len(prices)
                     
                     if date_success_count > 0:
                         successful_fetches += 1
@@ -1344,8 +1921,10 @@ historical context and market events.
                     failed_fetches += 1
                     print(f"    ⚠ Failed to fetch data for this date")
                 
-                # Add configurable delay to be respectful to the API
-                time.sleep(self.api_delay)
+                for fund_name in funds_missing_by_date.get(date, []):
+                    self._record_negative_result(fund_name, date, fund_data)
+            
+            self._save_caches()
             
             print(f"\nFetch Summary:")
             print(f"  ✓ Successfully fetched: {successful_fetches} dates")
@@ -1358,218 +1937,80 @@ historical context and market events.
         updated_files = []
         png_files_generated = []
         
-        for fund_name, price_data in all_funds_data.items():
-            if price_data:  # Only save if we have data
-                # Create filename for this fund
-                csv_filename = f'cal_fund_data_{fund_name.replace(" ", "_").replace("/", "_")}.csv'
-                
-                # Check if file already exists
-                file_exists = os.path.exists(csv_filename)
-                
-                # Save to CSV
-                df = pd.DataFrame(list(price_data.items()), columns=['Date', 'OLD_PRICE'])
-                df['Date'] = pd.to_datetime(df['Date'])
-                df = df.sort_values('Date')
-                df.to_csv(csv_filename, index=False)
-                
-                # Generate PNG for this fund
-                temp_extractor = CALFundExtractor(fund_name, self.start_date, self.end_date, self.api_delay)
-                temp_extractor.generate_png_from_csv(csv_filename)
-                png_filename = csv_filename.replace('.csv', '.png').replace('cal_fund_data_', 'cal_fund_price_trend_')
-                png_files_generated.append(png_filename)
-                
-                if file_exists:
-                    updated_files.append(csv_filename)
-                    print(f"  🔄 Updated {len(price_data)} data points for '{fund_name}' in '{csv_filename}'")
-                else:
-                    saved_files.append(csv_filename)
-                    print(f"  ✓ Saved {len(price_data)} data points for '{fund_name}' to '{csv_filename}'")
+        # Write every fund to the price store in one pass, then export the CSVs
+        funds_to_save = {fund_name: price_data for fund_name, price_data in all_funds_data.items() if price_data}
+        existing_csvs = {fund_name for fund_name in funds_to_save if os.path.exists(get_csv_filename(fund_name))}
+        self.save_fund_prices(funds_to_save)
+        
+        # Render every fund's PNG at once on the render pool
+        renders = render_pngs([(get_csv_filename(fund_name), fund_name) for fund_name in funds_to_save],
+                              render_workers, manifest=self.render_manifest)
+        png_files_skipped = [render['png'] for render in renders if render['skipped']]
+        
+        for (fund_name, price_data), render in zip(funds_to_save.items(), renders):
+            # Create filename for this fund
+            csv_filename = get_csv_filename(fund_name)
+            
+            # Check if file already existed before this save
+            file_exists = fund_name in existing_csvs
+            
+            if render['skipped']:
+                print(f"  ⏭️ PNG '{render['png']}' unchanged, not re-rendered")
+            elif render['error'] is None:
+                png_files_generated.append(render['png'])
+                print(f"  🖼️ PNG visualization saved to '{render['png']}' ({render['seconds']:.2f}s)")
+            else:
+                print(f"  ❌ Error generating PNG for '{fund_name}': {render['error']}")
+            
+            if file_exists:
+                updated_files.append(csv_filename)
+                print(f"  🔄 Updated {len(price_data)} data points for '{fund_name}' in '{csv_filename}'")
+            else:
+                saved_files.append(csv_filename)
+                print(f"  ✓ Saved {len(price_data)} data points for '{fund_name}' to '{csv_filename}'")
+        
+        # Everything journaled is now in the CSV files
+        if journal is not None:
+            journal.clear()
         
         print(f"\nFile Summary:")
         print(f"  📁 New CSV files created: {len(saved_files)}")
         print(f"  🔄 Existing CSV files updated: {len(updated_files)}")
         print(f"  🖼️ PNG visualizations generated: {len(png_files_generated)}")
+        print(f"  ⏭️ PNG visualizations unchanged: {len(png_files_skipped)}")
         
         return all_funds_data
     
+    def get_analytics_index(self, price_data: Dict[str, float]) -> FundAnalyticsIndex:
+        """Return the analytics index for price_data, rebuilding it only when a different or resized dict is passed"""
+        cached = getattr(self, '_analytics_index_cache', None)
+        if cached is not None and cached[0] is price_data and cached[1] == len(price_data):
+            return cached[2]
+        
+        index = FundAnalyticsIndex.from_price_data(price_data)
+        self._analytics_index_cache = (price_data, len(price_data), index)
+        return index
+    
     def analyze_financial_context(self, start_date: str, end_date: str, price_data: Dict[str, float]) -> Dict[str, any]:
         """Analyze financial context for a given date range"""
         print(f"\n🔍 Analyzing financial context for {start_date} to {end_date}")
         print("=" * 60)
         
-        # Convert dates for analysis
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        # Filter price data for the selected range
-        filtered_data = {}
-        for date_str, price in price_data.items():
-            date_dt = datetime.strptime(date_str, "%Y-%m-%d")
-            if start_dt <= date_dt <= end_dt:
-                filtered_data[date_str] = price
-        
-        if not filtered_data:
+        if not price_data:
             return {"error": "No data available for the selected date range"}
-        
-        # Convert to DataFrame for analysis
-        df = pd.DataFrame(list(filtered_data.items()), columns=['Date', 'Price'])
-        df['Date'] = pd.to_datetime(df['Date'])
-        df = df.sort_values('Date')
-        
-        # Calculate performance metrics
-        start_price = df['Price'].iloc[0]
-        end_price = df['Price'].iloc[-1]
-        total_return = ((end_price - start_price) / start_price) * 100
-        
-        # Calculate volatility
-        returns = df['Price'].pct_change().dropna()
-        volatility = returns.std() * np.sqrt(252) * 100  # Annualized volatility
-        
-        # Find significant price movements
-        price_changes = df['Price'].diff()
-        significant_moves = price_changes[abs(price_changes) > price_changes.std() * 2]
-        
-        # Analyze trends
-        trend_analysis = self._analyze_trend(df)
-        
-        # Get contextual events
-        contextual_events = self._get_contextual_events(start_date, end_date)
-        
-        # Generate insights
-        insights = self._generate_insights(df, total_return, volatility, significant_moves, contextual_events)
-        
-        return {
-            "date_range": f"{start_date} to {end_date}",
-            "total_return": round(total_return, 2),
-            "volatility": round(volatility, 2),
-            "price_range": f"{df['Price'].min():.4f} - {df['Price'].max():.4f}",
-            "data_points": len(df),
-            "trend_analysis": trend_analysis,
-            "significant_moves": len(significant_moves),
-            "contextual_events": contextual_events,
-            "insights": insights
-        }
+        return self.build_financial_context(start_date, end_date, self.get_analytics_index(price_data))
     
-    def _analyze_trend(self, df: pd.DataFrame) -> Dict[str, any]:
-        """Analyze price trend in the selected period"""
-        prices = df['Price'].values
-        dates = np.arange(len(prices))
+    def build_financial_context(self, start_date: str, end_date: str, index: FundAnalyticsIndex,
+                                fund_name: str = None) -> Dict[str, any]:
+        """Compute the analyze_financial_context result for a window of an analytics index (no console output)
         
-        # Linear regression to determine trend
-        coeffs = np.polyfit(dates, prices, 1)
-        slope = coeffs[0]
-        
-        # Calculate trend strength
-        trend_strength = abs(slope) / prices.mean() * 100
-        
-        if slope > 0:
-            trend_direction = "Uptrend"
-            trend_description = f"Strong upward trend with {trend_strength:.2f}% daily growth"
-        elif slope < 0:
-            trend_direction = "Downtrend"
-            trend_description = f"Declining trend with {abs(trend_strength):.2f}% daily decline"
-        else:
-            trend_direction = "Sideways"
-            trend_description = "Relatively stable with minimal trend"
-        
-        return {
-            "direction": trend_direction,
-            "strength": round(trend_strength, 2),
-            "description": trend_description
-        }
-    
-    def _get_contextual_events(self, start_date: str, end_date: str) -> List[Dict[str, str]]:
-        """Get contextual financial events for Sri Lanka during the date range"""
-        # This is a simplified version - in a real implementation, you'd integrate with news APIs
-        events = []
-        
-        start_dt = datetime.strptime(start_date, "%Y-%m-%d")
-        end_dt = datetime.strptime(end_date, "%Y-%m-%d")
-        
-        # Known significant events in Sri Lankan financial history
-        significant_events = [
-            {"date": "2022-03-01", "event": "Sri Lanka economic crisis begins", "impact": "High"},
-            {"date": "2022-04-01", "event": "Sri Lanka defaults on foreign debt", "impact": "High"},
-            {"date": "2022-07-01", "event": "IMF bailout negotiations begin", "impact": "Medium"},
-            {"date": "2023-03-01", "event": "IMF approves $3 billion bailout package", "impact": "High"},
-            {"date": "2023-09-01", "event": "Central Bank policy rate adjustments", "impact": "Medium"},
-            {"date": "2024-01-01", "event": "Economic recovery measures implemented", "impact": "Medium"},
-            {"date": "2024-06-01", "event": "Tourism sector recovery", "impact": "Low"},
-        ]
-        
-        for event in significant_events:
-            event_date = datetime.strptime(event["date"], "%Y-%m-%d")
-            if start_dt <= event_date <= end_dt:
-                events.append(event)
-        
-        # Add general market context based on the period
-        if start_dt.year == 2022:
-            events.append({
-                "date": "2022",
-                "event": "Global economic uncertainty and inflation pressures",
-                "impact": "High"
-            })
-        elif start_dt.year == 2023:
-            events.append({
-                "date": "2023",
-                "event": "Post-crisis recovery and IMF program implementation",
-                "impact": "High"
-            })
-        elif start_dt.year == 2024:
-            events.append({
-                "date": "2024",
-                "event": "Economic stabilization and growth initiatives",
-                "impact": "Medium"
-            })
-        
-        return events
-    
-    def _generate_insights(self, df: pd.DataFrame, total_return: float, volatility: float, 
-                          significant_moves: pd.Series, events: List[Dict[str, str]]) -> List[str]:
-        """Generate AI-powered insights about the fund performance"""
-        insights = []
-        
-        # Performance insights
-        if total_return > 10:
-            insights.append("📈 Strong positive performance during this period")
-        elif total_return > 5:
-            insights.append("📊 Moderate positive performance")
-        elif total_return > 0:
-            insights.append("📉 Slight positive performance")
-        elif total_return > -5:
-            insights.append("📉 Minor decline in performance")
-        elif total_return > -10:
-            insights.append("📉 Moderate decline in performance")
-        else:
-            insights.append("📉 Significant decline in performance")
-        
-        # Volatility insights
-        if volatility > 30:
-            insights.append("⚡ High volatility period - significant price swings")
-        elif volatility > 20:
-            insights.append("📊 Moderate volatility - some price fluctuations")
-        else:
-            insights.append("📈 Low volatility - relatively stable period")
-        
-        # Event correlation insights
-        if events:
-            high_impact_events = [e for e in events if e.get("impact") == "High"]
-            if high_impact_events:
-                insights.append(f"🎯 {len(high_impact_events)} high-impact economic events occurred during this period")
-                insights.append("💡 Performance likely influenced by major economic developments")
-        
-        # Trend insights
-        if len(significant_moves) > 0:
-            insights.append(f"📊 {len(significant_moves)} significant price movements detected")
-            insights.append("🔍 These movements may indicate market reactions to news or events")
-        
-        # Data quality insights
-        if len(df) < 5:
-            insights.append("⚠️ Limited data points - analysis may be less reliable")
-        elif len(df) > 20:
-            insights.append("✅ Sufficient data points for reliable analysis")
-        
-        return insights
+        Results are memoized on (fund, window, index version, events calendar version), so repeat
+        queries skip the computation.
+        """
+        calendar_version = get_event_calendar(self.events_file).version
+        key = (fund_name or self.target_fund_name, start_date, end_date, index.version, calendar_version)
+        return self.analysis_cache.get_or_compute(
+            key, lambda: financial_context(index, start_date, end_date, self.events_file))
     
 
 def get_user_fund_selection(available_funds: List[str], earliest_dates: Dict[str, str]) -> str:
@@ -1618,13 +2059,16 @@ class CALFundConfigGUI:
         self.start_date = None
         self.end_date = None
         self.api_delay = None
+        self.max_in_flight = None
         self.available_funds = []
         self.earliest_dates = {}
+        self.session = create_http_session()
+        self.archive = RawResponseArchive()
         
     def run(self):
         """Run the configuration GUI"""
         # Discover available funds first
-        temp_extractor = CALFundExtractor()
+        temp_extractor = CALFundExtractor(session=self.session, archive=self.archive)
         self.available_funds = temp_extractor.discover_available_funds()
         
         if not self.available_funds:
@@ -1801,6 +2245,14 @@ class CALFundConfigGUI:
         
         ttk.Label(api_frame, text="Delay between API requests to avoid rate limiting", 
                  font=('Arial', 8), foreground='gray').pack(pady=(5, 0))
+        
+        ttk.Label(api_frame, text="Max Concurrent Requests:").pack(anchor=tk.W, pady=(10, 0))
+        self.max_in_flight_var = tk.StringVar(value=str(DEFAULT_MAX_IN_FLIGHT))
+        max_in_flight_entry = ttk.Entry(api_frame, textvariable=self.max_in_flight_var, width=10)
+        max_in_flight_entry.pack(pady=(5, 0))
+        
+        ttk.Label(api_frame, text="Requests still start at most once per API delay", 
+                 font=('Arial', 8), foreground='gray').pack(pady=(5, 0))
     
     def _create_action_buttons(self, parent):
         """Create action buttons"""
@@ -1838,6 +2290,7 @@ class CALFundConfigGUI:
             self.start_date = self.start_date_var.get()
             self.end_date = self.end_date_var.get()
             self.api_delay = float(self.api_delay_var.get())
+            self.max_in_flight = int(self.max_in_flight_var.get())
             
             # Validate dates
             datetime.strptime(self.start_date, "%Y-%m-%d")
@@ -1847,6 +2300,10 @@ class CALFundConfigGUI:
             if self.api_delay < 0:
                 raise ValueError("API delay must be 0 or greater")
             
+            # Validate concurrency
+            if self.max_in_flight < 1:
+                raise ValueError("Max concurrent requests must be 1 or greater")
+            
             # Close config window
             self.root.destroy()
             
@@ -1864,10 +2321,13 @@ class CALFundConfigGUI:
         print(f"Target Fund: {self.selected_fund}")
         print(f"Date Range: {self.start_date} - {self.end_date}")
         print(f"API Delay: {self.api_delay} seconds between requests")
+        print(f"Max Concurrent Requests: {self.max_in_flight}")
         print("=" * 50)
         
         # Create the main extractor
-        extractor = CALFundExtractor(self.selected_fund, self.start_date, self.end_date, self.api_delay)
+        extractor = CALFundExtractor(self.selected_fund, self.start_date, self.end_date, self.api_delay,
+                                     session=self.session, max_in_flight=self.max_in_flight,
+                                     archive=self.archive)
         
         # Collect price data
         price_data = extractor.collect_price_data()
@@ -1920,11 +2380,148 @@ def get_user_api_delay_input(prompt: str, default: float) -> float:
         except ValueError:
             print("Invalid delay format. Please enter a number (e.g., 0, 0.5, 1.0, 2)")
 
+def get_user_max_in_flight_input(prompt: str, default: int) -> int:
+    """Get maximum concurrent request count from user with validation"""
+    while True:
+        user_input = input(f"{prompt} (default: {default}): ").strip()
+        if not user_input:
+            return default
+        
+        try:
+            max_in_flight = int(user_input)
+            if max_in_flight < 1:
+                print("Concurrent requests must be 1 or greater")
+                continue
+            return max_in_flight
+        except ValueError:
+            print("Invalid number. Please enter a whole number (e.g., 1, 4, 8)")
+
+def run_negative_cache_command(argv: List[str]):
+    """List or purge negative cache entries (dates known to have no price)"""
+    parser = argparse.ArgumentParser(
+        prog="cal_fund_extractor.py negcache",
+        description="Inspect dates that returned no price and are skipped by the fetch planner"
+    )
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    subparsers = parser.add_subparsers(dest='action')
+    
+    list_parser = subparsers.add_parser('list', help='List negative cache entries')
+    list_parser.add_argument('--fund', help='Only show entries for this fund')
+    list_parser.add_argument('--live', action='store_true', help='Hide expired entries')
+    
+    purge_parser = subparsers.add_parser('purge', help='Remove negative cache entries')
+    purge_parser.add_argument('--fund', help='Only purge entries for this fund')
+    purge_parser.add_argument('--reason', choices=sorted(NEGATIVE_REASON_TTL_DAYS),
+                              help='Only purge entries with this reason code')
+    purge_parser.add_argument('--expired', action='store_true', help='Only purge expired entries')
+    
+    args = parser.parse_args(argv)
+    negative_cache = NegativeCache(args.cache_dir)
+    
+    if args.action == 'list':
+        entries = negative_cache.list_entries(args.fund, include_expired=not args.live)
+        if not entries:
+            print("No negative cache entries found")
+            return
+        
+        print(f"{'Fund':<50} {'Date':<12} {'Reason':<20} {'Recorded':<20} Status")
+        print("-" * 110)
+        for entry in entries:
+            status = "expired" if entry['expired'] else "live"
+            print(f"{entry['fund_name'][:50]:<50} {entry['date']:<12} {entry['reason']:<20} "
+                  f"{entry['recorded_at']:<20} {status}")
+        print(f"\nTotal entries: {len(entries)}")
+    elif args.action == 'purge':
+        removed = negative_cache.purge(args.fund, args.reason, expired_only=args.expired)
+        negative_cache.save()
+        print(f"✅ Purged {removed} negative cache entries")
+    else:
+        parser.print_help()
+
+def run_price_store_command(argv: List[str]):
+    """Inspect the price store or move data between it and the per-fund CSV files"""
+    parser = argparse.ArgumentParser(
+        prog="cal_fund_extractor.py store",
+        description="Manage the date x fund price store that the per-fund CSV files are exported from"
+    )
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+    subparsers = parser.add_subparsers(dest='action')
+    
+    subparsers.add_parser('info', help='Show funds and date coverage in the price store')
+    
+    import_parser = subparsers.add_parser('import', help='Import per-fund CSV files into the price store')
+    import_parser.add_argument('files', nargs='*', help='CSV files to import (default: all cal_fund_data_*.csv)')
+    
+    export_parser = subparsers.add_parser('export', help='Export per-fund CSV files from the price store')
+    export_parser.add_argument('--fund', action='append', help='Fund to export (repeatable, default: all)')
+    
+    args = parser.parse_args(argv)
+    manifest = PriceManifest(args.cache_dir)
+    store = PricePanelStore(args.cache_dir)
+    
+    if args.action == 'info':
+        if not store.fund_names:
+            print("Price store is empty - run 'store import' or 'init' first")
+            return
+        
+        panel = store.read_range()
+        print(f"Price store: {store.path}")
+        print(f"Dates: {store.date_count} ({panel.index.min().date()} to {panel.index.max().date()})")
+        print(f"\n{'Fund':<55} {'Rows':>6}  {'First':<12} {'Last':<12}")
+        print("-" * 90)
+        for fund_name in store.fund_names:
+            series = panel[fund_name].dropna()
+            if series.empty:
+                continue
+            print(f"{fund_name[:55]:<55} {len(series):>6}  {series.index.min().date()!s:<12} {series.index.max().date()!s:<12}")
+    elif args.action == 'import':
+        files = args.files or sorted(glob.glob(CSV_PATTERN))
+        known_funds = FundCatalog(args.cache_dir).all_fund_names()
+        for csv_filename in files:
+            fund_name = fund_name_for_csv(csv_filename, manifest, known_funds)
+            for orphan in merge_orphaned_funds(store, manifest, csv_filename, fund_name):
+                print(f"  ✓ Merged '{orphan}' into '{fund_name}'")
+            try:
+                rows = store.import_csv(csv_filename, fund_name)
+                print(f"  ✓ Imported {rows} rows for '{fund_name}' from {csv_filename}")
+            except (OSError, ValueError) as e:
+                print(f"  ⚠ Skipped {csv_filename}: {e}")
+        store.save()
+        manifest.save()
+        print(f"✅ Price store now holds {len(store.fund_names)} funds over {store.date_count} dates")
+    elif args.action == 'export':
+        fund_names = args.fund or store.fund_names
+        for fund_name in fund_names:
+            if not store.has_fund(fund_name):
+                print(f"  ⚠ {fund_name} is not in the price store")
+                continue
+            csv_filename = get_csv_filename(fund_name)
+            df = store.export_csv(fund_name, csv_filename)
+            if not df.empty:
+                manifest.record(fund_name, csv_filename, df['Date'].min().strftime("%Y-%m-%d"),
+                                df['Date'].max().strftime("%Y-%m-%d"), len(df))
+            print(f"  ✓ Exported {len(df)} rows for '{fund_name}' to {csv_filename}")
+        manifest.save()
+    else:
+        parser.print_help()
+
 def main():
     """Main function to run the fund data extraction and visualization"""
     print("CAL Fund Data Extractor")
     print("=" * 50)
     
+    # Check for negative cache command
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "negcache":
+        run_negative_cache_command(sys.argv[2:])
+        return
+    
+    # Check for price store command
+    if len(sys.argv) > 1 and sys.argv[1].lower() == "store":
+        run_price_store_command(sys.argv[2:])
+        return
+    
     # Check for init command
     if len(sys.argv) > 1 and sys.argv[1].lower() == "init":
         print("Running INIT command - collecting data for all available funds")
@@ -1934,7 +2531,9 @@ def main():
         yesterday = (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d")
         
         # Get earliest date across all funds for init mode
-        temp_extractor = CALFundExtractor()
+        session = create_http_session()
+        archive = RawResponseArchive()
+        temp_extractor = CALFundExtractor(session=session, archive=archive)
         earliest_dates = temp_extractor.get_all_funds_earliest_dates()
         
         # Find the earliest date across all funds
@@ -1950,13 +2549,18 @@ def main():
         # Get API delay from user
         api_delay = get_user_api_delay_input("Enter API delay between requests", 0.5)
         
+        # Get concurrency from user
+        max_in_flight = get_user_max_in_flight_input("Enter max concurrent requests", DEFAULT_MAX_IN_FLIGHT)
+        
         # Create extractor for init command
-        extractor = CALFundExtractor(None, start_date, end_date, api_delay)
+        extractor = CALFundExtractor(None, start_date, end_date, api_delay, session=session, max_in_flight=max_in_flight,
+                                     archive=archive)
         
         print("\n" + "=" * 50)
         print(f"INIT Mode: Collecting data for ALL available funds")
         print(f"Date Range: {extractor.start_date} - {extractor.end_date} (1st & 15th of each month)")
         print(f"API Delay: {extractor.api_delay} seconds between requests")
+        print(f"Max Concurrent Requests: {extractor.max_in_flight}")
         print("=" * 50)
         
         # Run init command
@@ -1972,6 +2576,7 @@ def main():
         else:
             print("❌ INIT failed - no data was collected")
         
+        extractor.close()
         return
     
     # Normal mode - start with configuration GUI
@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Backtest
+
+Portfolio backtests across CAL funds on the price store's aligned date x fund panel.
+A portfolio is a set of target weights plus a rebalancing schedule:
+
+- none       Buy and hold the starting weights
+- monthly    Rebalance on the first stored date of each month
+- quarterly  Rebalance on the first stored date of each quarter
+- threshold  Rebalance whenever any fund drifts more than --threshold points from target
+
+NAV is simulated on the stored dates themselves (the irregular 1st/15th sampling), with
+a fund's last price carried across its gaps. A single portfolio is reported with the
+same metrics as the GUI's financial context analysis; a sweep simulates thousands of
+weight sets at once (a pair of matrix products over all segments for calendar schedules)
+and ranks them by the fund_metrics figures.
+
+Usage:
+    python fund_backtest.py --weight "Fund A=60" --weight "Fund B=40" --rebalance quarterly
+    python fund_backtest.py --weight "Fund A=50" --weight "Fund B=50" --rebalance threshold --threshold 5
+    python fund_backtest.py --fund "Fund A" --fund "Fund B" --fund "Fund C" --grid 0.05
+    python fund_backtest.py --fund "Fund A" --fund "Fund B" --fund "Fund C" --random 5000 --sort calmar
+    python fund_backtest.py --help                            # Show help
+"""
+
+import argparse
+import itertools
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fund_analytics import FundAnalyticsIndex, financial_context
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_metrics import METRIC_COLUMNS, compute_universe_metrics
+from fund_storage import PricePanelStore, open_price_store
+
+REBALANCE_SCHEDULES = ['none', 'monthly', 'quarterly', 'threshold']
+DEFAULT_THRESHOLD = 5.0
+INITIAL_NAV = 100.0
+
+
+def aligned_prices(store: PricePanelStore, fund_names: List[str], start_date: str = None,
+                   end_date: str = None) -> pd.DataFrame:
+    """Forward-filled prices for fund_names, starting on the first date every fund has a price"""
+    prices = store.read_range(start_date, end_date, fund_names)
+    missing = [fund for fund in fund_names if fund not in prices.columns or prices[fund].isna().all()]
+    if missing:
+        raise ValueError(f"No prices for: {', '.join(missing)}")
+
+    prices = prices[fund_names].ffill()
+    return prices[prices.notna().all(axis=1)]
+
+
+def rebalance_rows(dates: pd.DatetimeIndex, schedule: str) -> np.ndarray:
+    """Boolean mask of the rows that start a monthly/quarterly rebalancing segment (row 0 always does)"""
+    periods = dates.to_period('M' if schedule == 'monthly' else 'Q').asi8
+    return np.concatenate([[True], periods[1:] != periods[:-1]])
+
+
+def simulate_nav(prices: np.ndarray, weights: np.ndarray, schedule: str = 'none',
+                 dates: pd.DatetimeIndex = None, threshold: float = DEFAULT_THRESHOLD) -> Tuple[np.ndarray, np.ndarray]:
+    """NAV paths (weight sets x dates, starting at INITIAL_NAV) and rebalance counts per weight set
+
+    prices is dates x funds with no gaps; each row of weights sums to 1.
+    """
+    weights = np.atleast_2d(weights)
+    if schedule == 'threshold':
+        return _simulate_threshold(prices, weights, threshold / 100.0)
+
+    # Between rebalances each fund's value grows with its price, so within a segment
+    # NAV(t) = NAV(segment start) * weights @ (price(t) / price(segment start))
+    if schedule == 'none':
+        is_start = np.arange(len(prices)) == 0
+    else:
+        is_start = rebalance_rows(dates, schedule)
+    starts = np.flatnonzero(is_start)
+    segment = np.cumsum(is_start) - 1
+
+    within = weights @ (prices / prices[starts[segment]]).T
+    segment_growth = weights @ (prices[starts[1:]] / prices[starts[:-1]]).T
+    nav_at_start = INITIAL_NAV * np.hstack([np.ones((len(weights), 1)), np.cumprod(segment_growth, axis=1)])
+    nav = nav_at_start[:, segment] * within
+    return nav, np.full(len(weights), len(starts) - 1)
+
+
+def _simulate_threshold(prices: np.ndarray, weights: np.ndarray, threshold: float) -> Tuple[np.ndarray, np.ndarray]:
+    """Drift-triggered rebalancing; steps through dates, vectorized across weight sets"""
+    units = INITIAL_NAV * weights / prices[0]
+    nav = np.empty((len(weights), len(prices)))
+    rebalances = np.zeros(len(weights), dtype=np.int64)
+
+    for row, price in enumerate(prices):
+        holdings = units * price
+        value = holdings.sum(axis=1)
+        nav[:, row] = value
+        drifted = np.abs(holdings / value[:, None] - weights).max(axis=1) > threshold
+        if drifted.any():
+            units[drifted] = value[drifted, None] * weights[drifted] / price
+            rebalances += drifted
+    return nav, rebalances
+
+
+def normalize_weights(weights: np.ndarray) -> np.ndarray:
+    """Scale each weight set to sum to 1"""
+    weights = np.atleast_2d(np.asarray(weights, dtype=np.float64))
+    totals = weights.sum(axis=1, keepdims=True)
+    if (weights < 0).any() or (totals <= 0).any():
+        raise ValueError("Weights must be non-negative with a positive total")
+    return weights / totals
+
+
+def weight_grid(fund_count: int, step: float) -> np.ndarray:
+    """Every weight set on a simplex grid with the given step (e.g. 0.1 -> 0%, 10%, ... 100%)"""
+    units = int(round(1.0 / step))
+    # Stars and bars: each choice of fund_count - 1 divider positions is one composition
+    dividers = np.array(list(itertools.combinations(range(units + fund_count - 1), fund_count - 1)),
+                        dtype=np.int64).reshape(-1, fund_count - 1)
+    bounds = np.hstack([np.full((len(dividers), 1), -1), dividers,
+                        np.full((len(dividers), 1), units + fund_count - 1)])
+    return (np.diff(bounds, axis=1) - 1) / units
+
+
+def random_weights(fund_count: int, count: int, seed: int = None) -> np.ndarray:
+    """Weight sets drawn uniformly from the simplex"""
+    return np.random.default_rng(seed).dirichlet(np.ones(fund_count), size=count)
+
+
+def backtest(store: PricePanelStore, target_weights: Dict[str, float], schedule: str = 'quarterly',
+             threshold: float = DEFAULT_THRESHOLD, start_date: str = None,
+             end_date: str = None) -> Tuple[pd.Series, Dict]:
+    """NAV series and financial context metrics for one portfolio"""
+    fund_names = list(target_weights)
+    prices = aligned_prices(store, fund_names, start_date, end_date)
+    if len(prices) < 2:
+        raise ValueError("Not enough common dates for the selected funds")
+
+    weights = normalize_weights([target_weights[fund] for fund in fund_names])
+    nav, rebalances = simulate_nav(prices.to_numpy(), weights, schedule, prices.index, threshold)
+    nav = pd.Series(nav[0], index=prices.index, name='NAV')
+
+    days = prices.index.values.astype('datetime64[D]').astype(np.int64)
+    first_date, last_date = (date.strftime('%Y-%m-%d') for date in (prices.index[0], prices.index[-1]))
+    context = financial_context(FundAnalyticsIndex(days, nav.to_numpy()), first_date, last_date)
+    context['rebalances'] = int(rebalances[0])
+    return nav, context
+
+
+def sweep(store: PricePanelStore, fund_names: List[str], weight_sets: np.ndarray, schedule: str = 'quarterly',
+          threshold: float = DEFAULT_THRESHOLD, start_date: str = None, end_date: str = None,
+          risk_free: float = 0.0) -> pd.DataFrame:
+    """Metrics for every weight set (one row each, with the weights in percent)"""
+    prices = aligned_prices(store, fund_names, start_date, end_date)
+    if len(prices) < 2:
+        raise ValueError("Not enough common dates for the selected funds")
+
+    weights = normalize_weights(weight_sets)
+    nav, rebalances = simulate_nav(prices.to_numpy(), weights, schedule, prices.index, threshold)
+
+    metrics = compute_universe_metrics(pd.DataFrame(nav.T, index=prices.index), risk_free).reset_index(drop=True)
+    allocation = pd.DataFrame(weights * 100, columns=fund_names)
+    result = pd.concat([allocation, metrics], axis=1)
+    result['rebalances'] = rebalances
+    return result
+
+
+def parse_weights(specs: List[str]) -> Dict[str, float]:
+    """Parse 'Fund Name=60' specs into {fund: weight}"""
+    weights = {}
+    for spec in specs:
+        fund_name, separator, value = spec.rpartition('=')
+        if not separator or not fund_name.strip():
+            raise ValueError(f"Invalid weight: {spec!r} (expected 'Fund Name=60')")
+        weights[fund_name.strip()] = float(value)
+    return weights
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Backtest - simulate and compare fund portfolios",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Single portfolio (--weight): prints the financial context metrics and writes <output>_nav.csv.
+Sweep (--fund with --grid or --random): simulates every weight set at once and writes
+<output>_sweep.csv ranked by --sort; weights are in percent.
+        """
+    )
+    parser.add_argument('--weight', action='append', help="Target weight 'Fund Name=60' (repeatable)")
+    parser.add_argument('--fund', action='append', help='Fund to include in a sweep (repeatable)')
+    parser.add_argument('--grid', type=float, help='Sweep every weight set on a grid with this step (e.g. 0.1)')
+    parser.add_argument('--random', type=int, help='Sweep this many random weight sets')
+    parser.add_argument('--seed', type=int, help='Random seed for --random')
+    parser.add_argument('--rebalance', choices=REBALANCE_SCHEDULES, default='quarterly',
+                        help='Rebalancing schedule (default: quarterly)')
+    parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                        help=f'Drift in percentage points that triggers a threshold rebalance (default: {DEFAULT_THRESHOLD})')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD, default: first common date)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD, default: last stored date)')
+    parser.add_argument('--risk-free', type=float, default=0.0, help='Annual risk-free rate in percent for sweeps')
+    parser.add_argument('--sort', default='sharpe', choices=METRIC_COLUMNS, help='Sweep ranking column (default: sharpe)')
+    parser.add_argument('--top', type=int, default=10, help='Sweep results to print (default: 10)')
+    parser.add_argument('--output', '-o', default='fund_backtest', help='Output path prefix (default: fund_backtest)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+    if bool(args.weight) == bool(args.fund):
+        parser.error("use either --weight (one portfolio) or --fund with --grid/--random (sweep)")
+    if args.fund and bool(args.grid) == bool(args.random):
+        parser.error("a sweep needs exactly one of --grid or --random")
+
+    print("CAL Fund Backtest")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    try:
+        if args.weight:
+            nav, context = backtest(store, parse_weights(args.weight), args.rebalance, args.threshold,
+                                    args.start, args.end)
+        else:
+            fund_names = list(dict.fromkeys(args.fund))
+            weight_sets = (weight_grid(len(fund_names), args.grid) if args.grid
+                           else random_weights(len(fund_names), args.random, args.seed))
+            result = sweep(store, fund_names, weight_sets, args.rebalance, args.threshold,
+                           args.start, args.end, args.risk_free)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    if args.weight:
+        path = f"{args.output}_nav.csv"
+        atomic_write_bytes(path, nav.round(6).to_csv().encode('utf-8'))
+        print(f"📊 {context['date_range']} ({args.rebalance} rebalancing, {context['rebalances']} rebalances)")
+        print(f"   Total Return: {context['total_return']:.2f}%   CAGR: {context['cagr']:.2f}%")
+        print(f"   Volatility (annualized): {context['volatility']:.2f}%")
+        print(f"   Max Drawdown: {context['max_drawdown']:.2f}% ({context['drawdown_period']})")
+        print(f"   Trend: {context['trend_analysis']['direction']} ({context['trend_analysis']['strength']}%)")
+        for insight in context['insights']:
+            print(f"   {insight}")
+        print(f"\n✅ NAV saved to {path}")
+        return
+
+    result = result.sort_values(args.sort, ascending=False, na_position='last')
+    path = f"{args.output}_sweep.csv"
+    atomic_write_bytes(path, result.round(4).to_csv(index=False).encode('utf-8'))
+
+    print(f"✅ Simulated {len(result)} weight sets ({args.rebalance} rebalancing)\n")
+    print(" / ".join(fund[:20] for fund in fund_names))
+    for _, row in result.head(args.top).iterrows():
+        allocation = " / ".join(f"{row[fund]:.0f}" for fund in fund_names)
+        print(f"   {allocation:<30} CAGR {row['cagr']:>6.2f}%  Vol {row['volatility']:>6.2f}%  "
+              f"Sharpe {row['sharpe']:>5.2f}  MaxDD {row['max_drawdown']:>6.2f}%")
+    print(f"\n📁 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Batch Analytics
+
+A headless runner that computes the analyze_financial_context metric set for every
+fund in the price store over a set of standard periods, spreading funds across a
+process pool, and writes one consolidated scorecard (CSV and/or JSON).
+
+Usage:
+    python fund_batch.py                              # All funds x all standard periods
+    python fund_batch.py --periods ytd 1y 3y          # Selected periods only
+    python fund_batch.py --fund "Fund A" --fund "Fund B"
+    python fund_batch.py --workers 8 --output scores  # Writes scores.csv and scores.json
+    python fund_batch.py --help                       # Show help
+"""
+
+import os
+import json
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fund_analytics import FundAnalyticsIndex, financial_context
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_storage import PricePanelStore, open_price_store
+
+# Periods in scorecard order
+STANDARD_PERIODS = ['ytd', '1y', '3y', '5y', 'crisis_2022', 'recovery_2023', 'since_inception']
+FIXED_PERIODS = {
+    'crisis_2022': ('2022-01-01', '2022-12-31'),
+    'recovery_2023': ('2023-01-01', '2023-12-31')
+}
+TRAILING_PERIOD_YEARS = {'1y': 1, '3y': 3, '5y': 5}
+
+SCORECARD_COLUMNS = [
+    'fund_name', 'period', 'start_date', 'end_date', 'data_points', 'total_return', 'cagr', 'volatility',
+    'max_drawdown', 'drawdown_period', 'price_range', 'trend_direction', 'trend_strength',
+    'significant_moves', 'event_count', 'high_impact_events', 'insights'
+]
+
+
+def resolve_period(period: str, as_of: str, inception_date: str) -> Tuple[str, str]:
+    """Start and end date of a standard period relative to as_of"""
+    if period in FIXED_PERIODS:
+        return FIXED_PERIODS[period]
+    if period == 'ytd':
+        return f"{as_of[:4]}-01-01", as_of
+    if period in TRAILING_PERIOD_YEARS:
+        start = pd.Timestamp(as_of) - pd.DateOffset(years=TRAILING_PERIOD_YEARS[period])
+        return start.strftime('%Y-%m-%d'), as_of
+    if period == 'since_inception':
+        return inception_date, as_of
+    raise ValueError(f"Unknown period: {period}")
+
+
+def scorecard_row(fund_name: str, period: str, start_date: str, end_date: str, context: Dict) -> Dict:
+    """Flatten an analyze_financial_context result into one scorecard row"""
+    row = {column: None for column in SCORECARD_COLUMNS}
+    row.update({'fund_name': fund_name, 'period': period, 'start_date': start_date, 'end_date': end_date,
+                'data_points': 0})
+    if "error" in context:
+        return row
+
+    events = context['contextual_events']
+    row.update({
+        'data_points': context['data_points'],
+        'total_return': context['total_return'],
+        'cagr': None if np.isnan(context['cagr']) else context['cagr'],
+        'volatility': None if np.isnan(context['volatility']) else context['volatility'],
+        'max_drawdown': context['max_drawdown'],
+        'drawdown_period': context['drawdown_period'],
+        'price_range': context['price_range'],
+        'trend_direction': context['trend_analysis']['direction'],
+        'trend_strength': context['trend_analysis']['strength'],
+        'significant_moves': context['significant_moves'],
+        'event_count': len(events),
+        'high_impact_events': sum(1 for event in events if event.get("impact") == "High"),
+        'insights': context['insights']
+    })
+    return row
+
+
+def analyze_fund_periods(fund_name: str, days: np.ndarray, prices: np.ndarray,
+                         periods: List[str], as_of: str) -> List[Dict]:
+    """Scorecard rows for one fund over every requested period"""
+    index = FundAnalyticsIndex(days, prices)
+    inception_date = index.date_at(0)
+
+    rows = []
+    for period in periods:
+        start_date, end_date = resolve_period(period, as_of, inception_date)
+        context = financial_context(index, start_date, end_date)
+        rows.append(scorecard_row(fund_name, period, start_date, end_date, context))
+    return rows
+
+
+def run_batch(store: PricePanelStore, periods: List[str] = None, fund_names: List[str] = None,
+              as_of: str = None, workers: int = None) -> List[Dict]:
+    """Compute the scorecard for every fund x period, one fund per process pool task"""
+    periods = periods or STANDARD_PERIODS
+    panel = store.read_range(funds=fund_names)
+    if panel.empty:
+        return []
+    as_of = as_of or panel.index.max().strftime('%Y-%m-%d')
+
+    tasks = []
+    day_numbers = panel.index.values.astype('datetime64[D]').astype(np.int64)
+    for fund_name in panel.columns:
+        column = panel[fund_name].to_numpy()
+        valued = ~np.isnan(column)
+        if valued.any():
+            tasks.append((fund_name, day_numbers[valued], column[valued], periods, as_of))
+
+    if workers == 1 or len(tasks) <= 1:
+        results = [analyze_fund_periods(*task) for task in tasks]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            results = list(pool.map(analyze_fund_periods, *zip(*tasks)))
+
+    return [row for fund_rows in results for row in fund_rows]
+
+
+def write_scorecard(rows: List[Dict], output_prefix: str, formats: List[str]) -> List[str]:
+    """Write the scorecard as <output_prefix>.csv and/or .json atomically; returns the paths written"""
+    written = []
+    if 'csv' in formats:
+        df = pd.DataFrame(rows, columns=SCORECARD_COLUMNS)
+        df['insights'] = df['insights'].apply(lambda insights: " | ".join(insights) if insights else "")
+        path = f"{output_prefix}.csv"
+        atomic_write_bytes(path, df.to_csv(index=False).encode('utf-8'))
+        written.append(path)
+    if 'json' in formats:
+        path = f"{output_prefix}.json"
+        atomic_write_bytes(path, json.dumps(rows, indent=2, ensure_ascii=False).encode('utf-8'))
+        written.append(path)
+    return written
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Batch Analytics - scorecard for every fund x standard period",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Periods:
+  ytd, 1y, 3y, 5y          Trailing windows ending at --as-of (default: latest stored date)
+  crisis_2022              2022-01-01 to 2022-12-31
+  recovery_2023            2023-01-01 to 2023-12-31
+  since_inception          Each fund's first stored date to --as-of
+        """
+    )
+    parser.add_argument('--periods', nargs='+', choices=STANDARD_PERIODS, default=STANDARD_PERIODS,
+                        help='Periods to analyze (default: all)')
+    parser.add_argument('--fund', action='append', help='Fund to include (repeatable, default: all)')
+    parser.add_argument('--as-of', help='End date for trailing periods (YYYY-MM-DD)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count(),
+                        help='Worker processes (default: CPU count, 1 = run inline)')
+    parser.add_argument('--output', '-o', default='fund_scorecard',
+                        help='Output path without extension (default: fund_scorecard)')
+    parser.add_argument('--format', choices=['csv', 'json', 'both'], default='both',
+                        help='Output format (default: both)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Batch Analytics")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    started = time.perf_counter()
+    rows = run_batch(store, args.periods, args.fund, args.as_of, args.workers)
+    elapsed = time.perf_counter() - started
+
+    if not rows:
+        print("❌ No data for the selected funds")
+        return
+
+    formats = ['csv', 'json'] if args.format == 'both' else [args.format]
+    fund_count = len({row['fund_name'] for row in rows})
+    print(f"✅ Analyzed {fund_count} funds x {len(args.periods)} periods in {elapsed:.2f}s")
+    for path in write_scorecard(rows, args.output, formats):
+        print(f"   📁 {path}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,489 @@
+"""
+CAL Fund Cache
+
+Persistent caches that sit between CALFundExtractor and the cal.lk API.
+All cache files live under a single directory (cal_fund_cache/ by default)
+next to the fund CSV files.
+
+Caches:
+1. RawResponseArchive - compressed, content-addressed getUTFundRates payloads keyed by valuedate
+2. NegativeCache - (fund, valuedate) pairs that returned no usable price, with reason codes and TTLs
+3. FetchJournal - write-ahead log of per-date fetch results so an interrupted init can resume
+4. InceptionDateStore - first valued date per fund, found by bisecting over valuedates
+5. FundCatalog - current fund list with first/last seen dates, refreshed on a TTL
+"""
+
+import os
+import json
+import gzip
+import hashlib
+import tempfile
+import threading
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional
+
+DEFAULT_CACHE_DIR = "cal_fund_cache"
+
+# Negative cache reason codes and how long (in days) each is trusted before the date is retried
+NEGATIVE_REASON_TTL_DAYS = {
+    'no_response': 1,           # Request failed or returned nothing (may be transient)
+    'empty_payload': 7,         # Response had no UTMS_FUND entries (holiday / non-valuation date)
+    'fund_not_listed': 30,      # Fund absent from the payload (pre-inception or discontinued)
+    'invalid_price': 30,        # OLD_PRICE could not be parsed
+    'non_positive_price': 30,   # OLD_PRICE was zero or negative
+}
+
+DEFAULT_CATALOG_TTL_HOURS = 24
+
+# How long a fund missing from the latest valuedate is left out of inception date detection
+DEFAULT_INCEPTION_NOT_FOUND_TTL_DAYS = 7
+
+
+def atomic_write_bytes(path: str, data: bytes):
+    """Write bytes to path atomically (temp file in the same directory + rename)"""
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, path)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class RawResponseArchive:
+    """Compressed, content-addressed archive of raw getUTFundRates payloads keyed by valuedate"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.root_dir = os.path.join(cache_dir, 'raw')
+        self.objects_dir = os.path.join(self.root_dir, 'objects')
+        self.index_path = os.path.join(self.root_dir, 'index.jsonl')
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    def _load_index(self) -> Dict[str, str]:
+        """Load the valuedate -> content hash index (later lines win)"""
+        index = {}
+        if not os.path.exists(self.index_path):
+            return index
+
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        index[entry['date']] = entry['hash']
+                    except (ValueError, KeyError):
+                        # Ignore a torn final line from an interrupted run
+                        continue
+        except OSError as e:
+            print(f"Warning: Could not read raw archive index {self.index_path}: {e}")
+        return index
+
+    def _object_path(self, content_hash: str) -> str:
+        """Path of the compressed object for a content hash"""
+        return os.path.join(self.objects_dir, content_hash[:2], f"{content_hash}.json.gz")
+
+    @staticmethod
+    def is_archivable(payload: Optional[Dict]) -> bool:
+        """Only complete fund rate payloads are worth archiving"""
+        return isinstance(payload, dict) and isinstance(payload.get('UTMS_FUND'), list) and len(payload['UTMS_FUND']) > 0
+
+    def has(self, date: str) -> bool:
+        """Check whether a valuedate is archived"""
+        return date in self._index
+
+    def dates(self) -> List[str]:
+        """All archived valuedates in sorted order"""
+        return sorted(self._index)
+
+    def get(self, date: str) -> Optional[Dict]:
+        """Return the archived payload for a valuedate, or None if it was never fetched"""
+        content_hash = self._index.get(date)
+        if content_hash is None:
+            return None
+
+        try:
+            with gzip.open(self._object_path(content_hash), 'rb') as f:
+                return json.loads(f.read().decode('utf-8'))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Archived payload for {date} is unreadable ({e}), refetching")
+            with self._lock:
+                self._index.pop(date, None)
+            return None
+
+    def put(self, date: str, payload: Dict) -> Optional[str]:
+        """Archive a payload for a valuedate and return its content hash"""
+        if not self.is_archivable(payload):
+            return None
+
+        canonical = json.dumps(payload, sort_keys=True, separators=(',', ':')).encode('utf-8')
+        content_hash = hashlib.sha256(canonical).hexdigest()
+
+        with self._lock:
+            if self._index.get(date) == content_hash:
+                return content_hash
+
+            object_path = self._object_path(content_hash)
+            if not os.path.exists(object_path):
+                # mtime=0 keeps the compressed bytes a pure function of the content
+                atomic_write_bytes(object_path, gzip.compress(canonical, mtime=0))
+
+            os.makedirs(self.root_dir, exist_ok=True)
+            with open(self.index_path, 'a', encoding='utf-8') as f:
+                f.write(json.dumps({'date': date, 'hash': content_hash}) + '\n')
+            self._index[date] = content_hash
+
+        return content_hash
+
+
+class NegativeCache:
+    """Persistent record of (fund, valuedate) pairs that returned no usable price"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl_days: Dict[str, float] = None,
+                 default_ttl_days: float = 30):
+        self.path = os.path.join(cache_dir, 'negative_cache.json')
+        self.ttl_days = dict(NEGATIVE_REASON_TTL_DAYS)
+        self.ttl_days.update(ttl_days or {})
+        self.default_ttl_days = default_ttl_days
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, Dict[str, str]]]:
+        """Load entries as {fund: {date: {'reason': ..., 'recorded_at': ...}}}"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('entries', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read negative cache {self.path}: {e}")
+            return {}
+
+    def _ttl(self, reason: str) -> timedelta:
+        """Time-to-live for a reason code"""
+        return timedelta(days=self.ttl_days.get(reason, self.default_ttl_days))
+
+    def _is_expired(self, entry: Dict[str, str], now: datetime) -> bool:
+        """Check whether an entry has outlived its reason's TTL"""
+        try:
+            recorded_at = datetime.fromisoformat(entry['recorded_at'])
+        except (KeyError, ValueError):
+            return True
+        return now - recorded_at > self._ttl(entry.get('reason', ''))
+
+    def record(self, fund_name: str, date: str, reason: str):
+        """Remember that a fund had no usable price on a date"""
+        with self._lock:
+            self._entries.setdefault(fund_name, {})[date] = {
+                'reason': reason,
+                'recorded_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._dirty = True
+
+    def discard(self, fund_name: str, date: str):
+        """Forget an entry (e.g. once the date returns a valid price)"""
+        with self._lock:
+            if self._entries.get(fund_name, {}).pop(date, None) is not None:
+                self._dirty = True
+
+    def is_negative(self, fund_name: str, date: str, now: datetime = None) -> bool:
+        """Check whether a (fund, date) pair is a live negative entry"""
+        entry = self._entries.get(fund_name, {}).get(date)
+        return entry is not None and not self._is_expired(entry, now or datetime.now())
+
+    def exclude(self, fund_name: str, dates: Iterable[str]) -> List[str]:
+        """Filter out dates with a live negative entry for the fund"""
+        now = datetime.now()
+        return [date for date in dates if not self.is_negative(fund_name, date, now)]
+
+    def list_entries(self, fund_name: str = None, include_expired: bool = True) -> List[Dict[str, str]]:
+        """List entries as flat dicts sorted by fund and date"""
+        now = datetime.now()
+        rows = []
+        for fund, dates in sorted(self._entries.items()):
+            if fund_name and fund != fund_name:
+                continue
+            for date, entry in sorted(dates.items()):
+                expired = self._is_expired(entry, now)
+                if expired and not include_expired:
+                    continue
+                rows.append({
+                    'fund_name': fund,
+                    'date': date,
+                    'reason': entry.get('reason', ''),
+                    'recorded_at': entry.get('recorded_at', ''),
+                    'expired': expired
+                })
+        return rows
+
+    def purge(self, fund_name: str = None, reason: str = None, expired_only: bool = False) -> int:
+        """Remove matching entries and return how many were removed"""
+        now = datetime.now()
+        removed = 0
+        with self._lock:
+            for fund in list(self._entries):
+                if fund_name and fund != fund_name:
+                    continue
+                dates = self._entries[fund]
+                for date in list(dates):
+                    entry = dates[date]
+                    if reason and entry.get('reason') != reason:
+                        continue
+                    if expired_only and not self._is_expired(entry, now):
+                        continue
+                    del dates[date]
+                    removed += 1
+                if not dates:
+                    del self._entries[fund]
+            if removed:
+                self._dirty = True
+        return removed
+
+    def save(self):
+        """Persist entries atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({'version': 1, 'entries': self._entries}, indent=1, sort_keys=True)
+            atomic_write_bytes(self.path, payload.encode('utf-8'))
+            self._dirty = False
+
+
+class FetchJournal:
+    """Append-only write-ahead log of per-date fetch results for resumable bulk collection"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, name: str = 'init'):
+        self.path = os.path.join(cache_dir, f'{name}_journal.jsonl')
+        self._lock = threading.Lock()
+
+    def exists(self) -> bool:
+        """Check whether an unfinished journal is present"""
+        return os.path.exists(self.path)
+
+    def append(self, date: str, prices: Dict[str, float], misses: Dict[str, str]):
+        """Durably append one date's results (prices by fund and miss reasons by fund)"""
+        record = json.dumps({'date': date, 'prices': prices, 'misses': misses}, sort_keys=True)
+        with self._lock:
+            os.makedirs(os.path.dirname(os.path.abspath(self.path)), exist_ok=True)
+            with open(self.path, 'a', encoding='utf-8') as f:
+                f.write(record + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def replay(self) -> Dict[str, Dict[str, Dict]]:
+        """Read journaled results as {date: {'prices': {...}, 'misses': {...}}} (later lines win)"""
+        entries = {}
+        if not self.exists():
+            return entries
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                        entries[record['date']] = {
+                            'prices': record.get('prices', {}),
+                            'misses': record.get('misses', {})
+                        }
+                    except (ValueError, KeyError):
+                        # A torn final line means that date was not durably recorded
+                        continue
+        except OSError as e:
+            print(f"Warning: Could not read fetch journal {self.path}: {e}")
+        return entries
+
+    def clear(self):
+        """Remove the journal once its results are safely persisted"""
+        with self._lock:
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+
+class InceptionDateStore:
+    """Persisted first valued date per fund, and funds not found as of a date (retried after a TTL)"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR,
+                 not_found_ttl_days: float = DEFAULT_INCEPTION_NOT_FOUND_TTL_DAYS):
+        self.path = os.path.join(cache_dir, 'inception_dates.json')
+        self.not_found_ttl_days = not_found_ttl_days
+        self._lock = threading.Lock()
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        """Load entries as {fund: {'inception_date': ..., 'search_floor': ..., 'detected_at': ...}}
+
+        Funds not found carry {'not_found_as_of': ..., 'detected_at': ...} instead.
+        """
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('funds', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read inception dates {self.path}: {e}")
+            return {}
+
+    def _save(self):
+        """Write the entries atomically (caller holds the lock)"""
+        payload = json.dumps({'version': 1, 'funds': self._entries}, indent=1, sort_keys=True)
+        atomic_write_bytes(self.path, payload.encode('utf-8'))
+
+    def get(self, fund_name: str) -> Optional[str]:
+        """Return the stored inception date for a fund, if detected"""
+        entry = self._entries.get(fund_name)
+        return entry.get('inception_date') if entry else None
+
+    def all(self) -> Dict[str, str]:
+        """Return {fund: inception_date} for every detected fund"""
+        return {fund: entry['inception_date'] for fund, entry in self._entries.items() if 'inception_date' in entry}
+
+    def update(self, inception_dates: Dict[str, str], search_floor: str):
+        """Store newly detected inception dates and persist atomically"""
+        if not inception_dates:
+            return
+
+        detected_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            for fund_name, inception_date in inception_dates.items():
+                self._entries[fund_name] = {
+                    'inception_date': inception_date,
+                    'search_floor': search_floor,
+                    'detected_at': detected_at
+                }
+            self._save()
+
+    def record_not_found(self, fund_names: Iterable[str], as_of: str):
+        """Remember funds that had no price on the latest valuedate searched, and persist atomically"""
+        fund_names = [fund for fund in fund_names if not self.get(fund)]
+        if not fund_names:
+            return
+
+        detected_at = datetime.now().isoformat(timespec='seconds')
+        with self._lock:
+            for fund_name in fund_names:
+                self._entries[fund_name] = {'not_found_as_of': as_of, 'detected_at': detected_at}
+            self._save()
+
+    def is_not_found(self, fund_name: str, now: datetime = None) -> bool:
+        """Check whether a fund was recently found to have no price (within the TTL)"""
+        entry = self._entries.get(fund_name)
+        if not entry or 'not_found_as_of' not in entry:
+            return False
+        try:
+            detected_at = datetime.fromisoformat(entry['detected_at'])
+        except (KeyError, ValueError):
+            return False
+        return (now or datetime.now()) - detected_at <= timedelta(days=self.not_found_ttl_days)
+
+
+class FundCatalog:
+    """Persisted fund list with first/last seen valuedates and the time of the last refresh"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR, ttl_hours: float = DEFAULT_CATALOG_TTL_HOURS):
+        self.path = os.path.join(cache_dir, 'fund_catalog.json')
+        self.ttl_hours = ttl_hours
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._dirty = False
+        self._data = self._load()
+
+    def _load(self) -> Dict:
+        """Load {'refreshed_at': ..., 'current': [...], 'funds': {fund: {'first_seen', 'last_seen'}}}"""
+        empty = {'refreshed_at': None, 'current': [], 'funds': {}}
+        if not os.path.exists(self.path):
+            return empty
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            empty.update({key: data[key] for key in empty if key in data})
+            return empty
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read fund catalog {self.path}: {e}")
+            return empty
+
+    @property
+    def refreshed_at(self) -> Optional[datetime]:
+        """Time of the last successful refresh"""
+        try:
+            return datetime.fromisoformat(self._data['refreshed_at']) if self._data['refreshed_at'] else None
+        except ValueError:
+            return None
+
+    def has_funds(self) -> bool:
+        """Check whether the catalog has a fund list to answer from"""
+        return len(self._data['current']) > 0
+
+    def is_stale(self) -> bool:
+        """Check whether the last refresh is older than the TTL"""
+        refreshed_at = self.refreshed_at
+        return refreshed_at is None or datetime.now() - refreshed_at > timedelta(hours=self.ttl_hours)
+
+    def fund_names(self) -> List[str]:
+        """Funds listed by the most recent refresh, in API order"""
+        return list(self._data['current'])
+
+    def all_fund_names(self) -> List[str]:
+        """Every fund the catalog has seen, current funds first"""
+        return list(dict.fromkeys(self._data['current'] + list(self._data['funds'])))
+
+    def get_fund_info(self, fund_name: str) -> Optional[Dict[str, str]]:
+        """Return {'first_seen': ..., 'last_seen': ...} for a fund"""
+        info = self._data['funds'].get(fund_name)
+        return dict(info) if info else None
+
+    def observe(self, date: str, fund_names: Iterable[str]):
+        """Widen first/last seen dates for funds listed in a payload for date"""
+        with self._lock:
+            for fund_name in fund_names:
+                info = self._data['funds'].get(fund_name)
+                if info is None:
+                    self._data['funds'][fund_name] = {'first_seen': date, 'last_seen': date}
+                    self._dirty = True
+                    continue
+                if date < info['first_seen']:
+                    info['first_seen'] = date
+                    self._dirty = True
+                if date > info['last_seen']:
+                    info['last_seen'] = date
+                    self._dirty = True
+
+    def record_refresh(self, date: str, fund_names: List[str]):
+        """Replace the current fund list after a successful discovery and persist"""
+        self.observe(date, fund_names)
+        with self._lock:
+            self._data['current'] = list(fund_names)
+            self._data['refreshed_at'] = datetime.now().isoformat(timespec='seconds')
+            self._dirty = True
+        self.save()
+
+    def begin_refresh(self) -> bool:
+        """Claim the refresh slot; returns False if a refresh is already running"""
+        with self._lock:
+            if self._refreshing:
+                return False
+            self._refreshing = True
+            return True
+
+    def end_refresh(self):
+        """Release the refresh slot"""
+        with self._lock:
+            self._refreshing = False
+
+    def save(self):
+        """Persist the catalog atomically if anything changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps(dict(self._data, version=1), indent=1, sort_keys=True)
+            atomic_write_bytes(self.path, payload.encode('utf-8'))
+            self._dirty = False
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Correlation
+
+Cross-fund comparison over an aligned return panel. Every fund's OLD_PRICE series is
+placed on the price store's common date grid, returns are computed in one NumPy pass,
+and correlation, covariance and beta matrices are built with pairwise-complete
+observations using matrix products only (no per-pair Python loops). Rolling correlation
+against a chosen fund comes from cumulative sums, so each window is a subtraction.
+
+Usage:
+    python fund_correlation.py                                # Full history, all funds
+    python fund_correlation.py --start 2022-01-01 --end 2023-12-31
+    python fund_correlation.py --benchmark "Fund A" --rolling 24
+    python fund_correlation.py --heatmap                      # Also save a heatmap PNG
+    python fund_correlation.py --help                         # Show help
+"""
+
+import argparse
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+import matplotlib.pyplot as plt
+
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_storage import PricePanelStore, open_price_store
+
+# Minimum overlapping returns for a pairwise statistic
+DEFAULT_MIN_PERIODS = 3
+
+
+def build_return_panel(prices: pd.DataFrame) -> pd.DataFrame:
+    """Simple returns for a date x fund price panel
+
+    A gap inside a fund's history is bridged: the next valued date carries the return since
+    the last valued date. Dates before a fund's first price, or without a price, stay NaN.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    filled = prices.ffill().to_numpy(dtype=np.float64)
+
+    returns = np.full(values.shape, np.nan)
+    if len(values) > 1:
+        with np.errstate(divide='ignore', invalid='ignore'):
+            returns[1:] = values[1:] / filled[:-1] - 1.0
+    return pd.DataFrame(returns, index=prices.index, columns=prices.columns)
+
+
+def correlation_matrices(returns: pd.DataFrame, min_periods: int = DEFAULT_MIN_PERIODS) -> Dict[str, pd.DataFrame]:
+    """Pairwise-complete correlation, covariance and beta matrices for a return panel
+
+    beta[i, j] is the beta of fund i against fund j (cov(i, j) / var(j) over their common dates).
+    """
+    values = returns.to_numpy(dtype=np.float64)
+    valid = (~np.isnan(values)).astype(np.float64)
+    x = np.where(valid > 0, values, 0.0)
+
+    # For every pair (i, j), sums over the dates where both funds have a return
+    counts = valid.T @ valid
+    sum_i = x.T @ valid             # sum of fund i's returns on dates where j is valid
+    sum_sq_i = (x * x).T @ valid
+    sum_ij = x.T @ x
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = (sum_ij - sum_i * sum_i.T / counts) / (counts - 1)
+        var_i = (sum_sq_i - sum_i * sum_i / counts) / (counts - 1)
+        var_j = var_i.T
+        corr = cov / np.sqrt(var_i * var_j)
+        beta = cov / var_j
+
+    too_short = counts < max(min_periods, 2)
+    for matrix in (cov, corr, beta):
+        matrix[too_short] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+
+    funds = returns.columns
+    return {
+        'correlation': pd.DataFrame(corr, index=funds, columns=funds),
+        'covariance': pd.DataFrame(cov, index=funds, columns=funds),
+        'beta': pd.DataFrame(beta, index=funds, columns=funds),
+        'observations': pd.DataFrame(counts.astype(np.int64), index=funds, columns=funds)
+    }
+
+
+def rolling_correlation(returns: pd.DataFrame, benchmark: str, window: int,
+                        min_periods: int = None) -> pd.DataFrame:
+    """Rolling correlation of every fund against benchmark over the last `window` dates
+
+    Running sums of x, y, x^2, y^2 and xy (over dates where both funds have a return) are
+    accumulated once; each window's statistic is the difference of two running sums.
+    """
+    min_periods = min_periods or max(DEFAULT_MIN_PERIODS, window // 2)
+    values = returns.to_numpy(dtype=np.float64)
+    bench = returns[benchmark].to_numpy(dtype=np.float64)[:, None]
+
+    both = ~np.isnan(values) & ~np.isnan(bench)
+    x = np.where(both, bench, 0.0)
+    y = np.where(both, values, 0.0)
+
+    def running(terms: np.ndarray) -> np.ndarray:
+        out = np.zeros((len(terms) + 1, terms.shape[1]))
+        np.cumsum(terms, axis=0, out=out[1:])
+        return out[window:] - out[:-window] if len(terms) >= window else np.empty((0, terms.shape[1]))
+
+    n = running(both.astype(np.float64))
+    sx, sy = running(x), running(y)
+    sxx, syy, sxy = running(x * x), running(y * y), running(x * y)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        cov = sxy - sx * sy / n
+        corr = cov / np.sqrt((sxx - sx * sx / n) * (syy - sy * sy / n))
+    corr[n < min_periods] = np.nan
+    np.clip(corr, -1.0, 1.0, out=corr)
+
+    return pd.DataFrame(corr, index=returns.index[window - 1:] if len(corr) else returns.index[:0],
+                        columns=returns.columns)
+
+
+def save_heatmap(correlation: pd.DataFrame, png_filename: str, title: str):
+    """Save a correlation heatmap PNG"""
+    size = max(8, 0.35 * len(correlation) + 4)
+    fig, ax = plt.subplots(figsize=(size, size))
+    image = ax.imshow(correlation.to_numpy(), cmap='RdYlGn', vmin=-1, vmax=1)
+    ax.set_xticks(range(len(correlation.columns)))
+    ax.set_yticks(range(len(correlation.index)))
+    ax.set_xticklabels(correlation.columns, rotation=90, fontsize=7)
+    ax.set_yticklabels(correlation.index, fontsize=7)
+    ax.set_title(title, fontsize=14, fontweight='bold')
+    fig.colorbar(image, ax=ax, fraction=0.046, pad=0.04)
+    plt.tight_layout()
+    plt.savefig(png_filename, dpi=150, bbox_inches='tight')
+    plt.close(fig)
+
+
+def analyze_correlations(store: PricePanelStore, start_date: str = None, end_date: str = None,
+                         fund_names: List[str] = None, benchmark: str = None, window: int = None,
+                         min_periods: int = DEFAULT_MIN_PERIODS) -> Dict[str, pd.DataFrame]:
+    """Correlation/covariance/beta matrices (and optional rolling correlation) for a date window"""
+    prices = store.read_range(start_date, end_date, fund_names)
+    prices = prices.loc[:, prices.notna().any()]
+    returns = build_return_panel(prices)
+
+    results = correlation_matrices(returns, min_periods)
+    if benchmark is not None:
+        if benchmark not in returns.columns:
+            raise ValueError(f"No prices for {benchmark} in the selected window")
+        results['beta_vs_benchmark'] = results['beta'][[benchmark]].rename(columns={benchmark: 'beta'})
+        results['beta_vs_benchmark']['correlation'] = results['correlation'][benchmark]
+        if window:
+            results['rolling_correlation'] = rolling_correlation(returns, benchmark, window)
+    return results
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Correlation - correlation, covariance and beta across funds",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Outputs (with the default --output fund_correlation):
+  fund_correlation_correlation.csv         Pairwise correlation of returns
+  fund_correlation_covariance.csv          Pairwise covariance of per-observation returns
+  fund_correlation_beta.csv                beta[row, column] = cov(row, column) / var(column)
+  fund_correlation_beta_vs_benchmark.csv   With --benchmark
+  fund_correlation_rolling_correlation.csv With --benchmark and --rolling
+  fund_correlation_heatmap.png             With --heatmap
+        """
+    )
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD, default: first stored date)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD, default: last stored date)')
+    parser.add_argument('--fund', action='append', help='Fund to include (repeatable, default: all)')
+    parser.add_argument('--benchmark', help='Fund to compute betas and rolling correlation against')
+    parser.add_argument('--rolling', type=int, help='Rolling correlation window in observations (needs --benchmark)')
+    parser.add_argument('--min-periods', type=int, default=DEFAULT_MIN_PERIODS,
+                        help=f'Minimum overlapping returns per pair (default: {DEFAULT_MIN_PERIODS})')
+    parser.add_argument('--heatmap', action='store_true', help='Also save a correlation heatmap PNG')
+    parser.add_argument('--output', '-o', default='fund_correlation',
+                        help='Output path prefix (default: fund_correlation)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Correlation")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+    if args.benchmark and not store.has_fund(args.benchmark):
+        print(f"❌ Benchmark fund not found: {args.benchmark}")
+        return
+    if args.rolling and not args.benchmark:
+        parser.error("--rolling needs --benchmark")
+
+    fund_names = list(dict.fromkeys(args.fund + [args.benchmark])) if args.fund and args.benchmark else args.fund
+    try:
+        results = analyze_correlations(store, args.start, args.end, fund_names, args.benchmark,
+                                       args.rolling, args.min_periods)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    fund_count = len(results['correlation'])
+    print(f"✅ Compared {fund_count} funds ({fund_count * (fund_count - 1) // 2} pairs)")
+    for name, table in results.items():
+        if name == 'observations':
+            continue
+        path = f"{args.output}_{name}.csv"
+        atomic_write_bytes(path, table.to_csv().encode('utf-8'))
+        print(f"   📁 {path}")
+
+    if args.heatmap:
+        window = f"{args.start or 'start'} to {args.end or 'latest'}"
+        png_filename = f"{args.output}_heatmap.png"
+        save_heatmap(results['correlation'], png_filename, f"Fund Return Correlation ({window})")
+        print(f"   🖼️ {png_filename}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Dashboard
+
+Draws every fund (or a filtered subset) as a grid of small multiples in a single PNG,
+read straight from the price store. All panels share one date axis and tick formatting,
+optionally on a rebased scale (each fund = 100 at its first price in the window), and
+each series is LTTB-downsampled to its panel's pixel width. One figure replaces a pass
+over the per-fund PNGs for an overview; --preview renders it at low DPI for a quick look.
+
+Usage:
+    python fund_dashboard.py                                  # All funds -> cal_fund_dashboard.png
+    python fund_dashboard.py --rebase --start 2022-01-01      # Rebased to 100 from 2022
+    python fund_dashboard.py --fund equity --fund income      # Funds whose name contains the text
+    python fund_dashboard.py --preview                        # Fast low-DPI render
+    python fund_dashboard.py --help                           # Show help
+"""
+
+import io
+import math
+import time
+import argparse
+from typing import List
+
+import numpy as np
+import pandas as pd
+import matplotlib.dates as mdates
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_render import lttb_indices
+from fund_storage import PricePanelStore, open_price_store
+
+DEFAULT_DASHBOARD_FILE = "cal_fund_dashboard.png"
+DEFAULT_DASHBOARD_DPI = 150
+PREVIEW_DPI = 60
+PANEL_SIZE = (3.6, 2.4)  # inches per fund
+MAX_GRID_COLUMNS = 6
+
+
+def select_funds(fund_names: List[str], patterns: List[str] = None) -> List[str]:
+    """Funds whose name contains any of the patterns (case-insensitive); all funds without patterns"""
+    if not patterns:
+        return list(fund_names)
+    patterns = [pattern.lower() for pattern in patterns]
+    return [fund for fund in fund_names if any(pattern in fund.lower() for pattern in patterns)]
+
+
+def dashboard_panel(prices: pd.DataFrame, rebase: bool = False) -> pd.DataFrame:
+    """Drop funds without prices; with rebase, scale each fund to 100 at its first price"""
+    prices = prices.loc[:, prices.notna().any()]
+    if rebase and not prices.empty:
+        first = prices.bfill().iloc[0]
+        prices = prices / first * 100
+    return prices
+
+
+def draw_dashboard(prices: pd.DataFrame, png_filename: str, dpi: int = DEFAULT_DASHBOARD_DPI,
+                   columns: int = None, rebase: bool = False, title: str = "CAL Fund Dashboard"):
+    """Draw one small-multiples panel per fund column of prices on a single Agg figure"""
+    count = len(prices.columns)
+    columns = max(1, min(columns or min(MAX_GRID_COLUMNS, math.ceil(math.sqrt(count))), count))
+    rows = math.ceil(count / columns)
+
+    # Fixed margins in inches (suptitle above, date labels below) instead of a layout pass
+    height = PANEL_SIZE[1] * rows + 1.2
+    fig = Figure(figsize=(PANEL_SIZE[0] * columns, height))
+    FigureCanvasAgg(fig)
+    axes = fig.subplots(rows, columns, sharex=True, squeeze=False).ravel()
+    fig.subplots_adjust(left=0.6 / fig.get_figwidth(), right=1 - 0.2 / fig.get_figwidth(),
+                        bottom=0.4 / height, top=1 - 0.9 / height, wspace=0.3, hspace=0.55)
+
+    # About one point per pixel column of each panel
+    pixel_width = int(axes[0].get_position().width * fig.get_figwidth() * dpi)
+    dates = mdates.date2num(prices.index)
+    for ax, fund_name in zip(axes, prices.columns):
+        column = prices[fund_name].to_numpy(dtype=np.float64)
+        valued = ~np.isnan(column)
+        x, y = dates[valued], column[valued]
+        keep = lttb_indices(x, y, pixel_width)
+        ax.plot(x[keep], y[keep], linewidth=1.2, color='#1f77b4')
+        if rebase:
+            ax.axhline(100, color='grey', linewidth=0.8, linestyle='--', alpha=0.6)
+
+        name = fund_name if len(fund_name) <= 40 else fund_name[:39] + '…'
+        ax.set_title(f"{name}\n{y[-1]:.2f} ({(y[-1] / y[0] - 1) * 100:+.1f}%)", fontsize=8, y=1.0)
+        ax.grid(True, alpha=0.3)
+        ax.tick_params(labelsize=7)
+
+    for ax in axes[count:]:
+        ax.set_visible(False)
+
+    # Shared axes: one date locator/formatter for every panel (minticks=2 so short windows
+    # still find a tick interval)
+    locator = mdates.AutoDateLocator(minticks=2, maxticks=5)
+    axes[0].xaxis.set_major_locator(locator)
+    axes[0].xaxis.set_major_formatter(mdates.ConciseDateFormatter(locator))
+    for ax in axes[:count]:
+        ax.tick_params(axis='x', labelbottom=True)
+
+    first, last = prices.index.min().strftime('%Y-%m-%d'), prices.index.max().strftime('%Y-%m-%d')
+    scale = "rebased to 100" if rebase else "price (LKR)"
+    fig.suptitle(f"{title} - {count} funds, {first} to {last}, {scale}", fontsize=12, fontweight='bold')
+
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi)
+    atomic_write_bytes(png_filename, buffer.getvalue())
+
+
+def render_dashboard(store: PricePanelStore, png_filename: str = DEFAULT_DASHBOARD_FILE,
+                     fund_patterns: List[str] = None, start_date: str = None, end_date: str = None,
+                     rebase: bool = False, dpi: int = DEFAULT_DASHBOARD_DPI, columns: int = None) -> List[str]:
+    """Render the dashboard for the selected funds; returns the funds drawn"""
+    funds = select_funds(store.fund_names, fund_patterns)
+    if not funds:
+        return []
+
+    prices = dashboard_panel(store.read_range(start_date, end_date, funds), rebase)
+    if prices.empty:
+        return []
+
+    draw_dashboard(prices, png_filename, dpi, columns, rebase)
+    return list(prices.columns)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Dashboard - every fund as small multiples in one PNG",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Panels are titled with the fund's last value and its change over the window.
+With --rebase every fund starts at 100 (dashed line) so returns read the same in every panel.
+--preview renders at {PREVIEW_DPI} DPI instead of {DEFAULT_DASHBOARD_DPI} (--dpi overrides both).
+        """
+    )
+    parser.add_argument('--fund', action='append', help='Only funds whose name contains this text (repeatable)')
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD, default: first stored date)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD, default: last stored date)')
+    parser.add_argument('--rebase', action='store_true', help='Rebase every fund to 100 at its first price')
+    parser.add_argument('--preview', action='store_true', help=f'Fast low-DPI render ({PREVIEW_DPI} DPI)')
+    parser.add_argument('--dpi', type=int, help=f'Output DPI (default: {DEFAULT_DASHBOARD_DPI})')
+    parser.add_argument('--columns', type=int, help=f'Panels per row (default: up to {MAX_GRID_COLUMNS})')
+    parser.add_argument('--output', '-o', default=DEFAULT_DASHBOARD_FILE,
+                        help=f'Output PNG (default: {DEFAULT_DASHBOARD_FILE})')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Dashboard")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    dpi = args.dpi or (PREVIEW_DPI if args.preview else DEFAULT_DASHBOARD_DPI)
+    started = time.perf_counter()
+    funds = render_dashboard(store, args.output, args.fund, args.start, args.end, args.rebase, dpi, args.columns)
+    if not funds:
+        print("❌ No prices for the selected funds and dates")
+        return
+
+    print(f"✅ {len(funds)} funds at {dpi} DPI")
+    print(f"   📁 {args.output}")
+    print(f"   ⏱️ Rendered in {time.perf_counter() - started:.2f}s")
+
+
+if __name__ == "__main__":
+    main()
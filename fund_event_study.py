@@ -0,0 +1,207 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Event Study
+
+Measures how every fund reacted around each contextual event in the event calendar
+used by the financial context analysis. For every event x fund pair it computes the
+cumulative return over a pre-event window (start - pre days to the event start) and a
+post-event window (event start to event end + post days), then averages the reactions
+by impact level and by category.
+
+Prices are looked up "as of" each window boundary (the last stored price on or before
+it), for all events and funds at once on the price store's date x fund panel.
+
+Usage:
+    python fund_event_study.py                                # 30 days before/after every event
+    python fund_event_study.py --pre 15 --post 90
+    python fund_event_study.py --category imf --impact High
+    python fund_event_study.py --events my_calendar.csv       # Another calendar file
+    python fund_event_study.py --help                         # Show help
+"""
+
+import argparse
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_events import DEFAULT_EVENTS_FILE, IMPACT_LEVELS, EventCalendar, get_event_calendar
+from fund_storage import PricePanelStore, open_price_store
+
+DEFAULT_PRE_DAYS = 30
+DEFAULT_POST_DAYS = 30
+
+REACTION_COLUMNS = ['pre_return', 'post_return', 'total_return']
+SUMMARY_COLUMNS = ['events', 'observations', 'mean_pre_return', 'mean_post_return', 'median_post_return',
+                   'mean_total_return', 'positive_post_share']
+
+
+def event_window_returns(prices: pd.DataFrame, starts: np.ndarray, ends: np.ndarray,
+                         pre_days: int = DEFAULT_PRE_DAYS,
+                         post_days: int = DEFAULT_POST_DAYS) -> Dict[str, np.ndarray]:
+    """Pre, post and total window returns (%) as event x fund arrays
+
+    starts/ends are event start and end dates in epoch days. A pair is NaN when the fund has
+    no price on or before a window boundary, or its history ends before the window does.
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    days = prices.index.values.astype('datetime64[D]').astype(np.int64)
+    rows, funds = values.shape
+    valid = ~np.isnan(values) & (values > 0)
+
+    # Last valued observation on or before each panel date, per fund
+    last_valid = np.where(valid, np.arange(rows)[:, None], -1)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    fund_last_day = np.where(valid.any(axis=0), days[np.clip(last_valid[-1], 0, None)], np.iinfo(np.int64).min)
+
+    # Window boundaries for every event: (events, 3) -> pre start, event start, post end
+    boundaries = np.stack([starts - pre_days, starts, ends + post_days], axis=1)
+    rows_at = np.searchsorted(days, boundaries, side='right') - 1
+
+    # As-of price per (event, boundary, fund)
+    observation = np.where(rows_at[..., None] >= 0, last_valid[np.clip(rows_at, 0, None)], -1)
+    as_of = np.where(observation >= 0, values[np.clip(observation, 0, None), np.arange(funds)], np.nan)
+    as_of[boundaries[..., None] > fund_last_day] = np.nan
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        pre = (as_of[:, 1] / as_of[:, 0] - 1.0) * 100
+        post = (as_of[:, 2] / as_of[:, 1] - 1.0) * 100
+        total = (as_of[:, 2] / as_of[:, 0] - 1.0) * 100
+    return {'pre_return': pre, 'post_return': post, 'total_return': total}
+
+
+def _summarize(reactions: pd.DataFrame, by: str) -> pd.DataFrame:
+    """Average reaction per value of an event attribute (impact or category)"""
+    grouped = reactions.groupby(by, sort=False)
+    summary = pd.DataFrame({
+        'events': grouped['event_id'].nunique(),
+        'observations': grouped['post_return'].count(),
+        'mean_pre_return': grouped['pre_return'].mean(),
+        'mean_post_return': grouped['post_return'].mean(),
+        'median_post_return': grouped['post_return'].median(),
+        'mean_total_return': grouped['total_return'].mean(),
+        'positive_post_share': grouped['post_return'].apply(lambda returns: (returns > 0).mean() * 100)
+    }, columns=SUMMARY_COLUMNS)
+    return summary
+
+
+def run_event_study(store: PricePanelStore, calendar: EventCalendar, pre_days: int = DEFAULT_PRE_DAYS,
+                    post_days: int = DEFAULT_POST_DAYS, fund_names: List[str] = None,
+                    categories: List[str] = None, impacts: List[str] = None) -> Dict[str, pd.DataFrame]:
+    """Event x fund reactions plus averages by impact, category, event and fund"""
+    keep = np.ones(len(calendar), dtype=bool)
+    if categories:
+        keep &= np.isin([event['category'] for event in calendar.events], categories)
+    if impacts:
+        keep &= np.isin([event['impact'] for event in calendar.events], impacts)
+    events = [event for event, kept in zip(calendar.events, keep) if kept]
+
+    prices = store.read_range(funds=fund_names)
+    prices = prices.loc[:, prices.notna().any()]
+    if not events or prices.empty:
+        return {}
+
+    returns = event_window_returns(prices, calendar.starts[keep], calendar.ends[keep], pre_days, post_days)
+
+    # Long event x fund table, keeping only pairs with a complete window
+    event_count, fund_count = returns['post_return'].shape
+    event_ids = np.repeat(np.arange(event_count), fund_count)
+    reactions = pd.DataFrame({
+        'event_id': event_ids,
+        'start_date': np.repeat([event['start_date'] for event in events], fund_count),
+        'end_date': np.repeat([event['end_date'] for event in events], fund_count),
+        'event': np.repeat([event['event'] for event in events], fund_count),
+        'category': np.repeat([event['category'] for event in events], fund_count),
+        'impact': np.repeat([event['impact'] for event in events], fund_count),
+        'fund_name': np.tile(prices.columns.to_numpy(), event_count),
+        **{column: returns[column].ravel() for column in REACTION_COLUMNS}
+    })
+    reactions = reactions[reactions[REACTION_COLUMNS].notna().all(axis=1)]
+    if reactions.empty:
+        return {}
+
+    by_impact = _summarize(reactions, 'impact')
+    by_impact = by_impact.reindex([level for level in IMPACT_LEVELS if level in by_impact.index])
+    by_event = reactions.groupby(['event_id', 'start_date', 'end_date', 'event', 'category', 'impact']).agg(
+        funds=('fund_name', 'count'), mean_pre_return=('pre_return', 'mean'),
+        mean_post_return=('post_return', 'mean'), median_post_return=('post_return', 'median')
+    ).reset_index(level='event_id', drop=True)
+    fund_by_impact = reactions.pivot_table(index='fund_name', columns='impact', values='post_return', aggfunc='mean')
+    fund_by_impact = fund_by_impact[[level for level in IMPACT_LEVELS if level in fund_by_impact.columns]]
+
+    return {
+        'reactions': reactions.drop(columns='event_id').reset_index(drop=True),
+        'by_impact': by_impact,
+        'by_category': _summarize(reactions, 'category').sort_values('mean_post_return'),
+        'by_event': by_event,
+        'fund_by_impact': fund_by_impact
+    }
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Event Study - fund reactions around contextual events",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Windows (calendar days, returns in %):
+  pre_return    Event start - --pre days  ->  event start
+  post_return   Event start               ->  event end + --post days
+  total_return  Event start - --pre days  ->  event end + --post days
+
+Outputs (with the default --output fund_event_study):
+  fund_event_study_reactions.csv        One row per event x fund
+  fund_event_study_by_impact.csv        Average reaction per impact level
+  fund_event_study_by_category.csv      Average reaction per category
+  fund_event_study_by_event.csv         Average reaction across funds per event
+  fund_event_study_fund_by_impact.csv   Mean post-event return per fund x impact level
+        """
+    )
+    parser.add_argument('--pre', type=int, default=DEFAULT_PRE_DAYS,
+                        help=f'Days before the event start (default: {DEFAULT_PRE_DAYS})')
+    parser.add_argument('--post', type=int, default=DEFAULT_POST_DAYS,
+                        help=f'Days after the event end (default: {DEFAULT_POST_DAYS})')
+    parser.add_argument('--events', default=DEFAULT_EVENTS_FILE, help='Event calendar file (JSON or CSV)')
+    parser.add_argument('--category', action='append', help='Event category to include (repeatable)')
+    parser.add_argument('--impact', action='append', choices=IMPACT_LEVELS, help='Impact level to include (repeatable)')
+    parser.add_argument('--fund', action='append', help='Fund to include (repeatable, default: all)')
+    parser.add_argument('--output', '-o', default='fund_event_study',
+                        help='Output path prefix (default: fund_event_study)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Event Study")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    calendar = get_event_calendar(args.events)
+    results = run_event_study(store, calendar, args.pre, args.post, args.fund, args.category, args.impact)
+    if not results:
+        print("❌ No events with complete windows for the selected funds")
+        return
+
+    reactions = results['reactions']
+    print(f"✅ {len(results['by_event'])} events x {reactions['fund_name'].nunique()} funds "
+          f"({len(reactions)} reactions, -{args.pre}/+{args.post} days)")
+    print(f"\n{'Impact':<10} {'Events':>6} {'Pre %':>8} {'Post %':>8} {'Up %':>6}")
+    print("-" * 42)
+    for impact, row in results['by_impact'].iterrows():
+        print(f"{impact:<10} {int(row['events']):>6} {row['mean_pre_return']:>8.2f} "
+              f"{row['mean_post_return']:>8.2f} {row['positive_post_share']:>6.1f}")
+
+    print()
+    for name, table in results.items():
+        path = f"{args.output}_{name}.csv"
+        atomic_write_bytes(path, table.round(4).to_csv(index=name != 'reactions').encode('utf-8'))
+        print(f"   📁 {path}")
+
+
+if __name__ == "__main__":
+    main()
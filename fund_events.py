@@ -0,0 +1,156 @@
+"""
+CAL Fund Events
+
+Contextual market events used by the financial context analysis, loaded from a
+user-editable calendar file instead of being hard-coded.
+
+Components:
+1. EventCalendar - events with start/end dates, category and impact, sorted by start
+   date with a max-end tree over them, so the events overlapping any date range are
+   found without scanning the whole calendar
+2. get_event_calendar - loads a JSON or CSV calendar and reloads it when the file changes
+
+Calendar files:
+    JSON: {"events": [{"start_date": "2023-03-01", "end_date": "2023-03-01",
+                       "event": "...", "category": "imf", "impact": "High"}, ...]}
+    CSV:  start_date,end_date,event,category,impact
+    end_date is optional (single-day event); impact is High, Medium or Low.
+"""
+
+import os
+import csv
+import json
+import threading
+from typing import Dict, List, Tuple
+
+import numpy as np
+
+from fund_storage import to_epoch_days
+
+DEFAULT_EVENTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'cal_fund_events.json')
+IMPACT_LEVELS = ('High', 'Medium', 'Low')
+
+
+class EventCalendar:
+    """Sorted interval index over contextual events"""
+
+    def __init__(self, events: List[Dict[str, str]], version: str = ""):
+        self.version = version
+        self.events = sorted(events, key=lambda event: (event['start_date'], event['end_date'], event['event']))
+        self.starts = to_epoch_days(event['start_date'] for event in self.events)
+        self.ends = to_epoch_days(event['end_date'] for event in self.events)
+
+        # Implicit binary tree over start-ordered events; each node keeps the latest end below it
+        self.size = 1
+        while self.size < max(len(self.events), 1):
+            self.size *= 2
+        self._max_end = np.full(2 * self.size, np.iinfo(np.int64).min, dtype=np.int64)
+        self._max_end[self.size:self.size + len(self.events)] = self.ends
+        for node in range(self.size - 1, 0, -1):
+            self._max_end[node] = max(self._max_end[2 * node], self._max_end[2 * node + 1])
+
+    def __len__(self) -> int:
+        return len(self.events)
+
+    def overlapping(self, start_date: str, end_date: str) -> List[Dict[str, str]]:
+        """Events whose [start_date, end_date] overlaps the given range, in start order
+
+        Only events starting by end_date can overlap (one binary search); among those, the
+        tree is descended only into subtrees holding an event that ends on or after start_date.
+        """
+        range_start, range_end = to_epoch_days([start_date, end_date])
+        limit = int(np.searchsorted(self.starts, range_end, side='right'))
+        if limit == 0:
+            return []
+
+        matches = []
+        stack: List[Tuple[int, int, int]] = [(1, 0, self.size)]
+        while stack:
+            node, lo, hi = stack.pop()
+            if lo >= limit or self._max_end[node] < range_start:
+                continue
+            if hi - lo == 1:
+                matches.append(self.events[lo])
+                continue
+            mid = (lo + hi) // 2
+            stack.append((2 * node + 1, mid, hi))
+            stack.append((2 * node, lo, mid))
+        return [dict(event) for event in matches]
+
+
+def _normalize_event(raw: Dict) -> Dict[str, str]:
+    """Validate one calendar entry and fill in defaults"""
+    start_date = str(raw.get('start_date') or raw.get('date') or '').strip()
+    end_date = str(raw.get('end_date') or '').strip() or start_date
+    description = str(raw.get('event') or '').strip()
+    impact = str(raw.get('impact') or 'Medium').strip().capitalize()
+
+    if not start_date or not description:
+        raise ValueError("start_date and event are required")
+    if impact not in IMPACT_LEVELS:
+        raise ValueError(f"impact must be one of {', '.join(IMPACT_LEVELS)}")
+    start, end = to_epoch_days([start_date, end_date])
+    if end < start:
+        raise ValueError("end_date is before start_date")
+
+    return {
+        'start_date': start_date,
+        'end_date': end_date,
+        'date': start_date if end_date == start_date else f"{start_date} to {end_date}",
+        'event': description,
+        'category': str(raw.get('category') or 'general').strip(),
+        'impact': impact
+    }
+
+
+def load_event_calendar(path: str) -> EventCalendar:
+    """Load a JSON or CSV event calendar, skipping invalid entries with a warning"""
+    if path.lower().endswith('.csv'):
+        with open(path, 'r', encoding='utf-8', newline='') as f:
+            raw_events = list(csv.DictReader(f))
+    else:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+        raw_events = data.get('events', []) if isinstance(data, dict) else data
+
+    events = []
+    for number, raw in enumerate(raw_events, 1):
+        try:
+            events.append(_normalize_event(raw))
+        except (ValueError, TypeError, AttributeError) as e:
+            print(f"Warning: Skipping event {number} in {path}: {e}")
+
+    stat = os.stat(path)
+    return EventCalendar(events, version=f"{stat.st_size}-{stat.st_mtime_ns}")
+
+
+_calendars: Dict[str, Tuple[Tuple[int, int], EventCalendar]] = {}
+_calendars_lock = threading.Lock()
+
+
+def get_event_calendar(path: str = DEFAULT_EVENTS_FILE) -> EventCalendar:
+    """Return the calendar for path, reloading it only when the file's size or mtime changed"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        with _calendars_lock:
+            if path not in _calendars:
+                print(f"Warning: Event calendar not found: {path}")
+                _calendars[path] = ((-1, -1), EventCalendar([], version="missing"))
+            return _calendars[path][1]
+
+    key = (stat.st_size, stat.st_mtime_ns)
+    with _calendars_lock:
+        cached = _calendars.get(path)
+        if cached is not None and cached[0] == key:
+            return cached[1]
+
+    try:
+        calendar = load_event_calendar(path)
+    except (OSError, ValueError) as e:
+        print(f"Warning: Could not load event calendar {path}: {e}")
+        calendar = EventCalendar([], version="invalid")
+
+    with _calendars_lock:
+        _calendars[path] = (key, calendar)
+    return calendar
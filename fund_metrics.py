@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Metrics
+
+Frequency-aware return/risk metrics computed for every fund at once over the price
+store's date x fund panel. Prices are sampled on the 1st and 15th of each month (with
+gaps), so every statistic uses the actual time between observations instead of
+assuming daily data:
+
+- CAGR from the first and last price in the window and the elapsed years
+- Annualized volatility from log returns scaled by each interval's length
+- Sharpe and Sortino ratios against a constant or dated risk-free rate
+- Maximum drawdown with peak, trough and recovery dates and its duration
+- Calmar ratio (CAGR / maximum drawdown)
+
+Usage:
+    python fund_metrics.py                                   # Full history, all funds
+    python fund_metrics.py --start 2021-01-01 --risk-free 8.5
+    python fund_metrics.py --risk-free-file tbill_rates.csv  # Date,RATE (% per annum)
+    python fund_metrics.py --help                            # Show help
+"""
+
+import argparse
+from typing import List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fund_analytics import DAYS_PER_YEAR
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_storage import open_price_store
+
+METRIC_COLUMNS = [
+    'first_date', 'last_date', 'observations', 'years', 'total_return', 'cagr', 'volatility',
+    'sharpe', 'sortino', 'max_drawdown', 'drawdown_peak', 'drawdown_trough', 'drawdown_recovery',
+    'drawdown_duration_days', 'calmar'
+]
+
+
+def load_risk_free_rates(csv_filename: str) -> pd.Series:
+    """Read a Date,RATE CSV (annual rate in percent) into a date-indexed series"""
+    df = pd.read_csv(csv_filename)
+    if 'Date' not in df.columns or 'RATE' not in df.columns:
+        raise ValueError(f"Risk-free file needs Date and RATE columns: {csv_filename}")
+    return pd.Series(df['RATE'].astype(float).values, index=pd.to_datetime(df['Date'])).sort_index()
+
+
+def _rate_at(days: np.ndarray, risk_free) -> np.ndarray:
+    """Annual risk-free rate (percent) in force on each epoch day; a float applies everywhere"""
+    if not isinstance(risk_free, pd.Series):
+        return np.full(days.shape, float(risk_free or 0.0))
+
+    rate_days = risk_free.index.values.astype('datetime64[D]').astype(np.int64)
+    positions = np.clip(np.searchsorted(rate_days, days, side='right') - 1, 0, len(rate_days) - 1)
+    return risk_free.to_numpy(dtype=np.float64)[positions]
+
+
+def compute_universe_metrics(prices: pd.DataFrame, risk_free=0.0) -> pd.DataFrame:
+    """Metrics for every fund column of a date x fund price panel, as a fund x metric table
+
+    risk_free is an annual rate in percent, either a float or a date-indexed Series
+    (the rate in force at the start of each interval applies to it).
+    """
+    values = prices.to_numpy(dtype=np.float64)
+    days = prices.index.values.astype('datetime64[D]').astype(np.int64)
+    rows, funds = values.shape
+    if rows == 0:
+        # No dates in the window: no fund has data
+        table = pd.DataFrame(columns=METRIC_COLUMNS)
+        table.index.name = 'fund_name'
+        return table
+
+    valid = ~np.isnan(values) & (values > 0)
+    positions = np.arange(rows)
+
+    # Previous valued observation per (date, fund), bridging gaps in a fund's history
+    last_valid = np.where(valid, positions[:, None], -1)
+    np.maximum.accumulate(last_valid, axis=0, out=last_valid)
+    previous = np.vstack([np.full((1, funds), -1), last_valid[:-1]])
+    step = valid & (previous >= 0)
+
+    log_prices = np.log(np.where(valid, values, 1.0))
+    prev_index = np.clip(previous, 0, None)
+    log_returns = np.where(step, log_prices - np.take_along_axis(log_prices, prev_index, axis=0), 0.0)
+    dt_years = np.where(step, (days[:, None] - days[prev_index]) / DAYS_PER_YEAR, 0.0)
+
+    # Continuously compounded risk-free return over each interval
+    rf_rate = _rate_at(days[prev_index].ravel(), risk_free).reshape(rows, funds)
+    excess = np.where(step, log_returns - np.log1p(rf_rate / 100.0) * dt_years, 0.0)
+
+    steps = step.sum(axis=0)
+    total_years = dt_years.sum(axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Variance per unit time: sum((r - mu*dt)^2 / dt) / (n - 1), with mu = sum(r) / sum(dt)
+        drift = log_returns.sum(axis=0) / total_years
+        scaled = np.where(step, (log_returns - drift * dt_years) ** 2 / np.where(step, dt_years, 1.0), 0.0)
+        volatility = np.where(steps >= 2, np.sqrt(scaled.sum(axis=0) / (steps - 1)), np.nan)
+
+        excess_per_year = excess.sum(axis=0) / total_years
+        downside = np.where(step, np.minimum(excess, 0.0) ** 2 / np.where(step, dt_years, 1.0), 0.0)
+        downside_deviation = np.where(steps >= 1, np.sqrt(downside.sum(axis=0) / steps), np.nan)
+
+        sharpe = excess_per_year / volatility
+        sortino = excess_per_year / downside_deviation
+
+    # First and last valued observation per fund
+    has_data = valid.any(axis=0)
+    first = np.argmax(valid, axis=0)
+    last = rows - 1 - np.argmax(valid[::-1], axis=0)
+    first_price = values[first, np.arange(funds)]
+    last_price = values[last, np.arange(funds)]
+    years = (days[last] - days[first]) / DAYS_PER_YEAR
+    with np.errstate(divide='ignore', invalid='ignore'):
+        total_return = last_price / first_price - 1.0
+        cagr = np.where(years > 0, (last_price / first_price) ** (1.0 / years) - 1.0, np.nan)
+
+    # Drawdown against the running peak of forward-filled prices
+    filled = np.where(last_valid >= 0, np.take_along_axis(values, np.clip(last_valid, 0, None), axis=0), np.nan)
+    running_peak = np.fmax.accumulate(filled, axis=0)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        drawdown = np.where(np.isnan(filled), 0.0, 1.0 - filled / running_peak)
+    trough = np.argmax(drawdown, axis=0)
+    max_drawdown = drawdown[trough, np.arange(funds)]
+
+    at_peak = np.where(filled == running_peak, positions[:, None], -1)
+    peak = np.maximum.accumulate(at_peak, axis=0)[trough, np.arange(funds)]
+    peak_price = running_peak[trough, np.arange(funds)]
+    recovered = (filled >= peak_price) & (positions[:, None] > trough)
+    has_recovered = recovered.any(axis=0)
+    recovery = np.argmax(recovered, axis=0)
+    duration_end = np.where(has_recovered, recovery, last)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        calmar = np.where(max_drawdown > 0, cagr / max_drawdown, np.nan)
+
+    def dates_at(index: np.ndarray, present: np.ndarray) -> List[Optional[str]]:
+        labels = np.datetime_as_string(days[index].astype('datetime64[D]'), unit='D')
+        return [str(label) if ok else None for label, ok in zip(labels, present)]
+
+    drawn_down = has_data & (max_drawdown > 0)
+    table = pd.DataFrame({
+        'first_date': dates_at(first, has_data),
+        'last_date': dates_at(last, has_data),
+        'observations': valid.sum(axis=0),
+        'years': years,
+        'total_return': total_return * 100,
+        'cagr': cagr * 100,
+        'volatility': volatility * 100,
+        'sharpe': sharpe,
+        'sortino': sortino,
+        'max_drawdown': max_drawdown * 100,
+        'drawdown_peak': dates_at(peak, drawn_down),
+        'drawdown_trough': dates_at(trough, drawn_down),
+        'drawdown_recovery': dates_at(recovery, drawn_down & has_recovered),
+        'drawdown_duration_days': np.where(drawn_down, days[duration_end] - days[np.clip(peak, 0, None)], 0),
+        'calmar': calmar
+    }, index=prices.columns, columns=METRIC_COLUMNS)
+    table.index.name = 'fund_name'
+    return table.replace([np.inf, -np.inf], np.nan)[has_data]
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Metrics - frequency-aware return/risk metrics for every fund",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog="""
+Percent columns: total_return, cagr, volatility, max_drawdown.
+drawdown_duration_days runs from the peak to the recovery date, or to the last date
+if the fund has not yet recovered (drawdown_recovery is then empty).
+        """
+    )
+    parser.add_argument('--start', help='Start date (YYYY-MM-DD, default: first stored date)')
+    parser.add_argument('--end', help='End date (YYYY-MM-DD, default: last stored date)')
+    parser.add_argument('--fund', action='append', help='Fund to include (repeatable, default: all)')
+    parser.add_argument('--risk-free', type=float, default=0.0,
+                        help='Constant annual risk-free rate in percent (default: 0)')
+    parser.add_argument('--risk-free-file', help='CSV with Date,RATE columns (annual %%), overrides --risk-free')
+    parser.add_argument('--sort', default='sharpe', choices=METRIC_COLUMNS,
+                        help='Column to sort by, descending (default: sharpe)')
+    parser.add_argument('--output', '-o', default='fund_metrics.csv',
+                        help='Output CSV (default: fund_metrics.csv)')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Metrics")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    try:
+        risk_free = load_risk_free_rates(args.risk_free_file) if args.risk_free_file else args.risk_free
+    except (OSError, ValueError) as e:
+        print(f"❌ {e}")
+        return
+
+    metrics = compute_universe_metrics(store.read_range(args.start, args.end, args.fund), risk_free)
+    if metrics.empty:
+        print("❌ No prices for the selected funds and dates")
+        return
+    metrics = metrics.sort_values(args.sort, ascending=False)
+    atomic_write_bytes(args.output, metrics.round(4).to_csv().encode('utf-8'))
+
+    print(f"{'Fund':<50} {'CAGR %':>8} {'Vol %':>7} {'Sharpe':>7} {'MaxDD %':>8}")
+    print("-" * 84)
+    for fund_name, row in metrics.head(15).iterrows():
+        print(f"{fund_name[:50]:<50} {row['cagr']:>8.2f} {row['volatility']:>7.2f} "
+              f"{row['sharpe']:>7.2f} {row['max_drawdown']:>8.2f}")
+    print(f"\n✅ Metrics for {len(metrics)} funds saved to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
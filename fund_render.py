@@ -0,0 +1,352 @@
+"""
+CAL Fund Render
+
+Price trend PNG rendering shared by the extractor (normal and init mode) and png_updater.
+
+Components:
+1. render_price_png - draws one fund's CSV on its own Agg figure (no pyplot global state),
+   so the same code produces byte-identical PNGs in-process and in worker processes
+2. render_pngs - renders many funds at once on a process pool, one headless Agg backend
+   per worker, and reports per-file timings
+3. RenderManifest - content hash of each PNG's plotted series plus its render settings, so
+   a PNG is only re-rendered when what it would show has changed; written once per batch
+4. lttb_indices - Largest-Triangle-Three-Buckets downsampling to about one point per pixel
+   column, preserving the visible shape; used for PNGs and the GUI graph
+"""
+
+import io
+import os
+import json
+import time
+import signal
+import hashlib
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+import matplotlib
+from matplotlib.backends.backend_agg import FigureCanvasAgg
+from matplotlib.figure import Figure
+
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+
+DEFAULT_PNG_DPI = 300
+PNG_FIGSIZE = (12, 8)
+
+# Bump whenever the chart's appearance changes so every PNG is re-rendered once
+RENDER_STYLE_VERSION = 2
+
+
+def lttb_indices(x: np.ndarray, y: np.ndarray, threshold: int) -> np.ndarray:
+    """Indices of at most threshold points chosen by Largest-Triangle-Three-Buckets
+
+    The first and last points are always kept. The interior is split into threshold - 2
+    buckets, and each bucket keeps the point that forms the largest triangle with the point
+    kept before it and the average of the next bucket. Series that already fit are returned whole.
+    """
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+
+    # Bucket b spans [edges[b], edges[b + 1]) of the interior points 1 .. n - 2
+    every = (n - 2) / (threshold - 2)
+    edges = np.minimum((np.arange(threshold - 1) * every).astype(np.int64) + 1, n - 1)
+    edges[-1] = n - 1
+
+    # Mean of every bucket from prefix sums; the last point stands in for the bucket after the last
+    cum_x = np.concatenate([[0.0], np.cumsum(x)])
+    cum_y = np.concatenate([[0.0], np.cumsum(y)])
+    counts = np.maximum(edges[1:] - edges[:-1], 1)
+    mean_x = np.append((cum_x[edges[1:]] - cum_x[edges[:-1]]) / counts, x[-1])
+    mean_y = np.append((cum_y[edges[1:]] - cum_y[edges[:-1]]) / counts, y[-1])
+
+    selected = np.empty(threshold, dtype=np.int64)
+    selected[0], selected[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        lo, hi = edges[bucket], edges[bucket + 1]
+        if hi <= lo:
+            selected[bucket + 1] = previous
+            continue
+        ax, ay = x[previous], y[previous]
+        area = np.abs((ax - mean_x[bucket + 1]) * (y[lo:hi] - ay) - (ax - x[lo:hi]) * (mean_y[bucket + 1] - ay))
+        previous = lo + int(np.argmax(area))
+        selected[bucket + 1] = previous
+    return np.unique(selected)
+
+
+def png_filename_for_csv(csv_filename: str) -> str:
+    """PNG path for a fund's CSV (cal_fund_data_X.csv -> cal_fund_price_trend_X.png)"""
+    return csv_filename.replace('.csv', '.png').replace('cal_fund_data_', 'cal_fund_price_trend_')
+
+
+def load_price_series(csv_filename: str) -> pd.DataFrame:
+    """Read a fund CSV sorted by date, ready to plot
+
+    Raises FileNotFoundError or ValueError when there is nothing valid to plot.
+    """
+    if not os.path.exists(csv_filename):
+        raise FileNotFoundError(f"CSV file not found: {csv_filename}")
+
+    df = pd.read_csv(csv_filename)
+    if 'Date' not in df.columns or 'OLD_PRICE' not in df.columns:
+        raise ValueError(f"Invalid CSV format in {csv_filename}")
+
+    df['Date'] = pd.to_datetime(df['Date'])
+    df = df.sort_values('Date')
+    if len(df) == 0:
+        raise ValueError(f"No data to visualize in {csv_filename}")
+    return df
+
+
+def render_fingerprint(df: pd.DataFrame, fund_name: str, dpi: int = DEFAULT_PNG_DPI) -> str:
+    """Hash of the plotted series and everything else that affects the PNG's pixels"""
+    settings = json.dumps({
+        'title': fund_name,
+        'dpi': dpi,
+        'figsize': PNG_FIGSIZE,
+        'style': RENDER_STYLE_VERSION,
+        'matplotlib': matplotlib.__version__
+    }, sort_keys=True)
+    days = df['Date'].values.astype('datetime64[D]').astype(np.int64)
+    prices = df['OLD_PRICE'].to_numpy(dtype=np.float64)
+    return hashlib.blake2b(settings.encode('utf-8') + days.tobytes() + prices.tobytes(), digest_size=16).hexdigest()
+
+
+def draw_price_png(df: pd.DataFrame, fund_name: str, png_filename: str, dpi: int = DEFAULT_PNG_DPI):
+    """Draw a loaded price series as the price trend chart"""
+    fig = Figure(figsize=PNG_FIGSIZE)
+    FigureCanvasAgg(fig)
+    ax = fig.add_subplot()
+
+    # About one point per pixel column of the saved axes; shorter series are drawn whole
+    pixel_width = int(ax.get_position().width * PNG_FIGSIZE[0] * dpi)
+    seconds = df['Date'].values.astype('datetime64[s]').astype(np.float64)
+    df = df.iloc[lttb_indices(seconds, df['OLD_PRICE'].to_numpy(dtype=np.float64), pixel_width)]
+    ax.plot(df['Date'], df['OLD_PRICE'], marker='o', linewidth=2, markersize=4, alpha=0.7, color='#1f77b4')
+
+    ax.set_title(f'{fund_name}\nPrice Trend Analysis', fontsize=14, fontweight='bold')
+    ax.set_xlabel('Date', fontsize=12)
+    ax.set_ylabel('Price (LKR)', fontsize=12)
+    ax.grid(True, alpha=0.3)
+    ax.tick_params(axis='x', labelrotation=45)
+
+    # Rendered in memory and renamed into place, so viewers and the monitor never see a partial PNG
+    fig.tight_layout()
+    buffer = io.BytesIO()
+    fig.savefig(buffer, format='png', dpi=dpi, bbox_inches='tight')
+    atomic_write_bytes(png_filename, buffer.getvalue())
+
+
+def render_price_png(csv_filename: str, fund_name: str, png_filename: str = None,
+                     dpi: int = DEFAULT_PNG_DPI) -> str:
+    """Render the price trend chart for a CSV file; returns the PNG path"""
+    png_filename = png_filename or png_filename_for_csv(csv_filename)
+    draw_price_png(load_price_series(csv_filename), fund_name, png_filename, dpi)
+    return png_filename
+
+
+def csv_stat(csv_filename: str) -> Optional[List[int]]:
+    """[size, mtime_ns] of a CSV file, or None if it cannot be read"""
+    try:
+        stat = os.stat(csv_filename)
+    except OSError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+class RenderManifest:
+    """Fingerprint of every rendered PNG; record() batches, save() merges into the file on disk
+    
+    Each entry also keeps the size and mtime of the CSV it was rendered from, so a status
+    check only re-reads and re-hashes CSVs that were written since.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, 'render_manifest.json')
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Dict] = {}
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load entries as {png_filename: {...}}"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('pngs', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read render manifest {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Merge the entries recorded since the last save into the file on disk and write it atomically
+        
+        The file is re-read first, so entries saved meanwhile by another process are kept.
+        """
+        with self._lock:
+            if not self._pending:
+                return
+            entries = self._load()
+            entries.update(self._pending)
+            payload = json.dumps({'version': 1, 'pngs': entries}, indent=1, sort_keys=True)
+            atomic_write_bytes(self.path, payload.encode('utf-8'))
+            self._entries = entries
+            self._pending = {}
+
+    def record(self, png_filename: str, fingerprint: str, csv_stat: Optional[List[int]] = None):
+        """Record the fingerprint of a just-rendered PNG and the CSV stat it was read at (persisted by save())"""
+        entry = {
+            'fingerprint': fingerprint,
+            'size': os.path.getsize(png_filename),
+            'csv_size': csv_stat[0] if csv_stat else None,
+            'csv_mtime_ns': csv_stat[1] if csv_stat else None,
+            'rendered_at': datetime.now().isoformat(timespec='seconds')
+        }
+        with self._lock:
+            key = os.path.normpath(png_filename)
+            self._entries[key] = self._pending[key] = entry
+
+    def record_csv_stat(self, png_filename: str, csv_stat: Optional[List[int]]):
+        """Note that a current PNG's CSV now has this size and mtime (rewritten with the same data)"""
+        with self._lock:
+            key = os.path.normpath(png_filename)
+            entry = self._entries.get(key)
+            if entry is None or csv_stat is None or [entry.get('csv_size'), entry.get('csv_mtime_ns')] == csv_stat:
+                return
+            entry = dict(entry, csv_size=csv_stat[0], csv_mtime_ns=csv_stat[1])
+            self._entries[key] = self._pending[key] = entry
+
+    def is_current(self, png_filename: str, fingerprint: str) -> bool:
+        """True if the PNG on disk was rendered from exactly this fingerprint"""
+        entry = self._entries.get(os.path.normpath(png_filename))
+        if entry is None or entry.get('fingerprint') != fingerprint:
+            return False
+        return self._png_unchanged(png_filename, entry)
+
+    def csv_unchanged(self, png_filename: str, csv_filename: str) -> bool:
+        """True if the PNG on disk was rendered from the CSV as it is now (same size and mtime)"""
+        entry = self._entries.get(os.path.normpath(png_filename))
+        if entry is None or entry.get('csv_size') is None:
+            return False
+        if csv_stat(csv_filename) != [entry['csv_size'], entry.get('csv_mtime_ns')]:
+            return False
+        return self._png_unchanged(png_filename, entry)
+
+    @staticmethod
+    def _png_unchanged(png_filename: str, entry: Dict) -> bool:
+        """True if the PNG still has the size it was rendered at"""
+        try:
+            return os.path.getsize(png_filename) == entry.get('size')
+        except OSError:
+            return False
+
+
+def _init_render_worker():
+    """Use the headless Agg backend in each render worker process
+
+    Ctrl+C is left to the parent, which decides whether pending renders still run.
+    """
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    matplotlib.use('Agg')
+
+
+def create_render_pool(workers: int = None) -> ProcessPoolExecutor:
+    """Process pool for render_pngs(pool=...), with the Agg backend in every worker"""
+    return ProcessPoolExecutor(max_workers=workers, initializer=_init_render_worker)
+
+
+def _render_job(csv_filename: str, fund_name: str, dpi: int, df: pd.DataFrame = None,
+                fingerprint: str = None, stat: List[int] = None) -> Dict[str, object]:
+    """Render one PNG, capturing its fingerprint, timing and any error instead of raising
+
+    df, fingerprint and stat are passed when the caller already loaded the CSV to check the manifest.
+    """
+    started = time.perf_counter()
+    result = {'csv': csv_filename, 'fund_name': fund_name, 'png': png_filename_for_csv(csv_filename),
+              'error': None, 'skipped': False, 'fingerprint': fingerprint, 'csv_stat': stat}
+    try:
+        if df is None:
+            # Stat before reading, so a write in between shows up as a changed CSV next time
+            result['csv_stat'] = csv_stat(csv_filename)
+            df = load_price_series(csv_filename)
+        if fingerprint is None:
+            result['fingerprint'] = render_fingerprint(df, fund_name, dpi)
+        draw_price_png(df, fund_name, result['png'], dpi)
+    except Exception as e:
+        result['error'] = str(e)
+    result['seconds'] = time.perf_counter() - started
+    return result
+
+
+def _check_current(csv_filename: str, fund_name: str, dpi: int,
+                   manifest: RenderManifest) -> Tuple[Optional[Dict[str, object]], Tuple]:
+    """(skipped result, ()) if the PNG already shows this CSV, else (None, (df, fingerprint, stat))
+
+    The loaded series, its fingerprint and the CSV stat go to the render, so the CSV is read only once.
+    """
+    png_filename = png_filename_for_csv(csv_filename)
+    stat = csv_stat(csv_filename)
+    try:
+        df = load_price_series(csv_filename)
+    except Exception:
+        return None, ()  # Let the render report the error
+    fingerprint = render_fingerprint(df, fund_name, dpi)
+    if not manifest.is_current(png_filename, fingerprint):
+        return None, (df, fingerprint, stat)
+    return ({'csv': csv_filename, 'fund_name': fund_name, 'png': png_filename, 'error': None,
+             'skipped': True, 'fingerprint': fingerprint, 'csv_stat': stat, 'seconds': 0.0}, ())
+
+
+def render_pngs(jobs: List[Tuple[str, str]], workers: int = None, dpi: int = DEFAULT_PNG_DPI,
+                manifest: RenderManifest = None, force: bool = False,
+                pool: ProcessPoolExecutor = None) -> List[Dict[str, object]]:
+    """Render (csv_filename, fund_name) jobs on a process pool; results are in job order
+
+    Each result has csv, fund_name, png, seconds, skipped and error (None on success).
+    With a manifest, PNGs whose fingerprint is unchanged are skipped (unless force) and
+    new renders are recorded, then the manifest is saved once. workers=None uses the CPU count; workers=1 (or a single
+    job) renders in-process; a long-lived pool from create_render_pool is used as given.
+    """
+    results: List[Optional[Dict[str, object]]] = [None] * len(jobs)
+    loaded: List[Tuple] = [()] * len(jobs)
+    if manifest is not None and not force:
+        for position, (csv_filename, fund_name) in enumerate(jobs):
+            results[position], loaded[position] = _check_current(csv_filename, fund_name, dpi, manifest)
+
+    pending = [position for position, result in enumerate(results) if result is None]
+    if pending:
+        loaded = [loaded[position] or (None, None, None) for position in pending]
+        arguments = ([jobs[position][0] for position in pending], [jobs[position][1] for position in pending],
+                     [dpi] * len(pending), *(list(column) for column in zip(*loaded)))
+        if pool is not None:
+            rendered = list(pool.map(_render_job, *arguments))
+        elif workers == 1 or len(pending) == 1:
+            rendered = [_render_job(*job) for job in zip(*arguments)]
+        else:
+            with create_render_pool(workers) as own_pool:
+                rendered = list(own_pool.map(_render_job, *arguments))
+        for position, result in zip(pending, rendered):
+            results[position] = result
+
+    if manifest is not None:
+        for result in results:
+            if result['skipped']:
+                manifest.record_csv_stat(result['png'], result['csv_stat'])
+            elif result['error'] is None:
+                try:
+                    manifest.record(result['png'], result['fingerprint'], result['csv_stat'])
+                except OSError as e:
+                    print(f"Warning: Could not update render manifest for {result['png']}: {e}")
+        # One manifest write per batch, from the parent
+        try:
+            manifest.save()
+        except OSError as e:
+            print(f"Warning: Could not save render manifest {manifest.path}: {e}")
+    return results
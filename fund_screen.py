@@ -0,0 +1,246 @@
+#!/usr/bin/env python3
+"""
+CAL Fund Screen
+
+Cross-fund screening and ranking over a precomputed metric table. For every fund and
+every standard period (ytd, 1y, 3y, 5y, crisis_2022, recovery_2023, since_inception)
+the fund_metrics figures are computed once and kept in the cache directory; queries
+filter, sort and limit that table instead of re-analyzing each fund.
+
+On refresh only funds whose price series changed (by content hash) are recomputed. If
+the latest stored date moves, the trailing periods move with it and every fund is
+recomputed.
+
+Usage:
+    python fund_screen.py --period 1y --where "volatility < 10" --sort total_return --limit 5
+    python fund_screen.py --period crisis_2022 --sort max_drawdown --ascending --limit 5
+    python fund_screen.py --period 3y --where "sharpe > 0.5" --where "fund_name ~ equity"
+    python fund_screen.py --help                             # Show help
+
+Python:
+    screen = FundScreen()
+    screen.refresh(open_price_store())
+    screen.query('1y', where=['volatility < 10'], sort='total_return', limit=5)
+"""
+
+import os
+import re
+import json
+import argparse
+import operator
+from typing import Any, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from fund_analytics import series_version
+from fund_batch import STANDARD_PERIODS, resolve_period
+from fund_cache import DEFAULT_CACHE_DIR, atomic_write_bytes
+from fund_metrics import METRIC_COLUMNS, compute_universe_metrics
+from fund_storage import PricePanelStore, open_price_store
+
+SCREEN_FILE = "screen_metrics.json"
+SCREEN_FORMAT_VERSION = 1
+SCREEN_COLUMNS = ['period', 'fund_name', 'period_start', 'period_end'] + METRIC_COLUMNS
+
+FILTER_PATTERN = re.compile(r'^\s*(\w+)\s*(<=|>=|==|!=|<|>|~)\s*(.+?)\s*$')
+FILTER_OPERATORS = {
+    '<': operator.lt, '<=': operator.le, '>': operator.gt, '>=': operator.ge,
+    '==': operator.eq, '!=': operator.ne
+}
+
+
+def parse_filter(expression: str) -> Tuple[str, str, Any]:
+    """Parse 'column op value' (op: < <= > >= == != or ~ for case-insensitive contains)"""
+    match = FILTER_PATTERN.match(expression)
+    if not match:
+        raise ValueError(f"Invalid filter: {expression!r} (expected e.g. 'volatility < 10')")
+
+    column, op, value = match.groups()
+    if column not in SCREEN_COLUMNS:
+        raise ValueError(f"Unknown column in filter: {column} (choose from {', '.join(SCREEN_COLUMNS)})")
+
+    value = value.strip('"\'')
+    if op != '~':
+        try:
+            value = float(value)
+        except ValueError:
+            pass
+    return column, op, value
+
+
+def screen(table: pd.DataFrame, period: str, where: List[str] = None, sort: str = None,
+           ascending: bool = False, limit: int = None) -> pd.DataFrame:
+    """Filter, sort and limit one period of a metric table; rows with a missing value fail a filter"""
+    if period not in STANDARD_PERIODS:
+        raise ValueError(f"Unknown period: {period}")
+    if sort is not None and sort not in SCREEN_COLUMNS:
+        raise ValueError(f"Unknown sort column: {sort}")
+
+    result = table[table['period'] == period]
+    for expression in where or []:
+        column, op, value = parse_filter(expression)
+        values = result[column]
+        if op == '~':
+            mask = values.astype(str).str.contains(str(value), case=False, regex=False)
+        elif isinstance(value, float):
+            mask = FILTER_OPERATORS[op](pd.to_numeric(values, errors='coerce'), value)
+        else:
+            mask = values.notna() & FILTER_OPERATORS[op](values.astype(str), value)
+        result = result[mask.fillna(False).astype(bool)]
+
+    if sort is not None:
+        result = result.sort_values(sort, ascending=ascending, na_position='last', kind='mergesort')
+    if limit is not None:
+        result = result.head(limit)
+    return result.set_index('fund_name')
+
+
+class FundScreen:
+    """Per-period metric table for every fund, persisted and refreshed only where prices changed"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, SCREEN_FILE)
+        self.as_of = None
+        self.fund_versions = {}
+        self.table = pd.DataFrame(columns=SCREEN_COLUMNS)
+        self._load()
+
+    def _load(self):
+        """Load the saved table, starting empty if it is missing or unreadable"""
+        if not os.path.exists(self.path):
+            return
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') != SCREEN_FORMAT_VERSION:
+                return
+            self.table = pd.DataFrame(data['rows'], columns=SCREEN_COLUMNS)
+            self.as_of = data['as_of']
+            self.fund_versions = data['funds']
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not load screen metrics {self.path}: {e}")
+
+    def save(self):
+        """Write the table atomically"""
+        rows = self.table.astype(object).where(self.table.notna(), None).to_dict('records')
+        data = {'version': SCREEN_FORMAT_VERSION, 'as_of': self.as_of, 'funds': self.fund_versions, 'rows': rows}
+        atomic_write_bytes(self.path, json.dumps(data, ensure_ascii=False).encode('utf-8'))
+
+    def refresh(self, store: PricePanelStore, as_of: str = None) -> List[str]:
+        """Recompute the funds whose prices changed (all funds if as_of moved); returns them"""
+        panel = store.read_range(end_date=as_of)
+        panel = panel.loc[:, panel.notna().any()]
+        if panel.empty:
+            return []
+        as_of = as_of or panel.index.max().strftime('%Y-%m-%d')
+
+        days = panel.index.values.astype('datetime64[D]').astype(np.int64)
+        versions = {}
+        for fund_name in panel.columns:
+            column = panel[fund_name].to_numpy()
+            valued = ~np.isnan(column)
+            versions[fund_name] = series_version(days[valued], column[valued])
+
+        if as_of != self.as_of:
+            changed = list(panel.columns)
+        else:
+            changed = [fund for fund in panel.columns if self.fund_versions.get(fund) != versions[fund]]
+        removed = set(self.fund_versions) - set(versions)
+        if not changed and not removed:
+            return []
+
+        frames = [self.table[~self.table['fund_name'].isin(set(changed) | removed)]]
+        for period in STANDARD_PERIODS:
+            start_date, end_date = resolve_period(period, as_of, None)
+            window = panel[changed].loc[start_date:end_date]
+            if window.empty:
+                # Period lies after as_of (e.g. crisis_2022 screened as of 2021): no rows for it
+                continue
+            metrics = compute_universe_metrics(window).reset_index()
+            metrics.insert(0, 'period', period)
+            metrics.insert(2, 'period_start', start_date)
+            metrics.insert(3, 'period_end', end_date)
+            frames.append(metrics)
+
+        table = pd.concat([frame for frame in frames if not frame.empty] or [frames[0]], ignore_index=True)
+        table['period'] = pd.Categorical(table['period'], categories=STANDARD_PERIODS, ordered=True)
+        table = table.sort_values(['period', 'fund_name'], kind='mergesort')
+        self.table = table.astype({'period': str})[SCREEN_COLUMNS].reset_index(drop=True)
+        self.as_of = as_of
+        self.fund_versions = versions
+        self.save()
+        return changed
+
+    def query(self, period: str, where: List[str] = None, sort: str = None, ascending: bool = False,
+              limit: int = None) -> pd.DataFrame:
+        """Screen one period of the precomputed table"""
+        return screen(self.table, period, where, sort, ascending, limit)
+
+
+def main():
+    """Main function"""
+    parser = argparse.ArgumentParser(
+        description="CAL Fund Screen - filter and rank funds by precomputed metrics",
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog=f"""
+Periods: {', '.join(STANDARD_PERIODS)}
+Columns: {', '.join(METRIC_COLUMNS)}
+Filters: 'column op value' with op one of < <= > >= == != (or ~ for case-insensitive
+         contains); repeat --where to combine filters (all must match).
+Percent columns: total_return, cagr, volatility, max_drawdown.
+        """
+    )
+    parser.add_argument('--period', default='1y', choices=STANDARD_PERIODS, help='Period to screen (default: 1y)')
+    parser.add_argument('--where', action='append', help="Filter, e.g. 'volatility < 10' (repeatable)")
+    parser.add_argument('--sort', choices=SCREEN_COLUMNS, help='Column to rank by (descending unless --ascending)')
+    parser.add_argument('--ascending', action='store_true', help='Sort smallest first')
+    parser.add_argument('--limit', type=int, help='Number of funds to show')
+    parser.add_argument('--columns', nargs='+', choices=METRIC_COLUMNS,
+                        default=['total_return', 'cagr', 'volatility', 'sharpe', 'max_drawdown'],
+                        help='Columns to show (default: total_return cagr volatility sharpe max_drawdown)')
+    parser.add_argument('--as-of', help='End date for trailing periods (YYYY-MM-DD, default: latest stored date)')
+    parser.add_argument('--output', '-o', help='Also write the result to this CSV file')
+    parser.add_argument('--cache-dir', default=DEFAULT_CACHE_DIR,
+                        help=f'Cache directory (default: {DEFAULT_CACHE_DIR})')
+
+    args = parser.parse_args()
+
+    print("CAL Fund Screen")
+    print("="*50)
+
+    store = open_price_store(args.cache_dir)
+    if not store.fund_names:
+        print("❌ No fund data found - run 'python cal_fund_extractor.py init' first")
+        return
+
+    fund_screen = FundScreen(args.cache_dir)
+    refreshed = fund_screen.refresh(store, args.as_of)
+    if refreshed:
+        print(f"🔄 Recomputed metrics for {len(refreshed)} funds (as of {fund_screen.as_of})")
+    else:
+        print(f"✅ Metrics up to date (as of {fund_screen.as_of})")
+
+    try:
+        result = fund_screen.query(args.period, args.where, args.sort, args.ascending, args.limit)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return
+
+    columns = list(dict.fromkeys(([args.sort] if args.sort in METRIC_COLUMNS else []) + args.columns))
+    print(f"\n{len(result)} funds - {args.period}\n")
+    print(f"{'Fund':<50}" + "".join(f" {column[:14]:>14}" for column in columns))
+    print("-" * (50 + 15 * len(columns)))
+    for fund_name, row in result.iterrows():
+        cells = "".join(f" {row[column]:>14.2f}" if isinstance(row[column], (int, float)) and not pd.isna(row[column])
+                        else f" {'-' if pd.isna(row[column]) else str(row[column]):>14}" for column in columns)
+        print(f"{fund_name[:50]:<50}{cells}")
+
+    if args.output:
+        atomic_write_bytes(args.output, result[['period', 'period_start', 'period_end'] + METRIC_COLUMNS]
+                           .round(4).to_csv().encode('utf-8'))
+        print(f"\n📁 {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,407 @@
+"""
+CAL Fund Storage
+
+Persistence helpers for the per-fund price files written by CALFundExtractor.
+
+Components:
+1. PriceManifest - per-fund summary (date range, row count, size/mtime, last fetch)
+   recorded for every CSV save and written once per batch, so startup and status views
+   never parse price data
+2. PricePanelStore - one date x fund price panel (NumPy .npz) with range reads, appends
+   of new dates and per-fund projection; per-fund CSVs are imported from and exported to it
+3. CSV writers - every write lands via temp file + rename, so the png_updater.py monitor
+   never sees a half-written file; tail appends copy the existing bytes unparsed and add
+   only the new rows, so saving new dates never parses or re-serializes the price data
+"""
+
+import io
+import os
+import glob
+import json
+import shutil
+import tempfile
+import threading
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from fund_cache import DEFAULT_CACHE_DIR, FundCatalog, atomic_write_bytes
+
+# Per-fund CSV files written by CALFundExtractor
+CSV_PATTERN = "cal_fund_data_*.csv"
+
+
+def get_csv_filename(fund_name: str) -> str:
+    """Get the per-fund CSV filename used throughout the tool"""
+    return f'cal_fund_data_{fund_name.replace(" ", "_").replace("/", "_")}.csv'
+
+
+def write_csv_atomic(df: pd.DataFrame, csv_filename: str):
+    """Write a Date/OLD_PRICE frame as a complete CSV file"""
+    atomic_write_bytes(csv_filename, df.to_csv(index=False).encode('utf-8'))
+
+
+def append_csv_rows(df: pd.DataFrame, csv_filename: str):
+    """Append rows to a copy of an existing CSV and rename it over the original, without parsing it"""
+    rows = df.to_csv(index=False, header=False).encode('utf-8')
+    directory = os.path.dirname(os.path.abspath(csv_filename))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.tmp_', suffix=os.path.basename(csv_filename))
+    try:
+        with os.fdopen(fd, 'wb') as f, open(csv_filename, 'rb') as source:
+            if source.seek(0, os.SEEK_END) > 0:
+                source.seek(-1, os.SEEK_END)
+                if source.read(1) != b'\n':
+                    rows = b'\n' + rows
+            source.seek(0)
+            shutil.copyfileobj(source, f)
+            f.write(rows)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, csv_filename)
+    except Exception:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class PriceManifest:
+    """Per-fund summary of the price CSV files; record() batches, save() writes atomically"""
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, 'price_manifest.json')
+        self._lock = threading.Lock()
+        self._dirty = False
+        self._entries = self._load()
+
+    def _load(self) -> Dict[str, Dict]:
+        """Load entries as {fund: {...summary...}}"""
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                return json.load(f).get('funds', {})
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not read price manifest {self.path}: {e}")
+            return {}
+
+    def save(self):
+        """Persist recorded summaries atomically if any changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+            payload = json.dumps({'version': 1, 'funds': self._entries}, indent=1, sort_keys=True)
+            atomic_write_bytes(self.path, payload.encode('utf-8'))
+            self._dirty = False
+
+    def record(self, fund_name: str, csv_filename: str, min_date: str, max_date: str, row_count: int,
+               last_fetch: Optional[str] = None):
+        """Record the summary of a just-written CSV file (persisted by save())"""
+        stat = os.stat(csv_filename)
+        with self._lock:
+            previous = self._entries.get(fund_name, {})
+            self._entries[fund_name] = {
+                'csv_filename': csv_filename,
+                'min_date': min_date,
+                'max_date': max_date,
+                'row_count': int(row_count),
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'last_fetch': last_fetch or previous.get('last_fetch'),
+                'updated_at': datetime.now().isoformat(timespec='seconds')
+            }
+            self._dirty = True
+
+    def get(self, fund_name: str, csv_filename: str = None) -> Optional[Dict]:
+        """Return the summary for a fund if it still matches the file on disk (size + mtime)"""
+        entry = self._entries.get(fund_name)
+        if entry is None:
+            return None
+
+        csv_filename = csv_filename or entry['csv_filename']
+        try:
+            stat = os.stat(csv_filename)
+        except OSError:
+            return None
+
+        if stat.st_size != entry.get('size') or stat.st_mtime_ns != entry.get('mtime_ns'):
+            return None
+        return dict(entry)
+
+    def find_by_filename(self, csv_filename: str) -> Optional[Dict]:
+        """Return the valid summary for a CSV filename, including its fund name"""
+        target = os.path.basename(csv_filename)
+        for fund_name, entry in self._entries.items():
+            if os.path.basename(entry.get('csv_filename', '')) == target:
+                valid = self.get(fund_name, csv_filename)
+                if valid is not None:
+                    valid['fund_name'] = fund_name
+                return valid
+        return None
+
+    def forget(self, fund_name: str):
+        """Drop a fund's summary (persisted by save())"""
+        with self._lock:
+            if self._entries.pop(fund_name, None) is not None:
+                self._dirty = True
+
+    def all(self) -> Dict[str, Dict]:
+        """Return every recorded summary without validating it against disk"""
+        return {fund_name: dict(entry) for fund_name, entry in self._entries.items()}
+
+
+def to_epoch_days(dates: Iterable[str]) -> np.ndarray:
+    """Convert YYYY-MM-DD strings to int64 days since 1970-01-01"""
+    return np.array(list(dates), dtype='datetime64[D]').astype(np.int64)
+
+
+def from_epoch_days(days: np.ndarray) -> List[str]:
+    """Convert days since 1970-01-01 back to YYYY-MM-DD strings"""
+    return list(np.datetime_as_string(np.asarray(days, dtype=np.int64).astype('datetime64[D]'), unit='D'))
+
+
+class PricePanelStore:
+    """Wide date x fund price panel kept in a single .npz file
+    
+    Dates are sorted epoch days, one row per valuedate; each fund is a float64 column
+    with NaN where the fund has no price on that date.
+    """
+
+    def __init__(self, cache_dir: str = DEFAULT_CACHE_DIR):
+        self.path = os.path.join(cache_dir, 'price_panel.npz')
+        self._lock = threading.RLock()
+        self._dirty = False
+        self._dates = np.empty(0, dtype=np.int64)
+        self._funds: List[str] = []
+        self._prices = np.empty((0, 0), dtype=np.float64)
+        self._load()
+
+    def _load(self):
+        """Load the panel from disk if it exists"""
+        if not os.path.exists(self.path):
+            return
+
+        try:
+            with np.load(self.path, allow_pickle=False) as panel:
+                self._dates = panel['dates'].astype(np.int64)
+                self._funds = [str(fund) for fund in panel['funds']]
+                self._prices = panel['prices'].astype(np.float64).reshape(len(self._dates), len(self._funds))
+        except (OSError, ValueError, KeyError) as e:
+            print(f"Warning: Could not read price store {self.path}: {e}")
+            self._dates = np.empty(0, dtype=np.int64)
+            self._funds = []
+            self._prices = np.empty((0, 0), dtype=np.float64)
+
+    @property
+    def fund_names(self) -> List[str]:
+        return list(self._funds)
+
+    @property
+    def date_count(self) -> int:
+        return len(self._dates)
+
+    def has_fund(self, fund_name: str) -> bool:
+        """True if the panel has a column for the fund"""
+        return fund_name in self._funds
+
+    def _row_slice(self, start_date: str = None, end_date: str = None) -> slice:
+        """Rows whose date lies within [start_date, end_date]"""
+        lo = np.searchsorted(self._dates, to_epoch_days([start_date])[0], 'left') if start_date else 0
+        hi = np.searchsorted(self._dates, to_epoch_days([end_date])[0], 'right') if end_date else len(self._dates)
+        return slice(lo, hi)
+
+    def upsert(self, fund_prices: Dict[str, Dict[str, float]]) -> Dict[str, np.ndarray]:
+        """Write {fund: {date: price}} into the panel, adding dates and funds as needed
+        
+        Returns {fund: sorted epoch days whose price actually changed}.
+        """
+        with self._lock:
+            new_funds = [fund for fund in fund_prices if fund not in self._funds]
+            if new_funds:
+                self._funds.extend(new_funds)
+                self._prices = np.hstack([self._prices,
+                                          np.full((len(self._dates), len(new_funds)), np.nan)])
+
+            incoming = set()
+            for price_data in fund_prices.values():
+                incoming.update(price_data)
+            incoming_days = np.unique(to_epoch_days(incoming)) if incoming else np.empty(0, dtype=np.int64)
+            new_days = np.setdiff1d(incoming_days, self._dates, assume_unique=True)
+
+            if len(new_days):
+                if not len(self._dates) or new_days[0] > self._dates[-1]:
+                    # Common case: only dates after the current tail, so rows are appended
+                    merged = np.concatenate([self._dates, new_days])
+                    prices = np.vstack([self._prices, np.full((len(new_days), len(self._funds)), np.nan)])
+                else:
+                    merged = np.union1d(self._dates, new_days)
+                    prices = np.full((len(merged), len(self._funds)), np.nan)
+                    prices[np.searchsorted(merged, self._dates)] = self._prices
+                self._dates, self._prices = merged, prices
+
+            changed = {}
+            for fund_name, price_data in fund_prices.items():
+                if not price_data:
+                    changed[fund_name] = np.empty(0, dtype=np.int64)
+                    continue
+                days = to_epoch_days(price_data.keys())
+                rows = np.searchsorted(self._dates, days)
+                column = self._funds.index(fund_name)
+                values = np.fromiter(price_data.values(), dtype=np.float64, count=len(price_data))
+                previous = self._prices[rows, column]
+                differs = ~((previous == values) | (np.isnan(previous) & np.isnan(values)))
+                self._prices[rows, column] = values
+                changed[fund_name] = np.sort(days[differs])
+
+            if new_funds or len(new_days) or any(len(days) for days in changed.values()):
+                self._dirty = True
+            return changed
+
+    def read_range(self, start_date: str = None, end_date: str = None, funds: List[str] = None) -> pd.DataFrame:
+        """Return the panel for [start_date, end_date] as a DataFrame indexed by date, one column per fund"""
+        with self._lock:
+            rows = self._row_slice(start_date, end_date)
+            funds = [fund for fund in (funds or self._funds) if fund in self._funds]
+            columns = [self._funds.index(fund) for fund in funds]
+            index = pd.DatetimeIndex(self._dates[rows].astype('datetime64[D]'), name='Date')
+            return pd.DataFrame(self._prices[rows][:, columns], index=index, columns=funds)
+
+    def fund_frame(self, fund_name: str, start_date: str = None, end_date: str = None) -> pd.DataFrame:
+        """Return one fund's valued dates in the CSV layout (Date, OLD_PRICE)"""
+        with self._lock:
+            if fund_name not in self._funds:
+                return pd.DataFrame({'Date': pd.to_datetime([]), 'OLD_PRICE': []})
+
+            rows = self._row_slice(start_date, end_date)
+            column = self._prices[rows, self._funds.index(fund_name)]
+            valued = ~np.isnan(column)
+            return pd.DataFrame({
+                'Date': pd.to_datetime(self._dates[rows][valued].astype('datetime64[D]')),
+                'OLD_PRICE': column[valued]
+            })
+
+    def fund_prices(self, fund_name: str, start_date: str = None, end_date: str = None) -> Dict[str, float]:
+        """Return one fund's prices as {date: price}"""
+        df = self.fund_frame(fund_name, start_date, end_date)
+        return dict(zip(df['Date'].dt.strftime('%Y-%m-%d'), df['OLD_PRICE'].tolist()))
+
+    def import_csv(self, csv_filename: str, fund_name: str, replace: bool = False) -> int:
+        """Import a per-fund CSV (Date, OLD_PRICE) into the panel; returns rows imported
+        
+        By default the rows are merged into the fund's column. With replace, the CSV becomes the
+        fund's whole history, so rows deleted from an edited CSV are dropped from the panel too.
+        """
+        df = pd.read_csv(csv_filename)
+        if 'Date' not in df.columns or 'OLD_PRICE' not in df.columns:
+            raise ValueError(f"Invalid CSV format in {csv_filename}")
+
+        df = df.dropna(subset=['Date', 'OLD_PRICE'])
+        dates = pd.to_datetime(df['Date']).dt.strftime('%Y-%m-%d')
+        with self._lock:
+            if replace and fund_name in self._funds:
+                column = self._funds.index(fund_name)
+                if not np.isnan(self._prices[:, column]).all():
+                    self._prices[:, column] = np.nan
+                    self._dirty = True
+            self.upsert({fund_name: dict(zip(dates, df['OLD_PRICE'].astype(float)))})
+        return len(df)
+
+    def merge_fund(self, source: str, target: str):
+        """Fold the source column into target (filling only target's missing dates) and drop it"""
+        with self._lock:
+            if source not in self._funds or source == target:
+                return
+            column = self._funds.index(source)
+            if target not in self._funds:
+                self._funds[column] = target
+            else:
+                target_column = self._funds.index(target)
+                gaps = np.isnan(self._prices[:, target_column])
+                self._prices[gaps, target_column] = self._prices[gaps, column]
+                self._prices = np.delete(self._prices, column, axis=1)
+                del self._funds[column]
+            self._dirty = True
+
+    def export_csv(self, fund_name: str, csv_filename: str, after_date: str = None) -> pd.DataFrame:
+        """Write one fund's column out as a per-fund CSV and return the exported frame
+        
+        With after_date, only rows dated after it are appended to the existing file.
+        """
+        if after_date is None:
+            df = self.fund_frame(fund_name)
+            write_csv_atomic(df, csv_filename)
+            return df
+
+        df = self.fund_frame(fund_name)
+        df = df[df['Date'] > pd.Timestamp(after_date)]
+        if not df.empty:
+            append_csv_rows(df, csv_filename)
+        return df
+
+    def save(self):
+        """Persist the panel atomically if it changed"""
+        with self._lock:
+            if not self._dirty:
+                return
+
+            buffer = io.BytesIO()
+            np.savez(buffer, dates=self._dates, funds=np.array(self._funds, dtype=str), prices=self._prices)
+            atomic_write_bytes(self.path, buffer.getvalue())
+            self._dirty = False
+
+
+def fund_name_for_csv(csv_filename: str, manifest: PriceManifest = None, known_funds: Iterable[str] = ()) -> str:
+    """Fund name for a per-fund CSV
+    
+    The filename replaces spaces and slashes with underscores, so it cannot be reversed on
+    its own: known fund names (e.g. the fund catalog) that map to the filename come first,
+    with the manifest breaking ties, and only then are the underscores turned into spaces.
+    """
+    target = os.path.basename(csv_filename)
+    candidates = [fund for fund in known_funds if get_csv_filename(fund) == target]
+    summary = manifest.find_by_filename(csv_filename) if manifest is not None else None
+    if summary is not None and (not candidates or summary['fund_name'] in candidates):
+        return summary['fund_name']
+    if candidates:
+        return candidates[0]
+    return target[len("cal_fund_data_"):-len(".csv")].replace("_", " ")
+
+
+def merge_orphaned_funds(store: PricePanelStore, manifest: PriceManifest, csv_filename: str,
+                         fund_name: str) -> List[str]:
+    """Merge panel columns stored for the same CSV under another name into fund_name; returns them"""
+    target = os.path.basename(csv_filename)
+    orphans = [fund for fund in store.fund_names if fund != fund_name and get_csv_filename(fund) == target]
+    for orphan in orphans:
+        store.merge_fund(orphan, fund_name)
+        manifest.forget(orphan)
+    return orphans
+
+
+def open_price_store(cache_dir: str = DEFAULT_CACHE_DIR, csv_dir: str = ".") -> PricePanelStore:
+    """Open the price store, first importing per-fund CSVs it lacks or that changed outside the tool"""
+    manifest = PriceManifest(cache_dir)
+    store = PricePanelStore(cache_dir)
+    known_funds = FundCatalog(cache_dir).all_fund_names()
+
+    for csv_filename in sorted(glob.glob(os.path.join(csv_dir, CSV_PATTERN))):
+        fund_name = fund_name_for_csv(csv_filename, manifest, known_funds)
+        # Columns imported under a name guessed from the filename before the real one was known
+        merge_orphaned_funds(store, manifest, csv_filename, fund_name)
+        if store.has_fund(fund_name) and manifest.get(fund_name, csv_filename) is not None:
+            continue
+        try:
+            # The CSV on disk is the truth for a fund that changed outside the tool
+            store.import_csv(csv_filename, fund_name, replace=True)
+            df = store.fund_frame(fund_name)
+            if not df.empty:
+                manifest.record(fund_name, csv_filename, df['Date'].min().strftime("%Y-%m-%d"),
+                                df['Date'].max().strftime("%Y-%m-%d"), len(df))
+        except (OSError, ValueError) as e:
+            print(f"Warning: Could not import {csv_filename}: {e}")
+
+    store.save()
+    manifest.save()
+    return store
@@ -10,8 +10,11 @@ This script can be used to:
 
 Usage:
     python png_updater.py                    # Update all CSV files
+    python png_updater.py --all --workers 4  # Render on 4 worker processes
+    python png_updater.py --all --force      # Re-render even unchanged PNGs
     python png_updater.py --file filename.csv  # Update specific file
     python png_updater.py --monitor          # Monitor for changes
+    python png_updater.py --monitor --quiet-period 5  # Render once a file is quiet for 5s
     python png_updater.py --help             # Show help
 """
 
@@ -22,12 +25,18 @@ import time
 import glob
 from datetime import datetime
 from pathlib import Path
-import pandas as pd
-import matplotlib.pyplot as plt
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional
 import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler
+from fund_cache import FundCatalog
+from fund_storage import PriceManifest, fund_name_for_csv
+from fund_render import (RenderManifest, create_render_pool, csv_stat, load_price_series, png_filename_for_csv,
+                         render_fingerprint, render_pngs)
+
+# Seconds a CSV must go without further changes before monitor mode renders it
+DEFAULT_QUIET_PERIOD = 2.0
 
 class CALFundPNGUpdater:
     """Standalone PNG updater for CAL Fund CSV files"""
@@ -35,69 +44,33 @@ class CALFundPNGUpdater:
     def __init__(self):
         self.csv_pattern = "cal_fund_data_*.csv"
         self.png_pattern = "cal_fund_price_trend_*.png"
+        self.price_manifest = PriceManifest()
+        self.known_funds = FundCatalog().all_fund_names()
+        self.render_manifest = RenderManifest()
         
     def get_fund_name_from_filename(self, csv_filename: str) -> str:
         """Extract fund name from CSV filename"""
-        # Remove path and extension
-        filename = os.path.basename(csv_filename)
-        if filename.startswith("cal_fund_data_"):
-            fund_name = filename[14:-4]  # Remove "cal_fund_data_" and ".csv"
-            # Convert underscores back to spaces and slashes
-            fund_name = fund_name.replace("_", " ").replace("  ", "/")
-            return fund_name
-        return "Unknown Fund"
+        # The fund catalog and price manifest know the real fund name (the one the extractor renders with)
+        return fund_name_for_csv(csv_filename, self.price_manifest, self.known_funds)
     
-    def generate_png_from_csv(self, csv_filename: str) -> bool:
-        """Generate PNG visualization from CSV file"""
+    def generate_png_from_csv(self, csv_filename: str, force: bool = False,
+                              pool: ProcessPoolExecutor = None) -> bool:
+        """Generate PNG visualization from CSV file, skipping it if the plotted data is unchanged"""
         if not os.path.exists(csv_filename):
             print(f"❌ CSV file not found: {csv_filename}")
             return False
         
-        try:
-            # Read CSV data
-            df = pd.read_csv(csv_filename)
-            if 'Date' not in df.columns or 'OLD_PRICE' not in df.columns:
-                print(f"❌ Invalid CSV format in {csv_filename}")
-                return False
-            
-            df['Date'] = pd.to_datetime(df['Date'])
-            df = df.sort_values('Date')
-            
-            if len(df) == 0:
-                print(f"❌ No data to visualize in {csv_filename}")
-                return False
-            
-            # Get fund name
-            fund_name = self.get_fund_name_from_filename(csv_filename)
-            
-            # Create the plot
-            plt.figure(figsize=(12, 8))
-            plt.plot(df['Date'], df['OLD_PRICE'], marker='o', linewidth=2, markersize=4, alpha=0.7, color='#1f77b4')
-            
-            # Set up the plot
-            plt.title(f'{fund_name}\nPrice Trend Analysis', fontsize=14, fontweight='bold')
-            plt.xlabel('Date', fontsize=12)
-            plt.ylabel('Price (LKR)', fontsize=12)
-            plt.grid(True, alpha=0.3)
-            
-            # Format x-axis dates
-            plt.xticks(rotation=45)
-            
-            # Generate PNG filename
-            png_filename = csv_filename.replace('.csv', '.png').replace('cal_fund_data_', 'cal_fund_price_trend_')
-            
-            # Save as high-resolution PNG
-            plt.tight_layout()
-            plt.savefig(png_filename, dpi=300, bbox_inches='tight')
-            plt.close()  # Close the figure to free memory
-            
-            print(f"✅ PNG visualization saved to '{png_filename}'")
-            return True
-            
-        except Exception as e:
-            print(f"❌ Error generating PNG from {csv_filename}: {e}")
-            plt.close()  # Ensure figure is closed even on error
+        render = render_pngs([(csv_filename, self.get_fund_name_from_filename(csv_filename))], 1,
+                             manifest=self.render_manifest, force=force, pool=pool)[0]
+        if render['error'] is not None:
+            print(f"❌ Error generating PNG from {csv_filename}: {render['error']}")
             return False
+        
+        if render['skipped']:
+            print(f"⏭️ PNG '{render['png']}' is up to date (data unchanged)")
+        else:
+            print(f"✅ PNG visualization saved to '{render['png']}'")
+        return True
     
     def find_csv_files(self) -> List[str]:
         """Find all CAL fund CSV files in current directory"""
@@ -109,8 +82,8 @@ class CALFundPNGUpdater:
         png_files = glob.glob(self.png_pattern)
         return sorted(png_files)
     
-    def update_all_csv_files(self) -> Dict[str, bool]:
-        """Update PNG files for all CSV files"""
+    def update_all_csv_files(self, workers: int = None, force: bool = False) -> Dict[str, bool]:
+        """Update PNG files for all CSV files whose data changed, rendering them in parallel on a process pool"""
         csv_files = self.find_csv_files()
         
         if not csv_files:
@@ -127,30 +100,40 @@ class CALFundPNGUpdater:
         
         results = {}
         successful = 0
+        skipped = 0
         failed = 0
         
-        for i, csv_file in enumerate(csv_files, 1):
-            fund_name = self.get_fund_name_from_filename(csv_file)
-            print(f"\n[{i}/{len(csv_files)}] Processing: {fund_name}")
-            print(f"   📁 CSV: {csv_file}")
+        started = time.perf_counter()
+        jobs = [(csv_file, self.get_fund_name_from_filename(csv_file)) for csv_file in csv_files]
+        for i, render in enumerate(render_pngs(jobs, workers, manifest=self.render_manifest, force=force), 1):
+            print(f"\n[{i}/{len(csv_files)}] {render['fund_name']}")
+            print(f"   📁 CSV: {render['csv']}")
             
-            success = self.generate_png_from_csv(csv_file)
-            results[csv_file] = success
+            success = render['error'] is None
+            results[render['csv']] = success
             
-            if success:
+            if success and render['skipped']:
+                skipped += 1
+                print(f"   ⏭️ PNG: {render['png']} (unchanged, skipped)")
+            elif success:
                 successful += 1
+                print(f"   ✅ PNG: {render['png']} ({render['seconds']:.2f}s)")
             else:
                 failed += 1
+                print(f"   ❌ {render['error']}")
+        elapsed = time.perf_counter() - started
         
         print("\n" + "="*60)
         print(f"📊 Summary:")
         print(f"   ✅ Successful: {successful}")
+        print(f"   ⏭️ Unchanged (skipped): {skipped}")
         print(f"   ❌ Failed: {failed}")
         print(f"   📁 Total processed: {len(csv_files)}")
+        print(f"   ⏱️ Rendered in {elapsed:.2f}s")
         
         return results
     
-    def update_specific_file(self, csv_filename: str) -> bool:
+    def update_specific_file(self, csv_filename: str, force: bool = False) -> bool:
         """Update PNG file for a specific CSV file"""
         if not csv_filename.endswith('.csv'):
             csv_filename += '.csv'
@@ -159,7 +142,7 @@ class CALFundPNGUpdater:
         print(f"🔄 Processing: {fund_name}")
         print(f"   📁 CSV: {csv_filename}")
         
-        return self.generate_png_from_csv(csv_filename)
+        return self.generate_png_from_csv(csv_filename, force)
     
     def get_file_status(self) -> Dict[str, Dict[str, str]]:
         """Get status of CSV and PNG files"""
@@ -170,26 +153,30 @@ class CALFundPNGUpdater:
         
         for csv_file in csv_files:
             fund_name = self.get_fund_name_from_filename(csv_file)
-            png_file = csv_file.replace('.csv', '.png').replace('cal_fund_data_', 'cal_fund_price_trend_')
+            png_file = png_filename_for_csv(csv_file)
             
             csv_mtime = datetime.fromtimestamp(os.path.getmtime(csv_file))
             
             if os.path.exists(png_file):
                 png_mtime = datetime.fromtimestamp(os.path.getmtime(png_file))
-                if csv_mtime > png_mtime:
-                    status[csv_file] = {
-                        'fund_name': fund_name,
-                        'status': 'needs_update',
-                        'csv_modified': csv_mtime.strftime('%Y-%m-%d %H:%M:%S'),
-                        'png_modified': png_mtime.strftime('%Y-%m-%d %H:%M:%S')
-                    }
-                else:
-                    status[csv_file] = {
-                        'fund_name': fund_name,
-                        'status': 'up_to_date',
-                        'csv_modified': csv_mtime.strftime('%Y-%m-%d %H:%M:%S'),
-                        'png_modified': png_mtime.strftime('%Y-%m-%d %H:%M:%S')
-                    }
+                # Stale only if the PNG was not rendered from the CSV's current data (mtime alone
+                # changes on every rewrite); the CSV is only re-read if its size or mtime moved
+                current = self.render_manifest.csv_unchanged(png_file, csv_file)
+                if not current:
+                    try:
+                        stat = csv_stat(csv_file)
+                        fingerprint = render_fingerprint(load_price_series(csv_file), fund_name)
+                        current = self.render_manifest.is_current(png_file, fingerprint)
+                    except (OSError, ValueError):
+                        current = False
+                    if current:
+                        self.render_manifest.record_csv_stat(png_file, stat)
+                status[csv_file] = {
+                    'fund_name': fund_name,
+                    'status': 'up_to_date' if current else 'needs_update',
+                    'csv_modified': csv_mtime.strftime('%Y-%m-%d %H:%M:%S'),
+                    'png_modified': png_mtime.strftime('%Y-%m-%d %H:%M:%S')
+                }
             else:
                 status[csv_file] = {
                     'fund_name': fund_name,
@@ -197,7 +184,17 @@ class CALFundPNGUpdater:
                     'csv_modified': csv_mtime.strftime('%Y-%m-%d %H:%M:%S'),
                     'png_modified': 'N/A'
                 }
+            
+            # Date range and row count come from the price manifest, without reading the CSV
+            summary = self.price_manifest.find_by_filename(csv_file)
+            if summary is not None:
+                status[csv_file]['fund_name'] = summary['fund_name']
+                status[csv_file]['data_range'] = f"{summary['row_count']} rows, {summary['min_date']} to {summary['max_date']}"
         
+        try:
+            self.render_manifest.save()
+        except OSError as e:
+            print(f"Warning: Could not save render manifest {self.render_manifest.path}: {e}")
         return status
     
     def show_status(self):
@@ -230,6 +227,8 @@ class CALFundPNGUpdater:
                 print(f"      📁 CSV: {csv_file}")
                 print(f"      📅 CSV modified: {info['csv_modified']}")
                 print(f"      📅 PNG modified: {info['png_modified']}")
+                if 'data_range' in info:
+                    print(f"      📈 Data: {info['data_range']}")
                 print()
         
         if missing_png:
@@ -238,6 +237,8 @@ class CALFundPNGUpdater:
                 print(f"   📊 {info['fund_name']}")
                 print(f"      📁 CSV: {csv_file}")
                 print(f"      📅 CSV modified: {info['csv_modified']}")
+                if 'data_range' in info:
+                    print(f"      📈 Data: {info['data_range']}")
                 print()
         
         if up_to_date:
@@ -246,56 +247,123 @@ class CALFundPNGUpdater:
                 print(f"   📊 {info['fund_name']}")
                 print(f"      📁 CSV: {csv_file}")
                 print(f"      📅 Last modified: {info['csv_modified']}")
+                if 'data_range' in info:
+                    print(f"      📈 Data: {info['data_range']}")
                 print()
 
 
+class RenderQueue:
+    """Coalescing render queue: each path renders once, with its latest content, after a quiet period
+    
+    Every event for a path pushes its deadline back; when the deadline passes the path is handed to
+    a worker. Events arriving while a path is rendering schedule one more render after it finishes.
+    """
+    
+    def __init__(self, render: Callable[[str], bool], quiet_period: float = DEFAULT_QUIET_PERIOD,
+                 workers: int = None):
+        self.render = render
+        self.quiet_period = quiet_period
+        self._deadlines: Dict[str, float] = {}
+        self._rendering = set()
+        self._stopped = False
+        self._condition = threading.Condition()
+        self._workers = ThreadPoolExecutor(max_workers=workers or os.cpu_count(), thread_name_prefix='png-render')
+        self._scheduler = threading.Thread(target=self._schedule, name='png-render-scheduler', daemon=True)
+        self._scheduler.start()
+    
+    def submit(self, path: str):
+        """Queue a render of path, replacing any pending render of it"""
+        with self._condition:
+            self._deadlines[os.path.normpath(path)] = time.monotonic() + self.quiet_period
+            self._condition.notify()
+    
+    def _schedule(self):
+        """Hand paths whose quiet period has passed (and are not already rendering) to the workers"""
+        with self._condition:
+            while not self._stopped:
+                now = time.monotonic()
+                ready = [path for path, deadline in self._deadlines.items()
+                         if deadline <= now and path not in self._rendering]
+                for path in ready:
+                    del self._deadlines[path]
+                    self._rendering.add(path)
+                    self._workers.submit(self._render, path)
+                
+                waiting = [deadline for path, deadline in self._deadlines.items() if path not in self._rendering]
+                self._condition.wait(max(min(waiting) - now, 0.01) if waiting else None)
+    
+    def _render(self, path: str):
+        """Render one path, then let the scheduler pick up any change that arrived meanwhile"""
+        try:
+            self.render(path)
+        except Exception as e:
+            print(f"   ❌ Error rendering {os.path.basename(path)}: {e}")
+        finally:
+            with self._condition:
+                self._rendering.discard(path)
+                self._condition.notify()
+    
+    def stop(self, flush: bool = True):
+        """Stop scheduling; with flush, render still-pending paths now instead of dropping them"""
+        with self._condition:
+            self._stopped = True
+            pending = list(self._deadlines) if flush else []
+            self._deadlines.clear()
+            self._condition.notify()
+        self._scheduler.join()
+        for path in pending:
+            self._workers.submit(self._render, path)
+        self._workers.shutdown(wait=True)
+
+
 class CSVFileHandler(FileSystemEventHandler):
-    """File system event handler for CSV file monitoring"""
+    """File system event handler for CSV file monitoring; changes go to a coalescing render queue"""
     
-    def __init__(self, updater: CALFundPNGUpdater):
+    def __init__(self, updater: CALFundPNGUpdater, queue: RenderQueue):
         self.updater = updater
-        self.last_modified = {}
+        self.queue = queue
     
-    def on_modified(self, event):
-        """Handle file modification events"""
-        if event.is_directory:
-            return
-        
-        file_path = event.src_path
-        
-        # Only process CSV files
+    def _queue_if_fund_csv(self, file_path: str):
+        """Queue a render for CAL fund CSVs (the atomic writer's .tmp_ files are ignored)"""
         if not file_path.endswith('.csv') or not os.path.basename(file_path).startswith('cal_fund_data_'):
             return
-        
-        # Avoid duplicate events (file systems can fire multiple events)
-        current_time = time.time()
-        if file_path in self.last_modified:
-            if current_time - self.last_modified[file_path] < 2:  # 2 second debounce
-                return
-        
-        self.last_modified[file_path] = current_time
-        
-        print(f"\n🔄 Detected change in: {os.path.basename(file_path)}")
-        fund_name = self.updater.get_fund_name_from_filename(file_path)
-        print(f"   📊 Fund: {fund_name}")
-        
-        # Generate PNG
-        success = self.updater.generate_png_from_csv(file_path)
-        if success:
-            print(f"   ✅ PNG updated successfully")
-        else:
-            print(f"   ❌ PNG update failed")
+        self.queue.submit(file_path)
+    
+    def on_modified(self, event):
+        """Handle file modification events"""
+        if not event.is_directory:
+            self._queue_if_fund_csv(event.src_path)
+    
+    def on_created(self, event):
+        """Handle new CSV files"""
+        if not event.is_directory:
+            self._queue_if_fund_csv(event.src_path)
+    
+    def on_moved(self, event):
+        """Handle renames, including temp-file + rename (atomic) writes"""
+        if not event.is_directory:
+            self._queue_if_fund_csv(event.dest_path)
 
 
-def monitor_csv_files(updater: CALFundPNGUpdater):
+def monitor_csv_files(updater: CALFundPNGUpdater, workers: int = None, quiet_period: float = DEFAULT_QUIET_PERIOD):
     """Monitor CSV files for changes and auto-update PNGs"""
     print("🔍 Starting CSV file monitoring...")
     print("   📁 Monitoring current directory for CAL fund CSV files")
     print("   🖼️ PNG files will be automatically updated when CSV files change")
+    print(f"   ⏱️ Each file renders once it has been quiet for {quiet_period:g}s")
     print("   ⏹️ Press Ctrl+C to stop monitoring")
     print("="*60)
     
-    event_handler = CSVFileHandler(updater)
+    pool = create_render_pool(workers)
+    
+    def render(file_path: str) -> bool:
+        fund_name = updater.get_fund_name_from_filename(file_path)
+        print(f"\n🔄 Detected change in: {os.path.basename(file_path)}")
+        print(f"   📊 Fund: {fund_name}")
+        return updater.generate_png_from_csv(file_path, pool=pool)
+    
+    queue = RenderQueue(render, quiet_period, workers)
+    event_handler = CSVFileHandler(updater, queue)
     observer = Observer()
     observer.schedule(event_handler, path='.', recursive=False)
     
@@ -308,6 +376,8 @@ def monitor_csv_files(updater: CALFundPNGUpdater):
         observer.stop()
     
     observer.join()
+    queue.stop(flush=True)
+    pool.shutdown(wait=True)
     print("✅ File monitoring stopped")
 
 
@@ -319,8 +389,11 @@ def main():
         epilog="""
 Examples:
   python png_updater.py                    # Update all CSV files
+  python png_updater.py --all -w 4       # Update all files on 4 worker processes
+  python png_updater.py --all --force    # Re-render every PNG, even if unchanged
   python png_updater.py --file fund.csv  # Update specific file
   python png_updater.py --monitor        # Monitor for changes
+  python png_updater.py --monitor --quiet-period 5  # Wait for 5 quiet seconds per file
   python png_updater.py --status         # Show file status
   python png_updater.py --help           # Show this help
         """
@@ -334,6 +407,12 @@ Examples:
                        help='Show status of CSV and PNG files')
     parser.add_argument('--all', '-a', action='store_true',
                        help='Update PNG files for all CSV files')
+    parser.add_argument('--workers', '-w', type=int, default=os.cpu_count(),
+                       help='Render worker processes for --all and --monitor (default: CPU count, 1 = serial for --all)')
+    parser.add_argument('--quiet-period', type=float, default=DEFAULT_QUIET_PERIOD,
+                       help=f'Monitor mode: seconds a CSV must be unchanged before rendering (default: {DEFAULT_QUIET_PERIOD:g})')
+    parser.add_argument('--force', action='store_true',
+                       help='Re-render PNGs even if their data is unchanged')
     
     args = parser.parse_args()
     
@@ -348,17 +427,17 @@ Examples:
         # Check if watchdog is available
         try:
             import watchdog
-            monitor_csv_files(updater)
+            monitor_csv_files(updater, args.workers, args.quiet_period)
         except ImportError:
             print("❌ Error: 'watchdog' package is required for file monitoring")
             print("   Install it with: pip install watchdog")
             sys.exit(1)
     elif args.file:
-        success = updater.update_specific_file(args.file)
+        success = updater.update_specific_file(args.file, args.force)
         sys.exit(0 if success else 1)
     elif args.all or len(sys.argv) == 1:
         # Default behavior: update all files
-        results = updater.update_all_csv_files()
+        results = updater.update_all_csv_files(args.workers, args.force)
         if not results:
             sys.exit(1)
         
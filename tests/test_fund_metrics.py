@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from fund_metrics import METRIC_COLUMNS, compute_universe_metrics
+
+
+def _panel(dates, **funds):
+    return pd.DataFrame(funds, index=pd.DatetimeIndex(pd.to_datetime(dates), name='Date'))
+
+
+def test_empty_window_returns_empty_table():
+    prices = _panel([], **{'Fund A': [], 'Fund B': []})
+
+    metrics = compute_universe_metrics(prices)
+
+    assert metrics.empty
+    assert list(metrics.columns) == METRIC_COLUMNS
+    assert metrics.index.name == 'fund_name'
+
+
+def test_single_observation_has_no_volatility():
+    prices = _panel(['2025-09-01', '2025-09-15'], **{'Fund A': [np.nan, 10.0], 'Fund B': [10.0, 11.0]})
+
+    metrics = compute_universe_metrics(prices)
+
+    assert metrics.loc['Fund A', 'observations'] == 1
+    assert np.isnan(metrics.loc['Fund A', 'volatility'])
+    assert np.isnan(metrics.loc['Fund A', 'sortino'])
+    # One interval: a return but still no sample variance
+    assert np.isnan(metrics.loc['Fund B', 'volatility'])
+    assert metrics.loc['Fund B', 'total_return'] == pytest.approx(10.0)
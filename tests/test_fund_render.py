@@ -0,0 +1,55 @@
+import json
+import os
+
+import pandas as pd
+
+from fund_render import RenderManifest, csv_stat, render_pngs
+
+
+def _write_csv(path, prices):
+    dates = pd.date_range('2025-01-01', periods=len(prices), freq='D')
+    pd.DataFrame({'Date': dates.strftime('%Y-%m-%d'), 'OLD_PRICE': prices}).to_csv(path, index=False)
+
+
+def _saved_entries(cache_dir):
+    with open(os.path.join(cache_dir, 'render_manifest.json'), encoding='utf-8') as f:
+        return json.load(f)['pngs']
+
+
+def test_manifest_saves_keep_entries_from_other_writers(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    first, second = RenderManifest(cache_dir), RenderManifest(cache_dir)
+    for name in ('a.png', 'b.png'):
+        (tmp_path / name).write_bytes(b'png')
+
+    first.record(str(tmp_path / 'a.png'), 'fingerprint-a')
+    second.record(str(tmp_path / 'b.png'), 'fingerprint-b')
+    assert not os.path.exists(os.path.join(cache_dir, 'render_manifest.json'))
+    first.save()
+    second.save()
+
+    entries = _saved_entries(cache_dir)
+    assert {os.path.basename(png) for png in entries} == {'a.png', 'b.png'}
+
+
+def test_render_records_csv_stat_once_per_batch(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    cache_dir = str(tmp_path / 'cache')
+    _write_csv('cal_fund_data_Fund_A.csv', [10.0, 10.5, 11.0])
+    _write_csv('cal_fund_data_Fund_B.csv', [20.0, 19.5])
+    manifest = RenderManifest(cache_dir)
+    jobs = [('cal_fund_data_Fund_A.csv', 'Fund A'), ('cal_fund_data_Fund_B.csv', 'Fund B')]
+
+    results = render_pngs(jobs, workers=1, dpi=20, manifest=manifest)
+
+    assert [result['error'] for result in results] == [None, None]
+    assert len(_saved_entries(cache_dir)) == 2
+    assert manifest.csv_unchanged('cal_fund_price_trend_Fund_A.png', 'cal_fund_data_Fund_A.csv')
+
+    # Rewritten with new data: the stat no longer matches, and the next batch re-renders it
+    _write_csv('cal_fund_data_Fund_A.csv', [10.0, 10.5, 11.0, 11.5])
+    assert not manifest.csv_unchanged('cal_fund_price_trend_Fund_A.png', 'cal_fund_data_Fund_A.csv')
+    results = render_pngs(jobs, workers=1, dpi=20, manifest=manifest)
+    assert [result['skipped'] for result in results] == [False, True]
+    entry = _saved_entries(cache_dir)['cal_fund_price_trend_Fund_A.png']
+    assert [entry['csv_size'], entry['csv_mtime_ns']] == csv_stat('cal_fund_data_Fund_A.csv')
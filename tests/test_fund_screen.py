@@ -0,0 +1,29 @@
+import pandas as pd
+
+from fund_screen import FundScreen
+from fund_storage import PricePanelStore
+
+
+def _store(cache_dir, dates, **funds):
+    store = PricePanelStore(str(cache_dir))
+    store.upsert({fund: dict(zip(dates, prices)) for fund, prices in funds.items()})
+    return store
+
+
+def test_refresh_skips_periods_after_as_of(tmp_path):
+    dates = [d.strftime('%Y-%m-%d') for d in pd.date_range('2020-01-01', '2023-12-31', freq='MS')]
+    store = _store(tmp_path, dates, **{'Fund A': [10.0 + i for i in range(len(dates))],
+                                       'Fund B': [20.0 - 0.1 * i for i in range(len(dates))]})
+    screen = FundScreen(str(tmp_path))
+
+    refreshed = screen.refresh(store, as_of='2021-06-01')
+
+    assert sorted(refreshed) == ['Fund A', 'Fund B']
+    assert screen.as_of == '2021-06-01'
+    assert screen.query('crisis_2022').empty
+    assert screen.query('recovery_2023').empty
+    assert sorted(screen.query('1y').index) == ['Fund A', 'Fund B']
+    assert (screen.table['period_end'] <= '2021-06-01').all()
+
+    # Saved table reloads with the same periods
+    assert FundScreen(str(tmp_path)).query('crisis_2022').empty
@@ -0,0 +1,77 @@
+import os
+
+import pandas as pd
+import pytest
+
+from fund_cache import FundCatalog
+from fund_storage import (PriceManifest, PricePanelStore, append_csv_rows, fund_name_for_csv, open_price_store,
+                          write_csv_atomic)
+
+
+def _frame(dates, prices):
+    return pd.DataFrame({'Date': pd.to_datetime(dates), 'OLD_PRICE': prices})
+
+
+def test_append_adds_rows_after_existing(tmp_path):
+    csv_filename = str(tmp_path / 'cal_fund_data_Fund_A.csv')
+    write_csv_atomic(_frame(['2025-01-01', '2025-01-02'], [10.0, 11.0]), csv_filename)
+
+    append_csv_rows(_frame(['2025-01-03'], [12.0]), csv_filename)
+
+    df = pd.read_csv(csv_filename)
+    assert list(df['OLD_PRICE']) == [10.0, 11.0, 12.0]
+    assert os.listdir(tmp_path) == ['cal_fund_data_Fund_A.csv']
+
+
+def test_failed_append_leaves_file_untouched(tmp_path, monkeypatch):
+    csv_filename = str(tmp_path / 'cal_fund_data_Fund_A.csv')
+    write_csv_atomic(_frame(['2025-01-01'], [10.0]), csv_filename)
+    with open(csv_filename, 'rb') as f:
+        original = f.read()
+
+    def fail(*args):
+        raise OSError("disk full")
+    monkeypatch.setattr(os, 'fsync', fail)
+
+    with pytest.raises(OSError):
+        append_csv_rows(_frame(['2025-01-02'], [11.0]), csv_filename)
+
+    with open(csv_filename, 'rb') as f:
+        assert f.read() == original
+    assert os.listdir(tmp_path) == ['cal_fund_data_Fund_A.csv']
+
+
+def test_fund_name_prefers_known_funds_over_filename(tmp_path):
+    csv_filename = str(tmp_path / 'cal_fund_data_Equity_Fund_A_B.csv')
+
+    assert fund_name_for_csv(csv_filename) == 'Equity Fund A B'
+    assert fund_name_for_csv(csv_filename, known_funds=['Income Fund', 'Equity Fund A/B']) == 'Equity Fund A/B'
+
+
+def test_open_price_store_merges_column_imported_under_filename_name(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    csv_filename = str(tmp_path / 'cal_fund_data_Equity_Fund_A_B.csv')
+    write_csv_atomic(_frame(['2025-01-01', '2025-01-02'], [10.0, 11.0]), csv_filename)
+
+    # Without a catalog the name is guessed from the filename
+    store = open_price_store(cache_dir, str(tmp_path))
+    assert store.fund_names == ['Equity Fund A B']
+
+    catalog = FundCatalog(cache_dir)
+    catalog.observe('2025-01-02', ['Equity Fund A/B'])
+    catalog.save()
+
+    store = open_price_store(cache_dir, str(tmp_path))
+    assert store.fund_names == ['Equity Fund A/B']
+    assert store.fund_prices('Equity Fund A/B') == {'2025-01-01': 10.0, '2025-01-02': 11.0}
+    assert PriceManifest(cache_dir).get('Equity Fund A B') is None
+
+
+def test_merge_fund_fills_only_missing_dates(tmp_path):
+    store = PricePanelStore(str(tmp_path))
+    store.upsert({'Fund A': {'2025-01-01': 10.0}, 'Fund_A': {'2025-01-01': 99.0, '2025-01-02': 11.0}})
+
+    store.merge_fund('Fund_A', 'Fund A')
+
+    assert store.fund_names == ['Fund A']
+    assert store.fund_prices('Fund A') == {'2025-01-01': 10.0, '2025-01-02': 11.0}
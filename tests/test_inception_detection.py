@@ -0,0 +1,43 @@
+from cal_fund_extractor import CALFundExtractor
+
+
+class FakeListings:
+    """getUTFundRates stand-in: each fund is listed from its inception date, except on gap dates"""
+
+    def __init__(self, inceptions, gaps=()):
+        self.inceptions = inceptions
+        self.gaps = set(gaps)
+        self.calls = []
+
+    def __call__(self, date):
+        self.calls.append(date)
+        funds = [{'FUND_NAME': fund, 'OLD_PRICE': '10.0'} for fund, inception in self.inceptions.items()
+                 if inception <= date and (fund, date) not in self.gaps]
+        return {'UTMS_FUND': funds}
+
+
+def _extractor(tmp_path, listings):
+    extractor = CALFundExtractor(end_date='2020-12-15', cache_dir=str(tmp_path))
+    extractor._fetch_with_limit = listings
+    return extractor
+
+
+def test_gap_in_listing_does_not_move_inception_later(tmp_path):
+    listings = FakeListings({'Fund A': '2013-01-01', 'Fund B': '2017-06-15', 'Fund C': '2014-01-15'})
+    grid = _extractor(tmp_path, listings).generate_date_range(start_date='2013-01-01')
+    # Missing from the first date the bisection probes
+    listings.gaps = {('Fund A', grid[(len(grid) - 1) // 2])}
+
+    detected = _extractor(tmp_path, listings).detect_inception_dates()
+
+    assert detected == {'Fund A': '2013-01-01', 'Fund B': '2017-06-15', 'Fund C': '2014-01-15'}
+
+
+def test_fund_not_found_is_not_searched_again(tmp_path):
+    listings = FakeListings({'Fund A': '2013-01-01'})
+    assert _extractor(tmp_path, listings).detect_inception_dates(['Fund X']) == {}
+    assert listings.calls
+
+    listings.calls.clear()
+    assert _extractor(tmp_path, listings).detect_inception_dates(['Fund X']) == {}
+    assert listings.calls == []